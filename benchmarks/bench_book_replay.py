@@ -0,0 +1,100 @@
+"""
+Order book replay benchmark.
+
+Replays a Lighter order book recording (made with MARKET_DATA_RECORD_DIR set) into
+LighterCustomWebSocketManager.handle_message and reports frames per second and the
+per-frame handling time. Without --recording a synthetic recording (snapshot plus random
+level updates) is generated, so runs are reproducible.
+
+Usage: python benchmarks/bench_book_replay.py [--recording DIR --source lighter-<market>] [--speed N] [--frames N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+from helpers.latency import LatencyHistogram
+from helpers.market_data import MarketDataRecorder, MarketDataReplayer
+
+
+def write_synthetic_recording(directory: Path, frames: int, levels: int = 200) -> str:
+    """Snapshot of `levels` per side around 3000.00, then single-level updates at ~100 frames/s."""
+    rng = random.Random(7)
+    source = 'lighter-synthetic'
+    recorder = MarketDataRecorder(directory, source)
+    received_at = time.time()
+
+    def level(price_ticks, size):
+        return {"price": f"{price_ticks / 100:.2f}", "size": size}
+
+    bids = [level(300000 - i, f"{rng.uniform(1, 20):.4f}") for i in range(1, levels + 1)]
+    asks = [level(300000 + i, f"{rng.uniform(1, 20):.4f}") for i in range(1, levels + 1)]
+    recorder.record(json.dumps({"type": "subscribed/order_book",
+                                "order_book": {"code": 0, "offset": 1, "bids": bids, "asks": asks}}), received_at)
+
+    for offset in range(2, frames + 1):
+        received_at += rng.expovariate(100)
+        depth = rng.randint(1, levels)
+        size = "0" if rng.random() < 0.1 else f"{rng.uniform(1, 20):.4f}"
+        update = {"code": 0, "offset": offset, "bids": [], "asks": []}
+        if rng.random() < 0.5:
+            update["bids"].append(level(300000 - depth, size))
+        else:
+            update["asks"].append(level(300000 + depth, size))
+        recorder.record(json.dumps({"type": "update/order_book", "order_book": update}), received_at)
+    recorder.close()
+    return source
+
+
+async def replay(paths, source: str, speed: float, limit):
+    config = SimpleNamespace(contract_id=0, account_index=0, lighter_client=None,
+                             price_multiplier=100, base_amount_multiplier=10000)
+    manager = LighterCustomWebSocketManager(config, recorder=None)
+    histogram = LatencyHistogram('frame')
+    resyncs = 0
+
+    async def handler(frame):
+        nonlocal resyncs
+        start = time.perf_counter()
+        if not await manager.handle_message(frame):
+            resyncs += 1
+        histogram.record(time.perf_counter() - start)
+
+    replayer = MarketDataReplayer(paths, speed=speed, source=source)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    frames = await replayer.replay(handler, limit=limit)
+    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+
+    print(f"{frames} frames in {wall:.2f}s -> {frames / wall:,.0f} frames/s, "
+          f"{cpu / max(frames, 1) * 1e6:.1f}us CPU/frame, {resyncs} resyncs")
+    print(histogram.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Order book replay benchmark')
+    parser.add_argument('--recording', type=str, nargs='*', help='Recording files or directories')
+    parser.add_argument('--source', type=str, default=None, help='Recorded stream name, e.g. lighter-1')
+    parser.add_argument('--speed', type=float, default=0, help='Replay speed, 0 = as fast as possible (default: 0)')
+    parser.add_argument('--frames', type=int, default=50000, help='Synthetic recording size / replay limit')
+    args = parser.parse_args()
+
+    if args.recording:
+        asyncio.run(replay(args.recording, args.source, args.speed, args.frames))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = write_synthetic_recording(Path(directory), args.frames)
+        asyncio.run(replay([directory], source, args.speed, args.frames))
+
+
+if __name__ == "__main__":
+    main()
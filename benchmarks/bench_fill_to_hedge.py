@@ -0,0 +1,110 @@
+"""
+Fill-to-hedge dispatch benchmark.
+
+Simulates maker fills arriving from a websocket callback at random times and measures the
+time until the Lighter hedge is handed to send_tx, for:
+
+  polling  - the previous hedge bot flow: the maker order loop checks its status every 0.5s,
+             then the trading loop checks waiting_for_lighter_fill every 10ms
+  event    - the callback starts the hedge task directly (trigger_lighter_hedge)
+
+Only scheduling latency is measured; signing and network time are excluded.
+
+Usage: python benchmarks/bench_fill_to_hedge.py [--fills N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import random
+import time
+
+from helpers.latency import LatencyHistogram
+
+
+class PollingBot:
+    """Previous flow: flags set by the callback, discovered by sleep loops."""
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.maker_status = None
+        self.waiting_for_lighter_fill = False
+        self.fill_time = None
+
+    def on_maker_fill(self):
+        self.fill_time = time.perf_counter()
+        self.maker_status = 'FILLED'
+        self.waiting_for_lighter_fill = True
+
+    async def send_hedge(self):
+        self.histogram.record(time.perf_counter() - self.fill_time)
+
+    async def run_step(self, fill_delay: float):
+        self.maker_status = 'NEW'
+        self.waiting_for_lighter_fill = False
+        asyncio.get_running_loop().call_later(fill_delay, self.on_maker_fill)
+
+        # place_<venue>_post_only_order
+        while self.maker_status != 'FILLED':
+            await asyncio.sleep(0.5)
+
+        # trading_loop
+        while True:
+            if self.waiting_for_lighter_fill:
+                await self.send_hedge()
+                break
+            await asyncio.sleep(0.01)
+
+
+class EventBot:
+    """Current flow: the callback creates the hedge task itself."""
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.fill_time = None
+        self.hedge_task = None
+        self.hedge_started = asyncio.Event()
+
+    def on_maker_fill(self):
+        self.fill_time = time.perf_counter()
+        self.hedge_started.set()
+        self.hedge_task = asyncio.create_task(self.send_hedge())
+
+    async def send_hedge(self):
+        self.histogram.record(time.perf_counter() - self.fill_time)
+
+    async def run_step(self, fill_delay: float):
+        self.hedge_started.clear()
+        asyncio.get_running_loop().call_later(fill_delay, self.on_maker_fill)
+        await self.hedge_started.wait()
+        await self.hedge_task
+
+
+async def run(fills: int):
+    rng = random.Random(7)
+    delays = [rng.uniform(0.05, 0.5) for _ in range(fills)]
+
+    results = []
+    for name, bot_class in (('polling', PollingBot), ('event', EventBot)):
+        histogram = LatencyHistogram(name)
+        bot = bot_class(histogram)
+        for delay in delays:
+            await bot.run_step(delay)
+        results.append(histogram)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill-to-hedge dispatch benchmark')
+    parser.add_argument('--fills', type=int, default=20, help='Simulated maker fills (default: 20)')
+    args = parser.parse_args()
+
+    for histogram in asyncio.run(run(args.fills)):
+        print(histogram.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cold vs. pooled HTTP round trip benchmark.
+
+  cold    - a new aiohttp.ClientSession per request, as AsterClient._make_request and
+            ExtendedClient.get_order_info did before
+  pooled  - one long-lived session from helpers.http_session, as the clients use now
+
+By default requests go to a local aiohttp server, which only shows the TCP setup and
+session construction cost. Pass --url (e.g. https://fapi.asterdex.com/fapi/v1/ping) to
+include DNS and TLS handshakes against a real exchange.
+
+Usage: python benchmarks/bench_http_session.py [--requests N] [--url URL]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from helpers.http_session import create_http_session
+from helpers.latency import LatencyHistogram
+
+
+async def start_local_server():
+    async def ping(request):
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get('/ping', ping)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/ping"
+
+
+async def request(session: aiohttp.ClientSession, url: str):
+    async with session.get(url) as response:
+        await response.read()
+
+
+async def run(args):
+    runner = None
+    url = args.url
+    if url is None:
+        runner, url = await start_local_server()
+
+    cold = LatencyHistogram("cold")
+    pooled = LatencyHistogram("pooled")
+
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            await request(session, url)
+        cold.record(time.perf_counter() - start)
+
+    async with create_http_session() as session:
+        # First request opens the pooled connection
+        await request(session, url)
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            await request(session, url)
+            pooled.record(time.perf_counter() - start)
+
+    if runner is not None:
+        await runner.cleanup()
+
+    print(f"url: {url}")
+    for histogram in (cold, pooled):
+        print(histogram.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold vs. pooled HTTP round trip benchmark')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per mode (default: 200)')
+    parser.add_argument('--url', type=str, default=None, help='Endpoint to GET (default: local server)')
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Websocket frame decoding benchmark.
+
+Decodes every frame of an order book recording (made with MARKET_DATA_RECORD_DIR set) with
+the standard library, with orjson when it is installed, and with the feed path used by the
+handlers (helpers.json_codec.loads plus the typed BookDelta struct), and reports the decode
+cost per message. Without --recording the synthetic Lighter recording of bench_book_replay
+is generated.
+
+Usage: python benchmarks/bench_json_decode.py [--recording DIR --source lighter-<market>] [--frames N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import tempfile
+import timeit
+
+from benchmarks.bench_book_replay import write_synthetic_recording
+from exchanges.messages import BookDelta
+from helpers import json_codec
+from helpers.market_data import read_frames
+
+
+def decoders():
+    """(name, per-frame function) pairs to compare."""
+    cases = [('json.loads', json.loads)]
+    if json_codec.orjson is not None:
+        cases.append(('orjson.loads', json_codec.orjson.loads))
+    loads = json_codec.loads
+    cases.append((f'loads ({json_codec.DECODER}) + BookDelta', lambda frame: BookDelta.from_lighter(loads(frame))))
+    return cases
+
+
+def run(frames, repeat: int):
+    frames = [frame if isinstance(frame, str) else json.dumps(frame) for frame in frames]
+    total_bytes = sum(len(frame) for frame in frames)
+    print(f"{len(frames)} frames, {total_bytes / max(len(frames), 1):.0f} bytes/frame on average")
+
+    baseline = None
+    for name, decode in decoders():
+        def decode_all():
+            for frame in frames:
+                decode(frame)
+        seconds = min(timeit.repeat(decode_all, number=1, repeat=repeat))
+        per_message = seconds / max(len(frames), 1)
+        baseline = baseline or per_message
+        print(f"  {name:<32} {per_message * 1e6:7.2f}us/msg  {baseline / per_message:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Websocket frame decoding benchmark')
+    parser.add_argument('--recording', type=str, nargs='*', help='Recording files or directories')
+    parser.add_argument('--source', type=str, default=None, help='Recorded stream name, e.g. lighter-1')
+    parser.add_argument('--frames', type=int, default=50000, help='Synthetic recording size / frames to decode')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per decoder, the best is reported')
+    args = parser.parse_args()
+
+    if args.recording:
+        frames = [frame for _, frame in read_frames(args.recording, args.source)][:args.frames]
+        run(frames, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = write_synthetic_recording(Path(directory), args.frames)
+        frames = [frame for _, frame in read_frames([directory], source)]
+    run(frames, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Lighter sign vs. send benchmark.
+
+Times the two halves of a hedge submission with the real SignerClient:
+
+  sign (auto nonce)      - sign_create_order without a nonce, as the hedge bots did before
+  sign (reserved nonce)  - sign_create_order with a nonce from the nonce manager, as
+                           LighterPresignCache does ahead of the fill
+  send                   - send_tx of a signed order (only with --send)
+
+With --send each order is a post-only buy at half the last trade price, cancelled right
+after it is accepted, so it never trades. Check the account for leftovers afterwards.
+
+Requires the Lighter SDK and API_KEY_PRIVATE_KEY, LIGHTER_ACCOUNT_INDEX and
+LIGHTER_API_KEY_INDEX in the environment (or --env-file).
+
+Usage: python benchmarks/bench_lighter_sign_send.py [--ticker ETH] [--samples N] [--send]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import os
+import time
+from decimal import Decimal
+
+import dotenv
+import lighter
+from lighter import SignerClient, ApiClient, Configuration
+
+from helpers.latency import LatencyHistogram
+
+BASE_URL = "https://mainnet.zklighter.elliot.ai"
+
+
+async def get_market(api_client, ticker: str):
+    order_api = lighter.OrderApi(api_client)
+    order_books = await order_api.order_books()
+    for market in order_books.order_books:
+        if market.symbol == ticker:
+            details = await order_api.order_book_details(market_id=market.market_id)
+            return market, details.order_book_details[0]
+    raise ValueError(f"Ticker {ticker} not found")
+
+
+async def run(args):
+    client = SignerClient(
+        url=BASE_URL,
+        private_key=os.getenv('API_KEY_PRIVATE_KEY'),
+        account_index=int(os.getenv('LIGHTER_ACCOUNT_INDEX')),
+        api_key_index=int(os.getenv('LIGHTER_API_KEY_INDEX')),
+    )
+    err = client.check_client()
+    if err is not None:
+        raise Exception(f"CheckClient error: {err}")
+
+    api_client = ApiClient(configuration=Configuration(host=BASE_URL))
+    market, details = await get_market(api_client, args.ticker)
+    base_amount_multiplier = pow(10, market.supported_size_decimals)
+    price_multiplier = pow(10, market.supported_price_decimals)
+    price = Decimal(str(details.last_trade_price)) / 2
+    base_amount = int(Decimal(str(details.min_base_amount)) * base_amount_multiplier)
+
+    def sign(client_order_index: int, **nonce_kwargs):
+        tx_info, error = client.sign_create_order(
+            market_index=market.market_id,
+            client_order_index=client_order_index,
+            base_amount=base_amount,
+            price=int(price * price_multiplier),
+            is_ask=False,
+            order_type=client.ORDER_TYPE_LIMIT,
+            time_in_force=client.ORDER_TIME_IN_FORCE_POST_ONLY,
+            reduce_only=False,
+            trigger_price=0,
+            **nonce_kwargs
+        )
+        if error is not None:
+            raise Exception(f"Sign error: {error}")
+        return tx_info
+
+    sign_auto = LatencyHistogram("sign (auto nonce)")
+    sign_reserved = LatencyHistogram("sign (reserved nonce)")
+    send = LatencyHistogram("send")
+
+    for i in range(args.samples):
+        client_order_index = int(time.time() * 1000) + i
+
+        start = time.perf_counter()
+        sign(client_order_index)
+        sign_auto.record(time.perf_counter() - start)
+
+        # Reserve and sign; the nonce is only consumed when the tx is sent
+        api_key_index, nonce = client.nonce_manager.next_nonce()
+        start = time.perf_counter()
+        tx_info = sign(client_order_index, nonce=nonce)
+        sign_reserved.record(time.perf_counter() - start)
+
+        if not args.send:
+            client.nonce_manager.acknowledge_failure(api_key_index)
+            continue
+
+        start = time.perf_counter()
+        try:
+            await client.send_tx(tx_type=client.TX_TYPE_CREATE_ORDER, tx_info=tx_info)
+        except Exception:
+            client.nonce_manager.hard_refresh_nonce(api_key_index)
+            raise
+        send.record(time.perf_counter() - start)
+
+        await client.cancel_order(market_index=market.market_id, order_index=client_order_index)
+
+    for histogram in (sign_auto, sign_reserved, send):
+        print(histogram.summary())
+
+    await client.close()
+    await api_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lighter sign vs. send benchmark')
+    parser.add_argument('--ticker', type=str, default='ETH', help='Ticker (default: ETH)')
+    parser.add_argument('--samples', type=int, default=20, help='Orders to sign (default: 20)')
+    parser.add_argument('--send', action='store_true', help='Also send (and cancel) each order')
+    parser.add_argument('--env-file', type=str, default='.env', help='.env file path (default: .env)')
+    args = parser.parse_args()
+
+    dotenv.load_dotenv(args.env_file)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
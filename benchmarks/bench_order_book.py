@@ -0,0 +1,111 @@
+"""
+Order book microbenchmark.
+
+Measures the per-update cost of the hedge bots' Lighter book path (apply an update,
+validate the book, read the best levels) for the old dict + max()/min() layout and the
+sorted OrderBook, at 50, 500 and 5000 levels per side.
+
+Usage: python benchmarks/bench_order_book.py [--updates N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from helpers.order_book import OrderBook
+
+DEPTHS = (50, 500, 5000)
+MID_PRICE = 3000
+TICK = Decimal('0.01')
+
+
+def make_updates(depth: int, count: int, seed: int = 7):
+    """Build a stream of (side, price, size) updates concentrated near the touch."""
+    rng = random.Random(seed)
+    updates = []
+    for _ in range(count):
+        side = 'bids' if rng.random() < 0.5 else 'asks'
+        # Most of the churn happens within a few ticks of the touch
+        distance = int(rng.expovariate(1 / 5)) % depth + 1
+        if side == 'bids':
+            price = Decimal(MID_PRICE) - distance * TICK
+        else:
+            price = Decimal(MID_PRICE) + distance * TICK
+        size = Decimal(0) if rng.random() < 0.3 else Decimal(rng.randint(1, 1000)) / 100
+        updates.append((side, price, size))
+    return updates
+
+
+def seed_levels(depth: int):
+    bids = [(Decimal(MID_PRICE) - i * TICK, Decimal(1)) for i in range(1, depth + 1)]
+    asks = [(Decimal(MID_PRICE) + i * TICK, Decimal(1)) for i in range(1, depth + 1)]
+    return bids, asks
+
+
+def run_dict_book(depth: int, updates) -> float:
+    """Previous implementation: plain dicts, full scans for integrity and BBO."""
+    book = {"bids": {}, "asks": {}}
+    bids, asks = seed_levels(depth)
+    book["bids"].update(bids)
+    book["asks"].update(asks)
+
+    start = time.perf_counter()
+    for side, price, size in updates:
+        if size > 0:
+            book[side][price] = size
+        else:
+            book[side].pop(price, None)
+
+        for book_side in ("bids", "asks"):
+            for level_price, level_size in book[book_side].items():
+                if level_price <= 0 or level_size <= 0:
+                    break
+
+        if book["bids"]:
+            best_bid_price = max(book["bids"].keys())
+            best_bid = (best_bid_price, book["bids"][best_bid_price])
+        if book["asks"]:
+            best_ask_price = min(book["asks"].keys())
+            best_ask = (best_ask_price, book["asks"][best_ask_price])
+    return time.perf_counter() - start
+
+
+def run_sorted_book(depth: int, updates) -> float:
+    """OrderBook: sorted ladder, O(1) integrity check and BBO."""
+    book = OrderBook()
+    bids, asks = seed_levels(depth)
+    for price, size in bids:
+        book.bids.update(price, size)
+    for price, size in asks:
+        book.asks.update(price, size)
+
+    start = time.perf_counter()
+    for side, price, size in updates:
+        book[side].update(price, size)
+        book.is_valid()
+        book.best_levels()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Order book microbenchmark')
+    parser.add_argument('--updates', type=int, default=20000, help='Updates per depth (default: 20000)')
+    args = parser.parse_args()
+
+    print(f"{'levels':>8} {'dict (us/update)':>18} {'OrderBook (us/update)':>22} {'speedup':>9}")
+    for depth in DEPTHS:
+        # Fewer updates for the slow baseline at high depth keeps the run short
+        count = args.updates if depth < 5000 else max(args.updates // 10, 1)
+        updates = make_updates(depth, count)
+        dict_time = run_dict_book(depth, updates) / count * 1e6
+        sorted_time = run_sorted_book(depth, updates) / count * 1e6
+        print(f"{depth:>8} {dict_time:>18.2f} {sorted_time:>22.2f} {dict_time / sorted_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
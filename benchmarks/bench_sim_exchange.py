@@ -0,0 +1,98 @@
+"""
+Simulated venue benchmark.
+
+  engine - raw SimMatchingEngine throughput: post-only orders, cancels and taker flow
+  bot    - TradingBot open/close cycles (_place_and_monitor_open_order -> _handle_order_result)
+           against SimExchangeClient, reporting cycles per second and CPU time per order
+
+No network access or credentials needed. Latency and market settings are read from the
+SIM_* environment variables (see exchanges/sim.py).
+
+Usage: python benchmarks/bench_sim_exchange.py [--orders N] [--cycles N] [--pipeline N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from decimal import Decimal
+
+from exchanges.sim import SimMatchingEngine
+from helpers.latency import LatencyHistogram
+
+
+def bench_engine(orders: int):
+    rng = random.Random(7)
+    engine = SimMatchingEngine()
+    tick = Decimal('0.01')
+    engine.submit_limit('buy', Decimal('2999.99'), Decimal('1000000'), owner='market')
+    engine.submit_limit('sell', Decimal('3000.01'), Decimal('1000000'), owner='market')
+
+    resting = []
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    for _ in range(orders):
+        side = rng.choice(('buy', 'sell'))
+        offset = tick * rng.randint(0, 20)
+        price = Decimal('3000') - offset if side == 'buy' else Decimal('3000') + offset
+        order = engine.submit_limit(side, price, Decimal('0.1'))
+        if order.status != 'REJECTED':
+            resting.append(order.order_id)
+        if len(resting) > 500:
+            engine.cancel(resting.pop(rng.randrange(len(resting))))
+        engine.submit_market(rng.choice(('buy', 'sell')), Decimal('0.05'))
+    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+
+    print(f"engine: {orders} orders in {wall:.2f}s -> {orders / wall:,.0f} orders/s, "
+          f"{cpu / orders * 1e6:.1f}us CPU/order, {engine.fills} fills")
+
+
+async def bench_bot(cycles: int, pipeline: int):
+    from trading_bot import TradingBot, TradingConfig
+
+    os.environ.setdefault('SIM_MARKET_INTERVAL', '0.001')
+    config = TradingConfig(ticker='ETH', contract_id='', tick_size=Decimal(0), quantity=Decimal('0.1'),
+                           take_profit=Decimal('0.02'), direction='buy', max_orders=cycles, wait_time=0,
+                           exchange='sim', grid_step=Decimal('-100'), stop_price=Decimal('-1'),
+                           pause_price=Decimal('-1'), boost_mode=False, pipeline=pipeline)
+    bot = TradingBot(config)
+    client = bot.exchange_client
+    config.contract_id, config.tick_size = await client.get_contract_attributes()
+    bot.loop = asyncio.get_running_loop()
+    await client.connect()
+
+    histogram = LatencyHistogram('bot cycle')
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    for _ in range(cycles):
+        cycle_start = time.perf_counter()
+        await bot._place_and_monitor_open_order()
+        histogram.record(time.perf_counter() - cycle_start)
+    if bot.close_order_tasks:
+        await asyncio.wait(list(bot.close_order_tasks))
+    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    await client.disconnect()
+
+    print(f"bot: {cycles} cycles in {wall:.2f}s -> {cycles / wall:,.0f} cycles/s, "
+          f"{cpu / client.orders_placed * 1e6:.0f}us CPU/order ({client.orders_placed} orders, "
+          f"{client.orders_canceled} cancels, {client.orders_amended} amends, {client.orders_rejected} post-only rejects)")
+    print(histogram.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulated venue benchmark')
+    parser.add_argument('--orders', type=int, default=50000, help='Matching engine orders (default: 50000)')
+    parser.add_argument('--cycles', type=int, default=200, help='Bot open/close cycles (default: 200)')
+    parser.add_argument('--pipeline', type=int, default=0,
+                        help='Close orders placed in the background at once (default: 0, sequential)')
+    args = parser.parse_args()
+
+    bench_engine(args.orders)
+    asyncio.run(bench_bot(args.cycles, args.pipeline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Import-time audit of the entry points.
+
+Imports each entry point in a fresh interpreter with `-X importtime` and reports its cold
+import cost (interpreter startup excluded), the slowest modules it pulls in, and any exchange
+SDK it imports that it should not: `runbot`, `trading_bot`, `fleet` and `hedge_mode` must not
+import a venue SDK before the venue is chosen, and a venue's adapter or hedge bot only its
+own. The costs are compared with the budgets in benchmarks/import_budgets.json (saved the
+same way as the microbenchmark baselines: on the machine you compare on).
+
+Entry points whose SDK is not installed are reported as skipped.
+
+Usage:
+    python benchmarks/import_audit.py                   # audit and compare with the budgets
+    python benchmarks/import_audit.py --save            # store the results as the new budgets
+    python benchmarks/import_audit.py -k hedge --top 15  # only hedge entry points, 15 slowest modules
+    python benchmarks/import_audit.py --fail-on-regression
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import os
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.microbench import format_time, load_baselines, save_baselines
+
+ROOT = Path(__file__).parent.parent
+BUDGET_FILE = Path(__file__).parent / 'import_budgets.json'
+REGRESSION_THRESHOLD = 0.25
+
+# Top-level packages of the exchange SDKs
+VENUE_SDKS = ('lighter', 'bpx', 'x10', 'paradex_py', 'starknet_py', 'edgex_sdk', 'pysdk', 'apexomni')
+
+# Entry point module -> SDKs it may import
+ENTRY_POINTS: Dict[str, Tuple[str, ...]] = {
+    'runbot': (),
+    'trading_bot': (),
+    'fleet': (),
+    'hedge_mode': (),
+    'exchanges.sim': (),
+    'exchanges.aster': (),
+    'exchanges.backpack': ('bpx',),
+    'exchanges.lighter': ('lighter',),
+    'exchanges.extended': ('x10',),
+    'exchanges.edgex': ('edgex_sdk',),
+    'exchanges.grvt': ('pysdk',),
+    'exchanges.paradex': ('paradex_py', 'starknet_py'),
+    'exchanges.apex': ('apexomni',),
+    'hedge.hedge_mode_bp': ('lighter', 'bpx'),
+    'hedge.hedge_mode_ext': ('lighter', 'x10'),
+    'hedge.hedge_mode_apex': ('lighter', 'apexomni'),
+    'hedge.hedge_mode_grvt': ('lighter', 'pysdk'),
+    'hedge.hedge_mode_edgex': ('lighter', 'edgex_sdk'),
+}
+
+# (self us, cumulative us, nesting level, module)
+ImportRecord = Tuple[int, int, int, str]
+
+
+def import_times(code: str) -> Tuple[List[ImportRecord], Optional[str]]:
+    """-X importtime records of running `code` in a fresh interpreter, and the error if it failed."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    records = []
+    error_lines = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            error_lines.append(line)
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header
+        name = fields[2].rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        records.append((int(fields[0]), int(fields[1]), level, name.strip()))
+    error = error_lines[-1] if proc.returncode != 0 and error_lines else None
+    return records, error
+
+
+def audit(module: str, startup: set) -> Dict:
+    """Cold import cost of `module` in seconds, its slowest modules and disallowed SDK imports."""
+    records, error = import_times(f"import {module}")
+    if error is not None:
+        return {'error': error}
+    records = [record for record in records if record[3] not in startup]
+    allowed = ENTRY_POINTS.get(module, ())
+    imported = {name.split('.')[0] for _, _, _, name in records}
+    return {
+        'seconds': sum(cumulative for _, cumulative, level, _ in records if level == 0) / 1e6,
+        'slowest': sorted(((self_us, name) for self_us, _, _, name in records), reverse=True),
+        'unexpected_sdks': sorted(sdk for sdk in VENUE_SDKS if sdk in imported and sdk not in allowed),
+    }
+
+
+def best_of(module: str, startup: set, repeat: int) -> Dict:
+    """The fastest of `repeat` cold imports (the first run also compiles the bytecode)."""
+    best = None
+    for _ in range(repeat):
+        result = audit(module, startup)
+        if 'error' in result:
+            return result
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time audit of the entry points')
+    parser.add_argument('-k', dest='filter', type=str, default='', help='Only entry points containing this string')
+    parser.add_argument('--save', action='store_true', help='Store the results as the new budgets')
+    parser.add_argument('--budget', type=str, default=str(BUDGET_FILE), help='Budget file')
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per entry point, the best is reported')
+    parser.add_argument('--top', type=int, default=5, help='Slowest modules (self time) shown per entry point')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Relative slowdown reported as a regression (default: 0.25)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 on regressions or unexpected SDK imports')
+    args = parser.parse_args()
+
+    modules = [module for module in ENTRY_POINTS if args.filter in module]
+    if not modules:
+        print(f"No entry points match '{args.filter}'. Available: {', '.join(ENTRY_POINTS)}")
+        sys.exit(1)
+
+    startup = {name for _, _, _, name in import_times('pass')[0]}
+    budget_path = Path(args.budget)
+    budgets = load_baselines(budget_path)
+    results = {}
+    failures = 0
+    width = max(len(module) for module in modules)
+    print(f"{'entry point':<{width}}  {'budget':>10}  {'current':>10}  change")
+    for module in modules:
+        result = best_of(module, startup, args.repeat)
+        if 'error' in result:
+            print(f"{module:<{width}}  {'':>10}  {'skipped':>10}  {result['error']}")
+            continue
+        current = results[module] = result['seconds']
+        budget = budgets.get(module)
+        if budget is None:
+            note = 'new'
+        else:
+            change = current / budget - 1
+            note = f"{change:+.1%}"
+            if change > args.threshold:
+                note += '  REGRESSION'
+                failures += 1
+        if result['unexpected_sdks']:
+            note += f"  imports {', '.join(result['unexpected_sdks'])}"
+            failures += 1
+        budget_text = format_time(budget) if budget is not None else '-'
+        print(f"{module:<{width}}  {budget_text:>10}  {format_time(current):>10}  {note}")
+        for self_us, name in result['slowest'][:args.top]:
+            print(f"{'':<{width}}    {format_time(self_us / 1e6):>10}  {name}")
+
+    if args.save:
+        save_baselines(budget_path, results)
+        print(f"Saved {len(results)} budgets to {budget_path}")
+    if failures and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Hot-path microbenchmark suite.
+
+Times the per-message and per-order paths (Lighter book maintenance, adapter order-update
+normalizers, TradingLogger, round_to_tick) and compares them with the stored baselines in
+benchmarks/baselines.json, so every performance change comes with a measured before/after.
+
+Each case reports the best per-call time over several timeit repeats. Cases whose exchange
+SDK is not installed are reported as skipped. Baselines are machine specific: save them on
+the machine you compare on.
+
+Usage:
+    python benchmarks/microbench.py                 # run and compare with baselines.json
+    python benchmarks/microbench.py --save          # run and store as the new baselines
+    python benchmarks/microbench.py -k lighter      # only cases whose name contains "lighter"
+    python benchmarks/microbench.py --fail-on-regression   # exit 1 when a case regresses
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import timeit
+from contextlib import contextmanager
+from decimal import Decimal
+from types import SimpleNamespace
+
+BASELINE_FILE = Path(__file__).parent / 'baselines.json'
+REGRESSION_THRESHOLD = 0.25
+
+CASES = {}
+
+
+def case(name):
+    """Register a benchmark case: a generator that sets up, yields the callable to time, then cleans up."""
+    def register(func):
+        CASES[name] = contextmanager(func)
+        return func
+    return register
+
+
+def run_sync(coroutine):
+    """Run a coroutine that never suspends without an event loop (keeps loop overhead out of the timing)."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+NULL_LOGGER = SimpleNamespace(log=lambda message, level="INFO": None)
+
+
+# ---------------------------
+# Lighter order book
+# ---------------------------
+
+def make_lighter_manager(levels=500):
+    from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+
+    config = SimpleNamespace(contract_id=0, account_index=0, lighter_client=None,
+                             price_multiplier=100, base_amount_multiplier=10000)
+    manager = LighterCustomWebSocketManager(config, recorder=None)
+    # Thin levels at the touch, so get_best_levels walks a few levels to reach min_level_notional
+    for side, sign in (("bids", -1), ("asks", 1)):
+        manager.update_order_book(side, [{"price": f"{3000 + sign * i / 100:.2f}", "size": "1" if i <= 5 else "20"}
+                                         for i in range(1, levels + 1)])
+    return manager
+
+
+@case('lighter_ws.update_order_book')
+def bench_lighter_update_order_book():
+    manager = make_lighter_manager()
+    rng = random.Random(7)
+    updates = [[{"price": f"{3000 - rng.randint(1, 50) / 100:.2f}", "size": rng.choice(("0", "5.5", "12"))}]
+               for _ in range(1024)]
+    position = [0]
+
+    def run():
+        position[0] = (position[0] + 1) & 1023
+        manager.update_order_book("bids", updates[position[0]])
+    yield run
+
+
+@case('lighter_ws.get_best_levels')
+def bench_lighter_get_best_levels():
+    manager = make_lighter_manager()
+    yield manager.get_best_levels
+
+
+@case('lighter_ws.get_top_levels')
+def bench_lighter_get_top_levels():
+    # What the hedge bots' get_lighter_best_levels() returns
+    manager = make_lighter_manager()
+    yield manager.get_top_levels
+
+
+@case('lighter_ws.cleanup_old_order_book_levels')
+def bench_lighter_cleanup():
+    manager = make_lighter_manager(levels=100)
+    far_levels = [{"price": "2000.00", "size": "1"}]
+
+    def run():
+        # One level past the cap per side, trimmed again by the cleanup
+        manager.update_order_book("bids", far_levels)
+        manager.cleanup_old_order_book_levels()
+    yield run
+
+
+# ---------------------------
+# Order-update normalizers
+# ---------------------------
+
+def bare_client(cls, contract_id, **attributes):
+    """An adapter instance without credentials or connections, enough for its websocket handlers."""
+    client = cls.__new__(cls)
+    client.config = SimpleNamespace(contract_id=contract_id, close_order_side='sell', ticker='ETH')
+    client.logger = NULL_LOGGER
+    client._order_update_handler = lambda message: None
+    for key, value in attributes.items():
+        setattr(client, key, value)
+    return client
+
+
+@case('normalizer.aster')
+def bench_normalizer_aster():
+    from exchanges.aster import AsterClient, AsterWebSocketManager
+
+    client = bare_client(AsterClient, 'ETHUSDT')
+    manager = AsterWebSocketManager(client.config, '', '', client._handle_websocket_order_update)
+    message = {'e': 'ORDER_TRADE_UPDATE', 'o': {'i': 123456, 's': 'ETHUSDT', 'S': 'BUY', 'q': '0.1',
+                                                 'p': '3000.00', 'z': '0.1', 'X': 'FILLED'}}
+    yield lambda: run_sync(manager._handle_message(message))
+
+
+@case('normalizer.backpack')
+def bench_normalizer_backpack():
+    from exchanges.backpack import BackpackClient
+    from exchanges.messages import OrderUpdate
+
+    client = bare_client(BackpackClient, 'ETH_USDC_PERP')
+    message = OrderUpdate.from_backpack({'e': 'orderFill', 'i': '123456', 's': 'ETH_USDC_PERP', 'S': 'Bid',
+                                         'q': '0.1', 'p': '3000.00', 'z': '0.1'})
+    yield lambda: run_sync(client._handle_websocket_order_update(message))
+
+
+def captured_handler(client, attribute):
+    captured = {}
+    private_client = SimpleNamespace(on_message=lambda channel, handler: captured.setdefault('handler', handler))
+    client.ws_manager = SimpleNamespace(get_private_client=lambda: private_client)
+    client.setup_order_update_handler(lambda message: None)
+    return captured.get('handler') or getattr(client, attribute)
+
+
+@case('normalizer.edgex')
+def bench_normalizer_edgex():
+    from exchanges.edgex import EdgeXClient
+
+    client = bare_client(EdgeXClient, '10000002')
+    handler = captured_handler(client, 'order_update_handler')
+    message = json.dumps({"content": {"event": "ORDER_UPDATE", "data": {"order": [{
+        "id": "123456", "contractId": "10000002", "status": "OPEN", "side": "BUY",
+        "cumMatchSize": "0.05", "size": "0.1", "price": "3000.00"}], "collateral": []}}})
+    yield lambda: handler(message)
+
+
+@case('normalizer.apex')
+def bench_normalizer_apex():
+    from exchanges.apex import ApexClient
+
+    client = bare_client(ApexClient, 'ETH-USDT')
+    handler = captured_handler(client, 'account_handler')
+    message = json.dumps({"topic": "ws_zk_accounts_v3", "contents": {"orders": [{
+        "id": "123456", "symbol": "ETH-USDT", "status": "FILLED", "side": "BUY", "cumSuccessFillSize": "0.1",
+        "remainingSize": "0", "size": "0.1", "price": "3000.00"}], "fills": [{}]}})
+    yield lambda: handler(message)
+
+
+@case('normalizer.extended')
+def bench_normalizer_extended():
+    from exchanges.extended import ExtendedClient
+
+    client = bare_client(ExtendedClient, 'ETH-USD', open_orders={})
+    message = {"type": "ORDER", "data": {"orders": [{
+        "id": 123456, "market": "ETH-USD", "status": "FILLED", "side": "BUY", "filledQty": "0.1",
+        "qty": "0.1", "price": "3000.00"}]}}
+    yield lambda: run_sync(client.handle_account(message))
+
+
+# ---------------------------
+# Logging and rounding
+# ---------------------------
+
+@contextmanager
+def temporary_logger():
+    """A TradingLogger whose activity log and CSV live in a temporary directory."""
+    from helpers.log_writer import BackgroundLogHandler, get_log_writer
+    from helpers.logger import TradingLogger
+
+    with tempfile.TemporaryDirectory() as directory:
+        logger = TradingLogger(exchange='microbench', ticker='ETH', log_to_console=False)
+        created = [logger.debug_log_file, logger.log_file]
+        for handler in logger.logger.handlers[:]:
+            logger.logger.removeHandler(handler)
+            handler.close()
+        logger.debug_log_file = os.path.join(directory, 'activity.log')
+        logger.log_file = os.path.join(directory, 'orders.csv')
+        file_handler = BackgroundLogHandler(logger.debug_log_file)
+        file_handler.setFormatter(logger.formatter)
+        logger.logger.addHandler(file_handler)
+        try:
+            yield logger
+        finally:
+            logger.logger.removeHandler(file_handler)
+            file_handler.close()
+            get_log_writer().flush()
+            for path in created:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+@case('logger.log')
+def bench_logger_log():
+    with temporary_logger() as logger:
+        yield lambda: logger.log("[OPEN] [123456] FILLED 0.1 @ 3000.00", "INFO")
+
+
+@case('logger.log_transaction')
+def bench_logger_log_transaction():
+    with temporary_logger() as logger:
+        yield lambda: logger.log_transaction('123456', 'buy', Decimal('0.1'), Decimal('3000.00'), 'FILLED')
+
+
+@case('base.round_to_tick')
+def bench_round_to_tick():
+    from exchanges.base import BaseExchangeClient
+
+    client = SimpleNamespace(config=SimpleNamespace(tick_size=Decimal('0.01')))
+    price = Decimal('3000') * (1 + Decimal('0.02') / 100)
+    yield lambda: BaseExchangeClient.round_to_tick(client, price)
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+
+def measure(func, repeat: int = 5) -> float:
+    """Best seconds per call over `repeat` runs of an auto-ranged loop."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_cases(names, repeat: int):
+    results, skipped = {}, {}
+    for name in names:
+        try:
+            with CASES[name]() as func:
+                results[name] = measure(func, repeat)
+        except ImportError as e:
+            skipped[name] = f"missing dependency: {e.name}"
+    return results, skipped
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.2f}us"
+    return f"{seconds * 1e9:.0f}ns"
+
+
+def report(results, skipped, baselines, threshold: float) -> int:
+    """Print the comparison table. Returns the number of regressions."""
+    regressions = 0
+    width = max(len(name) for name in list(results) + list(skipped))
+    print(f"{'case':<{width}}  {'baseline':>10}  {'current':>10}  change")
+    for name in sorted(list(results) + list(skipped)):
+        if name in skipped:
+            print(f"{name:<{width}}  {'':>10}  {'skipped':>10}  {skipped[name]}")
+            continue
+        current = results[name]
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"{name:<{width}}  {'-':>10}  {format_time(current):>10}  new")
+            continue
+        change = current / baseline - 1
+        note = ''
+        if change > threshold:
+            note = '  REGRESSION'
+            regressions += 1
+        elif change < -threshold:
+            note = '  faster'
+        print(f"{name:<{width}}  {format_time(baseline):>10}  {format_time(current):>10}  {change:+.1%}{note}")
+    return regressions
+
+
+def load_baselines(path: Path):
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get('results', {})
+
+
+def save_baselines(path: Path, results) -> None:
+    # Keep baselines of cases that could not run here
+    stored = load_baselines(path)
+    stored.update(results)
+    path.write_text(json.dumps({
+        'machine': f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+        'python': platform.python_version(),
+        'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': dict(sorted(stored.items())),
+    }, indent=2) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot-path microbenchmark suite')
+    parser.add_argument('-k', dest='filter', type=str, default='', help='Only run cases containing this string')
+    parser.add_argument('--save', action='store_true', help='Store the results as the new baselines')
+    parser.add_argument('--baseline', type=str, default=str(BASELINE_FILE), help='Baseline file')
+    parser.add_argument('--repeat', type=int, default=5, help='timeit repeats per case (default: 5)')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Relative slowdown reported as a regression (default: 0.25)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 on regressions')
+    args = parser.parse_args()
+
+    names = [name for name in CASES if args.filter in name]
+    if not names:
+        print(f"No cases match '{args.filter}'. Available: {', '.join(CASES)}")
+        sys.exit(1)
+
+    baseline_path = Path(args.baseline)
+    results, skipped = run_cases(names, args.repeat)
+    regressions = report(results, skipped, load_baselines(baseline_path), args.threshold)
+
+    if args.save:
+        save_baselines(baseline_path, results)
+        print(f"Saved {len(results)} baselines to {baseline_path}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
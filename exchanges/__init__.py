@@ -6,7 +6,6 @@ This module provides a unified interface for different exchange implementations.
 from .base import BaseExchangeClient, query_retry
 from .factory import ExchangeFactory
 
-__all__ = [
-    'BaseExchangeClient', 'EdgeXClient', 'BackpackClient', 'ParadexClient',
-    'GrvtClient', 'ExchangeFactory', 'query_retry'
-]
+# Adapters are imported by ExchangeFactory when their exchange is selected, so that only
+# that venue's SDK is loaded
+__all__ = ['BaseExchangeClient', 'ExchangeFactory', 'query_retry']
@@ -23,6 +23,9 @@ from helpers.logger import TradingLogger
 class ApexClient(BaseExchangeClient):
     """Apex exchange client implementation"""
 
+    # 600 private requests a minute
+    RATE_LIMITS = {'total': (10, 20), 'order': (5, 10), 'cancel': (5, 10), 'query': (5, 10)}
+
     def __init__(self, config: Dict[str, any]):
         """Initialize Apex client."""
         super().__init__(config)
@@ -255,7 +258,7 @@ class ApexClient(BaseExchangeClient):
     @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         """Fetch best bid and ask price using official SDK"""
-        order_book = self.rest_client.depth_v3(symbol=contract_id)
+        order_book = await self.run_blocking(self.rest_client.depth_v3, symbol=contract_id)
         order_book_data = order_book['data']
 
         # Extract bids and asks from the entry
@@ -289,6 +292,8 @@ class ApexClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             try:
                 best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
 
@@ -305,7 +310,7 @@ class ApexClient(BaseExchangeClient):
                     side = 'sell'
 
                 # Place the order using official SDK (post-only to ensure maker order)
-                order_result = self.rest_client.create_order_v3(
+                order_result = await self.run_blocking(self.rest_client.create_order_v3,
                     symbol=contract_id,
                     size=str(quantity),
                     price=str(self.round_to_tick(order_price)),
@@ -373,6 +378,8 @@ class ApexClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             try:
                 best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
 
@@ -393,7 +400,7 @@ class ApexClient(BaseExchangeClient):
 
                 adjusted_price = self.round_to_tick(adjusted_price)
                 # Place the order using official SDK (post-only to avoid taker fees)
-                order_result = self.rest_client.create_order_v3(
+                order_result = await self.run_blocking(self.rest_client.create_order_v3,
                     symbol=contract_id,
                     size=str(quantity),
                     price=str(adjusted_price),
@@ -458,7 +465,7 @@ class ApexClient(BaseExchangeClient):
         """Cancel an order with Apex using official SDK."""
         try:
             # Cancel the order using official SDK
-            cancel_result = self.rest_client.delete_order_v3(id=order_id)
+            cancel_result = await self.run_blocking(self.rest_client.delete_order_v3, id=order_id)
 
             if not cancel_result or 'data' not in cancel_result:
                 return OrderResult(success=False, error_message='Failed to cancel order')
@@ -476,7 +483,7 @@ class ApexClient(BaseExchangeClient):
     @query_retry()
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information from Apex using official SDK."""
-        order_result = self.rest_client.get_order_v3(id=order_id)
+        order_result = await self.run_blocking(self.rest_client.get_order_v3, id=order_id)
         if not order_result or 'data' not in order_result:
             return None
 
@@ -495,7 +502,7 @@ class ApexClient(BaseExchangeClient):
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
         """Get active orders for a symbol using official SDK."""
         # Get active orders using official SDK
-        active_orders = self.rest_client.open_orders_v3()
+        active_orders = await self.run_blocking(self.rest_client.open_orders_v3)
 
         if not active_orders or 'data' not in active_orders:
             return []
@@ -521,7 +528,7 @@ class ApexClient(BaseExchangeClient):
     @query_retry(default_return=0)
     async def get_account_positions(self) -> Decimal:
         """Get account positions using official SDK."""
-        account_data = self.rest_client.get_account_v3()
+        account_data = await self.run_blocking(self.rest_client.get_account_v3)
         if not account_data or 'positions' not in account_data:
             self.logger.log("No positions or failed to get positions", "WARNING")
             position_amt = 0
@@ -551,7 +558,7 @@ class ApexClient(BaseExchangeClient):
             self.logger.log("Ticker is empty", "ERROR")
             raise ValueError("Ticker is empty")
 
-        response = self.rest_client.configs_v3(symbol=ticker)
+        response = await self.run_blocking(self.rest_client.configs_v3, symbol=ticker)
         data = response.get('data', {})
         if not data:
             self.logger.log("Failed to get metadata", "ERROR")
@@ -577,6 +584,7 @@ class ApexClient(BaseExchangeClient):
         if self.config.quantity < min_quantity:
             self.logger.log(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}", "ERROR")
             raise ValueError(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}")
+        self.min_quantity = min_quantity
 
         self.config.tick_size = Decimal(current_contract.get('tickSize'))
 
@@ -4,25 +4,42 @@ Aster exchange client implementation.
 
 import os
 import asyncio
-import json
 import time
 import hmac
 import hashlib
+import json
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlencode
-import aiohttp
 import websockets
 import sys
 
-from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .base import BaseExchangeClient, CloseOrderRequest, OrderResult, OrderInfo, batches, query_retry
 from helpers.logger import TradingLogger
+from helpers.http_session import HttpSessionHolder
+from helpers.json_codec import JSONDecodeError, loads
+from .messages import OrderUpdate
+
+# Aster order status -> bot order status
+ORDER_STATUS_MAP = {
+    'NEW': 'OPEN',
+    'PARTIALLY_FILLED': 'PARTIALLY_FILLED',
+    'FILLED': 'FILLED',
+    'CANCELED': 'CANCELED',
+    'REJECTED': 'REJECTED',
+    'EXPIRED': 'EXPIRED'
+}
+
+# Orders per /fapi/v1/batchOrders request
+ASTER_BATCH_ORDERS = 5
+ASTER_BATCH_CANCELS = 10
 
 
 class AsterWebSocketManager:
     """WebSocket manager for Aster order updates."""
 
-    def __init__(self, config: Dict[str, Any], api_key: str, secret_key: str, order_update_callback):
+    def __init__(self, config: Dict[str, Any], api_key: str, secret_key: str, order_update_callback,
+                 http_session: Optional[HttpSessionHolder] = None):
         self.api_key = api_key
         self.secret_key = secret_key
         self.order_update_callback = order_update_callback
@@ -35,6 +52,8 @@ class AsterWebSocketManager:
         self._keepalive_task = None
         self._last_ping_time = None
         self.config = config
+        # Listen key requests reuse the client's pooled REST session when one is given
+        self.http_session = http_session or HttpSessionHolder()
 
     def _generate_signature(self, params: Dict[str, Any]) -> str:
         """Generate HMAC SHA256 signature for Aster API authentication."""
@@ -63,17 +82,17 @@ class AsterWebSocketManager:
             'Content-Type': 'application/x-www-form-urlencoded'
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                'https://fapi.asterdex.com/fapi/v1/listenKey',
-                headers=headers,
-                data=params
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('listenKey')
-                else:
-                    raise Exception(f"Failed to get listen key: {response.status}")
+        session = self.http_session.get()
+        async with session.post(
+            f"{self.base_url}/fapi/v1/listenKey",
+            headers=headers,
+            data=params
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get('listenKey')
+            else:
+                raise Exception(f"Failed to get listen key: {response.status}")
 
     async def _keepalive_listen_key(self) -> bool:
         """Keep alive the listen key to prevent timeout."""
@@ -92,20 +111,20 @@ class AsterWebSocketManager:
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.put(
-                    f"{self.base_url}/fapi/v1/listenKey",
-                    headers=headers,
-                    data=params
-                ) as response:
-                    if response.status == 200:
-                        if self.logger:
-                            self.logger.log("Listen key keepalive successful", "DEBUG")
-                        return True
-                    else:
-                        if self.logger:
-                            self.logger.log(f"Failed to keepalive listen key: {response.status}", "WARNING")
-                        return False
+            session = self.http_session.get()
+            async with session.put(
+                f"{self.base_url}/fapi/v1/listenKey",
+                headers=headers,
+                data=params
+            ) as response:
+                if response.status == 200:
+                    if self.logger:
+                        self.logger.log("Listen key keepalive successful", "DEBUG")
+                    return True
+                else:
+                    if self.logger:
+                        self.logger.log(f"Failed to keepalive listen key: {response.status}", "WARNING")
+                    return False
         except Exception as e:
             if self.logger:
                 self.logger.log(f"Error keeping alive listen key: {e}", "ERROR")
@@ -216,9 +235,9 @@ class AsterWebSocketManager:
                     continue
 
                 try:
-                    data = json.loads(message)
+                    data = loads(message)
                     await self._handle_message(data)
-                except json.JSONDecodeError as e:
+                except JSONDecodeError as e:
                     if self.logger:
                         self.logger.log(f"Failed to parse WebSocket message: {e}", "ERROR")
                 except Exception as e:
@@ -255,43 +274,26 @@ class AsterWebSocketManager:
     async def _handle_order_update(self, order_data: Dict[str, Any]):
         """Handle order update messages."""
         try:
-            order_info = order_data.get('o', {})
-
-            order_id = order_info.get('i', '')
-            symbol = order_info.get('s', '')
-            side = order_info.get('S', '')
-            quantity = order_info.get('q', '0')
-            price = order_info.get('p', '0')
-            executed_qty = order_info.get('z', '0')
-            status = order_info.get('X', '')
-
-            # Map status
-            status_map = {
-                'NEW': 'OPEN',
-                'PARTIALLY_FILLED': 'PARTIALLY_FILLED',
-                'FILLED': 'FILLED',
-                'CANCELED': 'CANCELED',
-                'REJECTED': 'REJECTED',
-                'EXPIRED': 'EXPIRED'
-            }
-            mapped_status = status_map.get(status, status)
+            order = OrderUpdate.from_aster(order_data)
+            mapped_status = ORDER_STATUS_MAP.get(order.status, order.status)
 
             # Call the order update callback if it exists
             if hasattr(self, 'order_update_callback') and self.order_update_callback:
-                if side.lower() == self.config.close_order_side:
+                side = order.side.lower()
+                if side == self.config.close_order_side:
                     order_type = "CLOSE"
                 else:
                     order_type = "OPEN"
 
                 await self.order_update_callback({
-                    'order_id': order_id,
-                    'side': side.lower(),
+                    'order_id': order.order_id,
+                    'side': side,
                     'order_type': order_type,
                     'status': mapped_status,
-                    'size': quantity,
-                    'price': price,
-                    'contract_id': symbol,
-                    'filled_size': executed_qty
+                    'size': order.size,
+                    'price': order.price,
+                    'contract_id': order.symbol,
+                    'filled_size': order.filled_size
                 })
 
         except Exception as e:
@@ -323,6 +325,10 @@ class AsterWebSocketManager:
 class AsterClient(BaseExchangeClient):
     """Aster exchange client implementation."""
 
+    # Binance-style futures limits: 2400 request weight and 1200 orders a minute
+    RATE_LIMITS = {'total': (40, 80), 'order': (20, 40), 'cancel': (20, 40), 'query': (20, 40)}
+    NATIVE_AMEND = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Aster client."""
         super().__init__(config)
@@ -341,6 +347,12 @@ class AsterClient(BaseExchangeClient):
         self.logger = TradingLogger(exchange="aster", ticker=self.config.ticker, log_to_console=False)
         self._order_update_handler = None
 
+        # Pooled keep-alive REST session, shared with the websocket manager
+        self.http_session = HttpSessionHolder()
+
+        self.ws_url = "wss://fstream.asterdex.com"
+        self._bbo_task = None
+
     def _validate_config(self) -> None:
         """Validate Aster configuration."""
         required_env_vars = ['ASTER_API_KEY', 'ASTER_SECRET_KEY']
@@ -382,48 +394,67 @@ class AsterClient(BaseExchangeClient):
             'Content-Type': 'application/x-www-form-urlencoded'
         }
 
-        async with aiohttp.ClientSession() as session:
-            if method.upper() == 'GET':
-                # For GET requests, signature is based on query parameters only
-                signature = self._generate_signature(params)
-                params['signature'] = signature
-
-                async with session.get(url, params=params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
-            elif method.upper() == 'POST':
-                # For POST requests, signature must include both query string and request body
-                # According to Aster API docs: totalParams = queryString + requestBody
-                all_params = {**params, **data}
-                signature = self._generate_signature(all_params)
-                all_params['signature'] = signature
-
-                async with session.post(url, data=all_params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
-            elif method.upper() == 'DELETE':
-                # For DELETE requests, signature is based on query parameters only
-                signature = self._generate_signature(params)
-                params['signature'] = signature
-
-                async with session.delete(url, params=params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
+        session = self.http_session.get()
+        if method.upper() == 'GET':
+            # For GET requests, signature is based on query parameters only
+            signature = self._generate_signature(params)
+            params['signature'] = signature
+
+            async with session.get(url, params=params, headers=headers) as response:
+                self.rate_limiter.observe_response(response.status, response.headers)
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'POST':
+            # For POST requests, signature must include both query string and request body
+            # According to Aster API docs: totalParams = queryString + requestBody
+            all_params = {**params, **data}
+            signature = self._generate_signature(all_params)
+            all_params['signature'] = signature
+
+            async with session.post(url, data=all_params, headers=headers) as response:
+                self.rate_limiter.observe_response(response.status, response.headers)
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'PUT':
+            # Signed like POST: query string + request body
+            all_params = {**params, **data}
+            signature = self._generate_signature(all_params)
+            all_params['signature'] = signature
+
+            async with session.put(url, data=all_params, headers=headers) as response:
+                self.rate_limiter.observe_response(response.status, response.headers)
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'DELETE':
+            # For DELETE requests, signature is based on query parameters only
+            signature = self._generate_signature(params)
+            params['signature'] = signature
+
+            async with session.delete(url, params=params, headers=headers) as response:
+                self.rate_limiter.observe_response(response.status, response.headers)
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
 
     async def connect(self) -> None:
         """Connect to Aster WebSocket."""
+        # Open the pooled REST session up front so the first order does not pay the handshake
+        self.http_session.get()
+
         # Initialize WebSocket manager
         self.ws_manager = AsterWebSocketManager(
             config=self.config,
             api_key=self.api_key,
             secret_key=self.secret_key,
-            order_update_callback=self._handle_websocket_order_update
+            order_update_callback=self._handle_websocket_order_update,
+            http_session=self.http_session
         )
 
         # Set logger for WebSocket manager
@@ -432,6 +463,8 @@ class AsterClient(BaseExchangeClient):
         try:
             # Start WebSocket connection in background task
             asyncio.create_task(self.ws_manager.connect())
+            if self.market_data_owner:
+                self._bbo_task = asyncio.create_task(self._run_book_ticker_stream())
             # Wait a moment for connection to establish
             await asyncio.sleep(2)
         except Exception as e:
@@ -443,6 +476,9 @@ class AsterClient(BaseExchangeClient):
         try:
             if hasattr(self, 'ws_manager') and self.ws_manager:
                 await self.ws_manager.disconnect()
+            if self._bbo_task and not self._bbo_task.done():
+                self._bbo_task.cancel()
+            await self.http_session.close()
         except Exception as e:
             self.logger.log(f"Error during Aster disconnect: {e}", "ERROR")
 
@@ -462,8 +498,30 @@ class AsterClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Error handling WebSocket order update: {e}", "ERROR")
 
-    @query_retry(default_return=(0, 0))
+    async def _run_book_ticker_stream(self):
+        """Keep bbo_cache updated from the public bookTicker stream, reconnecting on errors."""
+        url = f"{self.ws_url}/ws/{self.config.contract_id.lower()}@bookTicker"
+        while True:
+            try:
+                async with websockets.connect(url) as websocket:
+                    self.logger.log(f"Subscribed to bookTicker for {self.config.contract_id}", "INFO")
+                    async for message in websocket:
+                        data = loads(message)
+                        if data.get('e') == 'bookTicker':
+                            self.bbo_cache.update(data.get('b'), data.get('a'))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.log(f"bookTicker stream error: {e}", "WARNING")
+            self.bbo_cache.clear()
+            await asyncio.sleep(1)
+
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """Fetch best bid and ask prices, from the bookTicker stream when it is fresh."""
+        return await self.get_cached_bbo_prices(contract_id, self._fetch_bbo_prices_rest)
+
+    @query_retry(default_return=(0, 0))
+    async def _fetch_bbo_prices_rest(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         """Fetch best bid and ask prices from Aster."""
         result = await self._make_request('GET', '/fapi/v1/ticker/bookTicker', {'symbol': contract_id})
 
@@ -492,6 +550,8 @@ class AsterClient(BaseExchangeClient):
         attempt = 0
         while True:
             attempt += 1
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             if attempt % 5 == 0:
                 self.logger.log(f"[OPEN] Attempt {attempt} to place order", "INFO")
                 active_orders = await self.get_active_orders(contract_id)
@@ -532,12 +592,7 @@ class AsterClient(BaseExchangeClient):
             order_status = result.get('status', '')
             order_id = result.get('orderId', '')
 
-            start_time = time.time()
-            while order_status == 'NEW' and time.time() - start_time < 2:
-                await asyncio.sleep(0.1)
-                order_info = await self.get_order_info(order_id)
-                if order_info is not None:
-                    order_status = order_info.status
+            order_status = await self._settle_post_only(order_id, order_status)
 
             if order_status in ['NEW', 'PARTIALLY_FILLED']:
                 return OrderResult(success=True, order_id=order_id, side=direction, size=quantity, price=price, status='OPEN')
@@ -563,6 +618,8 @@ class AsterClient(BaseExchangeClient):
         active_close_orders = await self._get_active_close_orders(contract_id)
         while True:
             attempt += 1
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             if attempt % 5 == 0:
                 self.logger.log(f"[CLOSE] Attempt {attempt} to place order", "INFO")
                 current_close_orders = await self._get_active_close_orders(contract_id)
@@ -580,41 +637,14 @@ class AsterClient(BaseExchangeClient):
             if best_bid <= 0 or best_ask <= 0:
                 return OrderResult(success=False, error_message='No bid/ask data available')
 
-            # Adjust order price based on market conditions and side
-            adjusted_price = price
-            if side.lower() == 'sell':
-                order_side = 'SELL'
-                # For sell orders, ensure price is above best bid to be a maker order
-                if price <= best_bid:
-                    adjusted_price = best_bid + self.config.tick_size
-            elif side.lower() == 'buy':
-                order_side = 'BUY'
-                # For buy orders, ensure price is below best ask to be a maker order
-                if price >= best_ask:
-                    adjusted_price = best_ask - self.config.tick_size
-
-            adjusted_price = self.round_to_tick(adjusted_price)
-
-            # Place the order
-            order_data = {
-                'symbol': contract_id,
-                'side': order_side,
-                'type': 'LIMIT',
-                'quantity': str(quantity),
-                'price': str(adjusted_price),
-                'timeInForce': 'GTX'  # GTX is Good Till Crossing (Post Only)
-            }
+            order_data = self._close_order_data(contract_id, quantity, price, side, best_bid, best_ask)
+            order_side, adjusted_price = order_data['side'], Decimal(order_data['price'])
 
             result = await self._make_request('POST', '/fapi/v1/order', data=order_data)
             order_status = result.get('status', '')
             order_id = result.get('orderId', '')
 
-            start_time = time.time()
-            while order_status == 'NEW' and time.time() - start_time < 2:
-                await asyncio.sleep(0.1)
-                order_info = await self.get_order_info(order_id)
-                if order_info is not None:
-                    order_status = order_info.status
+            order_status = await self._settle_post_only(order_id, order_status)
 
             if order_status in ['NEW', 'PARTIALLY_FILLED']:
                 return OrderResult(success=True, order_id=order_id, side=order_side.lower(),
@@ -627,6 +657,110 @@ class AsterClient(BaseExchangeClient):
             else:
                 return OrderResult(success=False, error_message='Unknown order status: ' + order_status)
 
+    def _close_order_data(self, contract_id: str, quantity: Decimal, price: Decimal, side: str,
+                          best_bid: Decimal, best_ask: Decimal) -> Dict[str, Any]:
+        """Post-only close order parameters, with the price moved off the BBO to stay a maker order."""
+        # Adjust order price based on market conditions and side
+        adjusted_price = price
+        if side.lower() == 'sell':
+            order_side = 'SELL'
+            # For sell orders, ensure price is above best bid to be a maker order
+            if price <= best_bid:
+                adjusted_price = best_bid + self.config.tick_size
+        elif side.lower() == 'buy':
+            order_side = 'BUY'
+            # For buy orders, ensure price is below best ask to be a maker order
+            if price >= best_ask:
+                adjusted_price = best_ask - self.config.tick_size
+        else:
+            raise Exception(f"[CLOSE] Invalid side: {side}")
+
+        return {
+            'symbol': contract_id,
+            'side': order_side,
+            'type': 'LIMIT',
+            'quantity': str(quantity),
+            'price': str(self.round_to_tick(adjusted_price)),
+            'timeInForce': 'GTX'  # GTX is Good Till Crossing (Post Only)
+        }
+
+    async def _settle_post_only(self, order_id, order_status: str) -> str:
+        """Follow a just-placed GTX order for up to 2s: a crossing order turns EXPIRED shortly after NEW."""
+        start_time = time.time()
+        while order_status == 'NEW' and time.time() - start_time < 2:
+            await asyncio.sleep(0.1)
+            order_info = await self.get_order_info(order_id)
+            if order_info is not None:
+                order_status = order_info.status
+        return order_status
+
+    async def place_orders_batch(self, orders: List[CloseOrderRequest]) -> List[OrderResult]:
+        """Place close orders through /fapi/v1/batchOrders (up to 5 per request).
+
+        Orders rejected for crossing the book (EXPIRED) are placed again one by one with
+        place_close_order, which re-prices them from the current BBO.
+        """
+        if len(orders) < 2:
+            return await super().place_orders_batch(orders)
+
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return [OrderResult(success=False, error_message='No bid/ask data available') for _ in orders]
+
+        results: List[Optional[OrderResult]] = []
+        for chunk in batches(orders, ASTER_BATCH_ORDERS):
+            await self.throttle('order')
+            batch = [self._close_order_data(order.contract_id, order.quantity, order.price, order.side,
+                                            best_bid, best_ask) for order in chunk]
+            try:
+                response = await self._make_request('POST', '/fapi/v1/batchOrders',
+                                                    data={'batchOrders': json.dumps(batch)})
+            except Exception as e:
+                results.extend(OrderResult(success=False, error_message=str(e)) for _ in chunk)
+                continue
+            statuses = await asyncio.gather(*(
+                self._settle_post_only(item.get('orderId', ''), item.get('status', '')) for item in response))
+            for order, order_data, item, status in zip(chunk, batch, response, statuses):
+                if 'orderId' not in item:
+                    results.append(OrderResult(success=False, error_message=item.get('msg', 'Unknown error')))
+                elif status in ('NEW', 'PARTIALLY_FILLED', 'FILLED'):
+                    results.append(OrderResult(
+                        success=True, order_id=item['orderId'], side=order_data['side'].lower(),
+                        size=order.quantity, price=Decimal(order_data['price']),
+                        status='FILLED' if status == 'FILLED' else 'OPEN'))
+                elif status == 'EXPIRED':
+                    results.append(None)
+                else:
+                    results.append(OrderResult(success=False, error_message='Unknown order status: ' + status))
+
+        retries = [order for order, result in zip(orders, results) if result is None]
+        retried = iter(await super().place_orders_batch(retries)) if retries else iter(())
+        return [result if result is not None else next(retried) for result in results]
+
+    async def cancel_orders_batch(self, order_ids: List[str]) -> List[OrderResult]:
+        """Cancel orders through DELETE /fapi/v1/batchOrders (up to 10 per request)."""
+        if len(order_ids) < 2:
+            return await super().cancel_orders_batch(order_ids)
+
+        results = []
+        for chunk in batches(order_ids, ASTER_BATCH_CANCELS):
+            await self.throttle('cancel')
+            try:
+                response = await self._make_request('DELETE', '/fapi/v1/batchOrders', {
+                    'symbol': self.config.contract_id,
+                    'orderIdList': json.dumps([int(order_id) for order_id in chunk])
+                })
+            except Exception as e:
+                results.extend(OrderResult(success=False, error_message=str(e)) for _ in chunk)
+                continue
+            for item in response:
+                if 'orderId' in item:
+                    results.append(OrderResult(success=True, order_id=str(item['orderId']),
+                                               filled_size=Decimal(item.get('executedQty', 0))))
+                else:
+                    results.append(OrderResult(success=False, error_message=item.get('msg', 'Unknown error')))
+        return results
+
     async def place_market_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
         """Place a market order with Aster."""
         # Validate direction
@@ -666,6 +800,30 @@ class AsterClient(BaseExchangeClient):
                 status='FILLED'
             )
 
+    async def amend_order(self, order_id: str, contract_id: str, quantity: Decimal, price: Decimal,
+                          side: str) -> OrderResult:
+        """Modify the order's price and size in place with PUT /fapi/v1/order (it keeps its id and
+        its GTX time in force, so a modify that would cross the book is rejected)."""
+        price = self.round_to_tick(price)
+        try:
+            result = await self._make_request('PUT', '/fapi/v1/order', data={
+                'symbol': contract_id,
+                'orderId': order_id,
+                'side': side.upper(),
+                'quantity': str(quantity),
+                'price': str(price)
+            })
+        except Exception as e:
+            return OrderResult(success=False, order_id=order_id, error_message=str(e))
+
+        order_status = result.get('status', '')
+        if order_status in ['NEW', 'PARTIALLY_FILLED']:
+            return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='OPEN')
+        elif order_status == 'FILLED':
+            return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='FILLED')
+        return OrderResult(success=False, order_id=order_id,
+                           error_message=result.get('msg') or f'Order {order_status} after modify')
+
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with Aster."""
         try:
@@ -769,6 +927,7 @@ class AsterClient(BaseExchangeClient):
                             min_quantity = Decimal(filter_info.get('minQty', 0))
                             break
 
+                    self.min_quantity = min_quantity
                     if self.config.quantity < min_quantity:
                         self.logger.log(
                             f"Order quantity is less than min quantity: "
@@ -18,16 +18,20 @@ from bpx.constants.enums import OrderTypeEnum, TimeInForceEnum
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
 from helpers.logger import TradingLogger
+from helpers.json_codec import JSONDecodeError, loads
+from .messages import OrderUpdate
 
 
 class BackpackWebSocketManager:
     """WebSocket manager for Backpack order updates."""
 
-    def __init__(self, public_key: str, secret_key: str, symbol: str, order_update_callback):
+    def __init__(self, public_key: str, secret_key: str, symbol: str, order_update_callback, bbo_callback=None):
         self.public_key = public_key
         self.secret_key = secret_key
         self.symbol = symbol
         self.order_update_callback = order_update_callback
+        # Called with (best_bid, best_ask) for every bookTicker message
+        self.bbo_callback = bbo_callback
         self.websocket = None
         self.running = False
         self.ws_url = "wss://ws.backpack.exchange"
@@ -76,6 +80,13 @@ class BackpackWebSocketManager:
                 if self.logger:
                     self.logger.log(f"Subscribed to order updates for {self.symbol}", "INFO")
 
+                if self.bbo_callback:
+                    # Public stream, no signature needed
+                    await self.websocket.send(json.dumps({
+                        "method": "SUBSCRIBE",
+                        "params": [f"bookTicker.{self.symbol}"]
+                    }))
+
                 # Start listening for messages
                 await self._listen()
 
@@ -91,9 +102,9 @@ class BackpackWebSocketManager:
                     break
 
                 try:
-                    data = json.loads(message)
+                    data = loads(message)
                     await self._handle_message(data)
-                except json.JSONDecodeError as e:
+                except JSONDecodeError as e:
                     if self.logger:
                         self.logger.log(f"Failed to parse WebSocket message: {e}", "ERROR")
                 except Exception as e:
@@ -114,7 +125,9 @@ class BackpackWebSocketManager:
             payload = data.get('data', {})
 
             if 'orderUpdate' in stream:
-                await self._handle_order_update(payload)
+                await self._handle_order_update(OrderUpdate.from_backpack(payload))
+            elif stream.startswith('bookTicker') and self.bbo_callback:
+                self.bbo_callback(payload.get('b'), payload.get('a'))
             else:
                 self.logger.log(f"Unknown WebSocket message: {data}", "ERROR")
 
@@ -122,7 +135,7 @@ class BackpackWebSocketManager:
             if self.logger:
                 self.logger.log(f"Error handling WebSocket message: {e}", "ERROR")
 
-    async def _handle_order_update(self, order_data: Dict[str, Any]):
+    async def _handle_order_update(self, order_data: OrderUpdate):
         """Handle order update messages."""
         try:
             # Call the order update callback if it exists
@@ -152,6 +165,9 @@ class BackpackWebSocketManager:
 class BackpackClient(BaseExchangeClient):
     """Backpack exchange client implementation."""
 
+    # Backpack does not publish per-endpoint limits; conservative, with queries kept lowest
+    RATE_LIMITS = {'total': (20, 40), 'order': (10, 20), 'cancel': (10, 20), 'query': (5, 10)}
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Backpack client."""
         super().__init__(config)
@@ -186,7 +202,8 @@ class BackpackClient(BaseExchangeClient):
             public_key=self.public_key,
             secret_key=self.secret_key,
             symbol=self.config.contract_id,  # Use contract_id as symbol for Backpack
-            order_update_callback=self._handle_websocket_order_update
+            order_update_callback=self._handle_websocket_order_update,
+            bbo_callback=self.bbo_cache.update if self.market_data_owner else None
         )
         # Pass config to WebSocket manager for order type determination
         self.ws_manager.config = self.config
@@ -220,16 +237,16 @@ class BackpackClient(BaseExchangeClient):
         """Setup order update handler for WebSocket."""
         self._order_update_handler = handler
 
-    async def _handle_websocket_order_update(self, order_data: Dict[str, Any]):
+    async def _handle_websocket_order_update(self, order_data: OrderUpdate):
         """Handle order updates from WebSocket."""
         try:
-            event_type = order_data.get('e', '')
-            order_id = order_data.get('i', '')
-            symbol = order_data.get('s', '')
-            side = order_data.get('S', '')
-            quantity = order_data.get('q', '0')
-            price = order_data.get('p', '0')
-            fill_quantity = order_data.get('z', '0')
+            event_type = order_data.event
+            order_id = order_data.order_id
+            symbol = order_data.symbol
+            side = order_data.side
+            quantity = order_data.size
+            price = order_data.price
+            fill_quantity = order_data.filled_size
 
             # Only process orders for our symbol
             if symbol != self.config.contract_id:
@@ -299,10 +316,14 @@ class BackpackClient(BaseExchangeClient):
             order_price = best_bid + self.config.tick_size
         return self.round_to_tick(order_price)
 
-    @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """Fetch best bid and ask prices, from the bookTicker stream when it is fresh."""
+        return await self.get_cached_bbo_prices(contract_id, self._fetch_bbo_prices_rest)
+
+    @query_retry(default_return=(0, 0))
+    async def _fetch_bbo_prices_rest(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         # Get order book depth from Backpack
-        order_book = self.public_client.get_depth(contract_id)
+        order_book = await self.run_blocking(self.public_client.get_depth, contract_id)
 
         # Extract bids and asks directly from Backpack response
         bids = order_book.get('bids', [])
@@ -325,6 +346,8 @@ class BackpackClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             retry_count += 1
 
             best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
@@ -342,7 +365,7 @@ class BackpackClient(BaseExchangeClient):
                 side = 'Ask'
 
             # Place the order using Backpack SDK (post-only to ensure maker order)
-            order_result = self.account_client.execute_order(
+            order_result = await self.run_blocking(self.account_client.execute_order,
                 symbol=contract_id,
                 side=side,
                 order_type=OrderTypeEnum.LIMIT,
@@ -388,7 +411,7 @@ class BackpackClient(BaseExchangeClient):
         else:
             raise Exception(f"[OPEN] Invalid direction: {direction}")
 
-        result = self.account_client.execute_order(
+        result = await self.run_blocking(self.account_client.execute_order,
             symbol=contract_id,
             side=side,
             order_type=OrderTypeEnum.MARKET,
@@ -419,6 +442,8 @@ class BackpackClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             retry_count += 1
             # Get current market prices to adjust order price if needed
             best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
@@ -441,7 +466,7 @@ class BackpackClient(BaseExchangeClient):
 
             adjusted_price = self.round_to_tick(adjusted_price)
             # Place the order using Backpack SDK (post-only to avoid taker fees)
-            order_result = self.account_client.execute_order(
+            order_result = await self.run_blocking(self.account_client.execute_order,
                 symbol=contract_id,
                 side=order_side,
                 order_type=OrderTypeEnum.LIMIT,
@@ -481,7 +506,7 @@ class BackpackClient(BaseExchangeClient):
         """Cancel an order with Backpack using official SDK."""
         try:
             # Cancel the order using Backpack SDK
-            cancel_result = self.account_client.cancel_order(
+            cancel_result = await self.run_blocking(self.account_client.cancel_order,
                 symbol=self.config.contract_id,
                 order_id=order_id
             )
@@ -503,7 +528,7 @@ class BackpackClient(BaseExchangeClient):
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information from Backpack using official SDK."""
         # Get order information using Backpack SDK
-        order_result = self.account_client.get_open_order(
+        order_result = await self.run_blocking(self.account_client.get_open_order,
             symbol=self.config.contract_id,
             order_id=order_id
         )
@@ -526,7 +551,7 @@ class BackpackClient(BaseExchangeClient):
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
         """Get active orders for a contract using official SDK."""
         # Get active orders using Backpack SDK
-        active_orders = self.account_client.get_open_orders(symbol=contract_id)
+        active_orders = await self.run_blocking(self.account_client.get_open_orders, symbol=contract_id)
 
         if not active_orders:
             return []
@@ -556,7 +581,7 @@ class BackpackClient(BaseExchangeClient):
     @query_retry(default_return=0)
     async def get_account_positions(self) -> Decimal:
         """Get account positions using official SDK."""
-        positions_data = self.account_client.get_open_positions()
+        positions_data = await self.run_blocking(self.account_client.get_open_positions)
         position_amt = 0
         for position in positions_data:
             if position.get('symbol', '') == self.config.contract_id:
@@ -571,7 +596,7 @@ class BackpackClient(BaseExchangeClient):
             self.logger.log("Ticker is empty", "ERROR")
             raise ValueError("Ticker is empty")
 
-        markets = self.public_client.get_markets()
+        markets = await self.run_blocking(self.public_client.get_markets)
         for market in markets:
             if (market.get('marketType', '') == 'PERP' and market.get('baseSymbol', '') == ticker and
                     market.get('quoteSymbol', '') == 'USDC'):
@@ -587,6 +612,7 @@ class BackpackClient(BaseExchangeClient):
         if self.config.quantity < min_quantity:
             self.logger.log(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}", "ERROR")
             raise ValueError(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}")
+        self.min_quantity = min_quantity
 
         if self.config.tick_size == 0:
             self.logger.log("Failed to get tick size for ticker", "ERROR")
@@ -3,12 +3,24 @@ Base exchange client interface.
 All exchange implementations should inherit from this class.
 """
 
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple, Type, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple, Type, Union
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
 from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from helpers.metadata_cache import MarketMetadataCache, get_metadata_cache
+from helpers.metrics import timed_request
+from helpers.rate_limit import (DEFAULT_RATE_LIMITS, PRIORITY_CANCEL, PRIORITY_HEDGE, PRIORITY_PLACE, RateLimiter,
+                                rate_limits_for)
+
 
 def query_retry(
     default_return: Any = None,
@@ -23,7 +35,7 @@ def query_retry(
               f"exception: {str(retry_state.outcome.exception())}")
         return default_return
 
-    return retry(
+    retrying = retry(
         stop=stop_after_attempt(max_attempts),
         wait=wait_exponential(multiplier=1, min=min_wait, max=max_wait),
         retry=retry_if_exception_type(exception_type),
@@ -31,6 +43,72 @@ def query_retry(
         reraise=reraise
     )
 
+    def decorator(func):
+        if not asyncio.iscoroutinefunction(func):
+            return retrying(func)
+
+        # Every attempt of an exchange client query waits for a 'query' slot of its rate limiter
+        @functools.wraps(func)
+        async def throttled(*args, **kwargs):
+            if args and isinstance(args[0], BaseExchangeClient):
+                await args[0].throttle('query')
+            return await func(*args, **kwargs)
+        return retrying(throttled)
+
+    return decorator
+
+
+# Request slot taken by the place_*/cancel_order wrapper: [endpoint class, priority, unused, method name]
+_prepaid_request: contextvars.ContextVar = contextvars.ContextVar('prepaid_request', default=None)
+
+
+def order_entry(method):
+    """Rate limit and time an adapter's place_*/cancel_order (applied by BaseExchangeClient).
+
+    Cancels and market (hedge) orders get priority over placements. The slot taken here is
+    used by the first throttle() call in the method, so retry loops throttle every attempt
+    without paying twice for the first. An override calling its own super() method runs on the
+    caller's slot; any other nested order entry (the default batch and amend paths calling
+    place_close_order/cancel_order) takes its own.
+    """
+    name = method.__name__
+    if name in ('cancel_order', 'cancel_orders_batch'):
+        endpoint_class, priority = 'cancel', PRIORITY_CANCEL
+    elif name == 'place_market_order':
+        endpoint_class, priority = 'order', PRIORITY_HEDGE
+    else:
+        endpoint_class, priority = 'order', PRIORITY_PLACE
+    timed = timed_request(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        prepaid = _prepaid_request.get()
+        if prepaid is not None and prepaid[3] == name:
+            return await method(self, *args, **kwargs)
+        await self.rate_limiter.acquire(endpoint_class, priority)
+        token = _prepaid_request.set([endpoint_class, priority, True, name])
+        try:
+            return await timed(self, *args, **kwargs)
+        finally:
+            _prepaid_request.reset(token)
+    return wrapper
+
+
+# Shared pool for synchronous SDK calls (REST clients without an async API). Bounded so a
+# burst of slow requests cannot spawn unlimited threads; sized for a few concurrent
+# clients each with a handful of requests in flight.
+BLOCKING_EXECUTOR_WORKERS = 8
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor used by BaseExchangeClient.run_blocking."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_EXECUTOR_WORKERS,
+                                                thread_name_prefix="exchange-io")
+    return _blocking_executor
+
 
 @dataclass
 class OrderResult:
@@ -45,6 +123,15 @@ class OrderResult:
     filled_size: Optional[Decimal] = None
 
 
+@dataclass
+class CloseOrderRequest:
+    """One post-only close order of a place_orders_batch() call."""
+    contract_id: str
+    quantity: Decimal
+    price: Decimal
+    side: str
+
+
 @dataclass
 class OrderInfo:
     """Standardized order information structure."""
@@ -58,13 +145,514 @@ class OrderInfo:
     cancel_reason: str = ''
 
 
+# Order statuses after which an order is no longer resting on the book
+TERMINAL_STATUSES = frozenset({'FILLED', 'CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED'})
+
+ORDER_STATE_RECONCILE_INTERVAL = 30
+# Seconds a placement waits for its websocket update before asking the REST API
+ORDER_ACK_TIMEOUT = 2
+# Latest update kept per order id for acknowledgements that arrive before the REST response
+ORDER_ACK_HISTORY = 1000
+
+
+def _status_matches(order: OrderInfo, statuses: Optional[frozenset]) -> bool:
+    # Lighter reports variants such as "canceled-post-only"
+    return statuses is None or order.status.split('-')[0] in statuses
+
+
+def _set_result(future: asyncio.Future, result) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+class OrderStateStore:
+    """Active orders keyed by order id, maintained from websocket order updates.
+
+    Adapters already push every order event through setup_order_update_handler, so callers
+    can read live orders from here instead of polling get_active_orders(); a REST snapshot
+    is only needed periodically to repair missed events. Updates may arrive from SDK
+    threads (Apex, EdgeX), hence the lock. As with get_active_orders(), OrderInfo.size is
+    the remaining size.
+
+    Placements wait for their acknowledgement here (wait_for_update) instead of sleeping or
+    polling the REST API; updates can also be looked up by client order id where the venue
+    reports one.
+    """
+
+    def __init__(self, reconcile_interval: float = ORDER_STATE_RECONCILE_INTERVAL):
+        self.reconcile_interval = reconcile_interval
+        self._orders: Dict[str, OrderInfo] = {}
+        # Last websocket event time per order id, live or terminal; used to keep events that
+        # arrive while a REST snapshot is in flight
+        self._updated_at: Dict[str, float] = {}
+        # Latest update per order id and per "client:<id>", and the futures waiting for one
+        self._last_update: Dict[str, OrderInfo] = {}
+        self._waiters: Dict[str, List[Tuple[Optional[frozenset], asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+        self.last_reconcile_time = 0.0
+        self.updates = 0
+        self.reconciles = 0
+
+    @staticmethod
+    def _order_info(order_id: str, side: str, size, price, status: str, filled_size) -> OrderInfo:
+        size = Decimal(str(size)) if size is not None else Decimal(0)
+        filled_size = Decimal(str(filled_size)) if filled_size is not None else Decimal(0)
+        remaining_size = max(size - filled_size, Decimal(0))
+        return OrderInfo(
+            order_id=order_id,
+            side=str(side).lower(),
+            size=remaining_size,
+            price=Decimal(str(price)) if price is not None else Decimal(0),
+            status=str(status).upper(),
+            filled_size=filled_size,
+            remaining_size=remaining_size
+        )
+
+    def apply_update(self, order_id, side: str, size, price, status: str, filled_size=0,
+                     client_order_id=None) -> None:
+        """Apply one websocket order update."""
+        if order_id is None:
+            return
+        order_id = str(order_id)
+        order = self._order_info(order_id, side, size, price, status, filled_size)
+        keys = [order_id] if client_order_id is None else [order_id, f"client:{client_order_id}"]
+        now = time.time()
+        with self._lock:
+            self.updates += 1
+            self._updated_at[order_id] = now
+            for key in keys:
+                self._acknowledge(key, order)
+            if order.status.split('-')[0] in TERMINAL_STATUSES:
+                self._orders.pop(order_id, None)
+            else:
+                self._orders[order_id] = order
+
+    def _acknowledge(self, key: str, order: OrderInfo) -> None:
+        """Remember the update and resolve the futures waiting for it (lock held)."""
+        self._last_update.pop(key, None)
+        self._last_update[key] = order
+        if len(self._last_update) > ORDER_ACK_HISTORY:
+            del self._last_update[next(iter(self._last_update))]
+        waiters = self._waiters.get(key)
+        if not waiters:
+            return
+        for statuses, future in list(waiters):
+            if _status_matches(order, statuses):
+                waiters.remove((statuses, future))
+                # Updates may come from SDK threads
+                future.get_loop().call_soon_threadsafe(_set_result, future, order)
+
+    def apply_message(self, message: Dict) -> None:
+        """Apply an update in the standard order_update_handler message format."""
+        self.apply_update(message.get('order_id'), message.get('side', ''), message.get('size'),
+                          message.get('price'), message.get('status', ''), message.get('filled_size'),
+                          message.get('client_order_id'))
+
+    def add_placed(self, order_id, side: str, size, price) -> None:
+        """Record an order we just placed, unless its websocket events already arrived."""
+        if order_id is None:
+            return
+        order_id = str(order_id)
+        order = self._order_info(order_id, side, size, price, 'OPEN', 0)
+        with self._lock:
+            if order_id in self._updated_at:
+                return
+            # Not an acknowledgement: the venue has not confirmed the order yet
+            self._updated_at[order_id] = time.time()
+            self._orders[order_id] = order
+
+    async def wait_for_update(self, order_id=None, client_order_id=None, statuses: Optional[Iterable[str]] = None,
+                              timeout: float = ORDER_ACK_TIMEOUT) -> Optional[OrderInfo]:
+        """The order's latest websocket update with one of `statuses` (any status if None), waiting
+        up to `timeout` seconds for it to arrive. None on timeout: callers fall back to REST."""
+        key = str(order_id) if order_id is not None else f"client:{client_order_id}"
+        statuses = frozenset(status.upper() for status in statuses) if statuses is not None else None
+        with self._lock:
+            order = self._last_update.get(key)
+            if order is not None and _status_matches(order, statuses):
+                return order
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(key, []).append((statuses, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(key, [])
+                if (statuses, future) in waiters:
+                    waiters.remove((statuses, future))
+                if not waiters:
+                    self._waiters.pop(key, None)
+
+    def needs_reconcile(self) -> bool:
+        return time.time() - self.last_reconcile_time >= self.reconcile_interval
+
+    def reconcile(self, orders: Iterable[OrderInfo], requested_at: float) -> None:
+        """Replace the state with a REST snapshot requested at `requested_at`.
+
+        Orders with a websocket event newer than the request keep their websocket state,
+        since the snapshot may predate that event.
+        """
+        snapshot = {str(order.order_id): order for order in orders}
+        with self._lock:
+            orders_by_id = {}
+            for order_id, order in snapshot.items():
+                if self._updated_at.get(order_id, 0) <= requested_at:
+                    orders_by_id[order_id] = order
+            for order_id, order in self._orders.items():
+                if self._updated_at.get(order_id, 0) > requested_at:
+                    orders_by_id[order_id] = order
+            self._orders = orders_by_id
+            # Forget event times older than the snapshot; the snapshot now covers them
+            self._updated_at = {order_id: t for order_id, t in self._updated_at.items() if t > requested_at}
+            self.last_reconcile_time = time.time()
+            self.reconciles += 1
+
+    def active_orders(self, side: Optional[str] = None) -> List[OrderInfo]:
+        with self._lock:
+            orders = list(self._orders.values())
+        if side is not None:
+            orders = [order for order in orders if order.side == side]
+        return orders
+
+    def get(self, order_id) -> Optional[OrderInfo]:
+        with self._lock:
+            return self._orders.get(str(order_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._orders.clear()
+            self._updated_at.clear()
+            self._last_update.clear()
+            self.last_reconcile_time = 0.0
+
+
+# Queries whose concurrent identical calls share one request (see RequestCoalescer). Results of
+# get_contract_attributes are never shared between clients: the call also configures the client.
+COALESCED_QUERIES = ('get_active_orders', 'get_account_positions', 'fetch_bbo_prices', 'get_contract_attributes')
+PER_CLIENT_QUERIES = ('get_contract_attributes',)
+
+
+class RequestCoalescer:
+    """Single-flight for identical concurrent queries, with an optional freshness window.
+
+    The first caller starts the request as a task; callers arriving while it is in flight
+    await the same task (shielded, so one caller being cancelled does not cancel the others).
+    With `window` > 0, a result is also returned to calls within `window` seconds after it
+    completed. Exceptions are shared by the in-flight callers but never cached. Can be
+    shared by the clients of one account (see fleet.py).
+    """
+
+    def __init__(self, window: float = 0.0):
+        self.window = window
+        # key -> (task, wall-clock time the request was started)
+        self._inflight: Dict[Any, Tuple[asyncio.Future, float]] = {}
+        # key -> (monotonic completion time, result, request start time)
+        self._results: Dict[Any, Tuple[float, Any, float]] = {}
+        self.calls = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.fresh_hits = 0
+
+    @property
+    def saved(self) -> int:
+        """Calls answered without a request of their own."""
+        return self.coalesced + self.fresh_hits
+
+    @staticmethod
+    def last_requested_at() -> Optional[float]:
+        """Wall-clock start of the request behind the last result returned to this task."""
+        return _result_requested_at.get()
+
+    async def call(self, key, fetch):
+        self.calls += 1
+        if self.window > 0:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.window:
+                self.fresh_hits += 1
+                _result_requested_at.set(cached[2])
+                return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self.requests += 1
+            inflight = (asyncio.ensure_future(fetch()), time.time())
+            self._inflight[key] = inflight
+            inflight[0].add_done_callback(functools.partial(self._finished, key, inflight[1]))
+        else:
+            self.coalesced += 1
+        task, requested_at = inflight
+        result = await asyncio.shield(task)
+        _result_requested_at.set(requested_at)
+        return result
+
+    def _finished(self, key, requested_at: float, task: asyncio.Future) -> None:
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            self._results.pop(key, None)
+        elif self.window > 0:
+            self._results[key] = (time.monotonic(), task.result(), requested_at)
+
+    def stats(self) -> str:
+        return (f"{self.calls} calls, {self.requests} requests, {self.coalesced} coalesced, "
+                f"{self.fresh_hits} fresh hits")
+
+
+_result_requested_at: contextvars.ContextVar = contextvars.ContextVar('result_requested_at', default=None)
+
+
+_coalescing_key: contextvars.ContextVar = contextvars.ContextVar('coalescing_key', default=None)
+
+
+def coalesced_query(method):
+    """Route an adapter query through the client's RequestCoalescer (applied by BaseExchangeClient)."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = self._coalesce_key(name, args, kwargs)
+        try:
+            hash(key)
+        except TypeError:
+            return await method(self, *args, **kwargs)
+        if _coalescing_key.get() == key:
+            # Nested call of the same query (an adapter calling super()) inside its own request
+            return await method(self, *args, **kwargs)
+
+        async def fetch():
+            _coalescing_key.set(key)  # runs in its own task, so this does not leak to callers
+            return await method(self, *args, **kwargs)
+        return await self.request_coalescer.call(key, fetch)
+    return wrapper
+
+
+# Set while an adapter's own get_contract_attributes runs, so nested (super()) calls go straight through
+_fetching_metadata: contextvars.ContextVar = contextvars.ContextVar('fetching_metadata', default=False)
+
+
+def cached_metadata(method):
+    """Serve get_contract_attributes from the persistent market-metadata cache (applied by
+    BaseExchangeClient). A hit configures the client from the cached entry without a request."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        cache = self.metadata_cache
+        if cache is None or self.METADATA_ATTRIBUTES is None or _fetching_metadata.get():
+            return await method(self, *args, **kwargs)
+
+        async def fetch():
+            token = _fetching_metadata.set(True)
+            try:
+                await method(self, *args, **kwargs)
+            finally:
+                _fetching_metadata.reset(token)
+            return self._market_metadata()
+
+        def refresh_failed(e: Exception) -> None:
+            self.logger.log(f"Failed to refresh market metadata: {e}", "WARNING")
+
+        key = cache.key(self.get_exchange_name(), self.config.ticker)
+        data, cached = await cache.get_or_fetch(key, fetch, refresh_failed)
+        if cached:
+            self._apply_market_metadata(data)
+        return self.config.contract_id, self.config.tick_size
+    return wrapper
+
+
+# Streamed prices older than this (seconds) are treated as stale and re-fetched over REST
+BBO_MAX_AGE = 5
+
+
+class BBOCache:
+    """Top of book pushed by a venue's bookTicker/BBO/depth stream, with staleness tracking.
+
+    update() may be called from SDK threads; the (bid, ask, time) tuple is swapped in one
+    assignment so readers never see a half-updated quote. Listeners are called (on the
+    updating thread) whenever the best bid or ask changes.
+    """
+
+    def __init__(self, max_age: float = BBO_MAX_AGE):
+        self.max_age = max_age
+        self._quote: Optional[Tuple[Decimal, Decimal, float]] = None
+        self.listeners: List[Callable[[], None]] = []
+        self.updates = 0
+        self.hits = 0
+        self.rest_fallbacks = 0
+
+    def update(self, best_bid, best_ask) -> None:
+        """Record a streamed quote. Empty or crossed quotes are ignored."""
+        if not best_bid or not best_ask:
+            return
+        best_bid, best_ask = Decimal(str(best_bid)), Decimal(str(best_ask))
+        if best_bid <= 0 or best_ask <= 0 or best_bid >= best_ask:
+            return
+        previous = self._quote
+        self._quote = (best_bid, best_ask, time.time())
+        self.updates += 1
+        if previous is None or previous[0] != best_bid or previous[1] != best_ask:
+            for listener in self.listeners:
+                listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener()` on every top-of-book change. It must be thread-safe."""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def age(self) -> Optional[float]:
+        quote = self._quote
+        return None if quote is None else time.time() - quote[2]
+
+    def get(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Return (best_bid, best_ask) if a quote newer than max_age exists, else None."""
+        quote = self._quote
+        if quote is None or time.time() - quote[2] > self.max_age:
+            return None
+        return quote[0], quote[1]
+
+    def clear(self) -> None:
+        self._quote = None
+
+
+def feeds_order_state(method):
+    """Pass every order update an adapter sends to the bot's handler through its order_state
+    first (applied by BaseExchangeClient), so placements can wait for their acknowledgement."""
+    @functools.wraps(method)
+    def wrapper(self, handler) -> None:
+        if handler is None:
+            return method(self, handler)
+
+        def handle(message):
+            try:
+                if message.get('contract_id') == self.config.contract_id:
+                    self.order_state.apply_message(message)
+            finally:
+                handler(message)
+        return method(self, handle)
+    return wrapper
+
+
+def _as_order_result(result) -> OrderResult:
+    if isinstance(result, BaseException):
+        if not isinstance(result, Exception):
+            raise result
+        return OrderResult(success=False, error_message=str(result))
+    return result
+
+
+def batches(items: List, size: int) -> List[List]:
+    """Split `items` into chunks of at most `size` (a venue's batch limit)."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
 class BaseExchangeClient(ABC):
     """Base class for all exchange clients."""
 
+    # (requests per second, burst) per endpoint class, see helpers/rate_limit.py
+    RATE_LIMITS = DEFAULT_RATE_LIMITS
+    # Adapter attributes set by get_contract_attributes that are cached with the contract id and
+    # tick size (helpers/metadata_cache.py). None disables the cache for the adapter.
+    METADATA_ATTRIBUTES: Optional[Tuple[str, ...]] = ('min_quantity',)
+    # Whether amend_order re-prices the order in one request (the venue's modify endpoint)
+    # rather than the default cancel + place
+    NATIVE_AMEND = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Order entry is rate limited and timed (exchange_request{exchange, operation} in helpers.metrics),
+        # identical concurrent queries share one request (RequestCoalescer), market metadata is
+        # read from the persistent cache and order updates maintain order_state
+        for name, method in list(cls.__dict__.items()):
+            if name == 'setup_order_update_handler' and callable(method):
+                setattr(cls, name, feeds_order_state(method))
+            if not asyncio.iscoroutinefunction(method):
+                continue
+            if name.startswith('place_') or name in ('amend_order', 'cancel_order', 'cancel_orders_batch'):
+                setattr(cls, name, order_entry(method))
+            elif name in COALESCED_QUERIES:
+                if name == 'get_contract_attributes':
+                    method = cached_metadata(method)
+                setattr(cls, name, coalesced_query(method))
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize the exchange client with configuration."""
         self.config = config
         self._validate_config()
+        # Live orders from websocket updates, see get_cached_active_orders()
+        self.order_state = OrderStateStore()
+        # Streamed top of book, see get_cached_bbo_prices()
+        self.bbo_cache = BBOCache()
+        # False when another client in this process streams this market (see use_shared_market_data)
+        self.market_data_owner = True
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Client-side rate limiter, created on first use from RATE_LIMITS and RATE_LIMIT_<EXCHANGE>."""
+        limiter = self.__dict__.get('_rate_limiter')
+        if limiter is None:
+            limiter = RateLimiter(rate_limits_for(self.get_exchange_name(), self.RATE_LIMITS))
+            self._rate_limiter = limiter
+        return limiter
+
+    @property
+    def request_coalescer(self) -> RequestCoalescer:
+        """Single-flight for COALESCED_QUERIES; REQUEST_FRESHNESS_WINDOW (seconds) also reuses recent results."""
+        coalescer = self.__dict__.get('_request_coalescer')
+        if coalescer is None:
+            coalescer = RequestCoalescer(window=float(os.getenv('REQUEST_FRESHNESS_WINDOW', '0')))
+            self._request_coalescer = coalescer
+        return coalescer
+
+    def use_shared_requests(self, coalescer: RequestCoalescer) -> None:
+        """Share query results with the other clients of the same account (see fleet.py)."""
+        self._request_coalescer = coalescer
+
+    def _coalesce_key(self, name: str, args, kwargs):
+        # Adapters read the market from their config (e.g. get_account_positions), so it is part of the key
+        owner = id(self) if name in PER_CLIENT_QUERIES else getattr(self.config, 'contract_id', None)
+        return (name, owner, args, tuple(sorted(kwargs.items())) if kwargs else ())
+
+    @property
+    def metadata_cache(self) -> Optional[MarketMetadataCache]:
+        """Persistent market-metadata cache (MARKET_METADATA_CACHE), None when disabled."""
+        cache = self.__dict__.get('_metadata_cache')
+        return cache if cache is not None else get_metadata_cache()
+
+    def use_metadata_cache(self, cache: MarketMetadataCache) -> None:
+        """Use `cache` instead of the process-wide one."""
+        self._metadata_cache = cache
+
+    def _market_metadata(self) -> Dict[str, Any]:
+        data = {'contract_id': self.config.contract_id, 'tick_size': self.config.tick_size}
+        for name in self.METADATA_ATTRIBUTES:
+            if hasattr(self, name):
+                data[name] = getattr(self, name)
+        return data
+
+    def _apply_market_metadata(self, data: Dict[str, Any]) -> None:
+        """Configure the client from a cached entry, with the checks get_contract_attributes makes."""
+        self.config.contract_id = data['contract_id']
+        self.config.tick_size = data['tick_size']
+        for name in self.METADATA_ATTRIBUTES:
+            if name in data:
+                setattr(self, name, data[name])
+        min_quantity = data.get('min_quantity')
+        if min_quantity is not None and self.config.quantity < min_quantity:
+            self.logger.log(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}", "ERROR")
+            raise ValueError(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}")
+
+    async def throttle(self, endpoint_class: str = 'query', priority: Optional[int] = None) -> None:
+        """Wait for a request slot of `endpoint_class` ('order', 'cancel' or 'query')."""
+        prepaid = _prepaid_request.get()
+        if prepaid is not None and prepaid[0] == endpoint_class:
+            if prepaid[2]:
+                prepaid[2] = False
+                return
+            if priority is None:
+                priority = prepaid[1]
+        await self.rate_limiter.acquire(endpoint_class, priority)
 
     def round_to_tick(self, price) -> Decimal:
         price = Decimal(price)
@@ -73,6 +661,56 @@ class BaseExchangeClient(ABC):
         # quantize forces price to be a multiple of tick
         return price.quantize(tick, rounding=ROUND_HALF_UP)
 
+    async def get_cached_active_orders(self, contract_id: str) -> List[OrderInfo]:
+        """Active orders from the websocket-fed order state, reconciled over REST when due."""
+        if self.order_state.needs_reconcile():
+            requested_at = time.time()
+            _result_requested_at.set(None)
+            orders = await self.get_active_orders(contract_id)
+            # A coalesced or reused result may come from a request started before this call
+            started_at = RequestCoalescer.last_requested_at()
+            if started_at is not None:
+                requested_at = min(requested_at, started_at)
+            self.order_state.reconcile(orders, requested_at)
+        return self.order_state.active_orders()
+
+    async def wait_for_order_ack(self, order_id, statuses: Optional[Iterable[str]] = None) -> Optional[OrderInfo]:
+        """The order's websocket update (with one of `statuses`), or get_order_info() when none
+        arrives within ORDER_ACK_TIMEOUT."""
+        order_info = await self.order_state.wait_for_update(order_id, statuses=statuses)
+        if order_info is None:
+            order_info = await self.get_order_info(order_id)
+        return order_info
+
+    def use_shared_market_data(self, bbo_cache: BBOCache, owner: bool = False) -> None:
+        """Use a BBO cache shared with other clients of the same market (see fleet.py).
+
+        Must be called before connect(). Only the owner opens the market data stream; the
+        others read its cache, and fall back to REST once it goes stale.
+        """
+        for listener in self.bbo_cache.listeners:
+            bbo_cache.add_listener(listener)
+        self.bbo_cache = bbo_cache
+        self.market_data_owner = owner
+
+    async def get_cached_bbo_prices(self, contract_id: str, fetch_rest) -> Tuple[Decimal, Decimal]:
+        """Best bid/ask from the streamed BBO cache, or from `fetch_rest(contract_id)` when stale."""
+        bbo = self.bbo_cache.get()
+        if bbo is not None:
+            self.bbo_cache.hits += 1
+            return bbo
+        self.bbo_cache.rest_fallbacks += 1
+        return await fetch_rest(contract_id)
+
+    async def run_blocking(self, func, *args, **kwargs):
+        """Run a synchronous (network-blocking) SDK call off the event loop.
+
+        Websocket handlers keep running while the call is in flight. Calls from all clients
+        share one bounded thread pool, see get_blocking_executor().
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_blocking_executor(), functools.partial(func, *args, **kwargs))
+
     @abstractmethod
     def _validate_config(self) -> None:
         """Validate the exchange-specific configuration."""
@@ -103,6 +741,41 @@ class BaseExchangeClient(ABC):
         """Cancel an order."""
         pass
 
+    async def place_orders_batch(self, orders: List[CloseOrderRequest]) -> List[OrderResult]:
+        """Place several close orders, one result per order in the same order.
+
+        Adapters with a batch endpoint override this (one request, one rate-limit slot); the
+        default places them concurrently with place_close_order.
+        """
+        results = await asyncio.gather(
+            *(self.place_close_order(order.contract_id, order.quantity, order.price, order.side) for order in orders),
+            return_exceptions=True)
+        return [_as_order_result(result) for result in results]
+
+    async def cancel_orders_batch(self, order_ids: List[str]) -> List[OrderResult]:
+        """Cancel several orders, one result per order id. Overridden by adapters with a batch
+        endpoint; the default cancels them concurrently with cancel_order."""
+        results = await asyncio.gather(*(self.cancel_order(order_id) for order_id in order_ids),
+                                       return_exceptions=True)
+        return [_as_order_result(result) for result in results]
+
+    async def amend_order(self, order_id: str, contract_id: str, quantity: Decimal, price: Decimal,
+                          side: str) -> OrderResult:
+        """Move an open order to `price` (total size `quantity`), returning the order now resting.
+
+        Adapters with a modify endpoint override this and set NATIVE_AMEND; the default cancels
+        the order and places a post-only order for the unfilled rest with place_close_order.
+        """
+        cancel_result = await self.cancel_order(order_id)
+        if not cancel_result.success:
+            return OrderResult(success=False, order_id=order_id,
+                               error_message=f"Amend failed to cancel: {cancel_result.error_message}")
+        remaining = quantity - (cancel_result.filled_size or 0)
+        if remaining <= 0:
+            return OrderResult(success=False, order_id=order_id, filled_size=cancel_result.filled_size,
+                               error_message='Order filled before the amend')
+        return await self.place_close_order(contract_id, remaining, price, side)
+
     @abstractmethod
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information."""
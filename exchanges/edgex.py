@@ -12,11 +12,15 @@ from edgex_sdk import Client, OrderSide, WebSocketManager, CancelOrderParams, Ge
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
 from helpers.logger import TradingLogger
+from helpers.order_book import OrderBook
 
 
 class EdgeXClient(BaseExchangeClient):
     """EdgeX exchange client implementation."""
 
+    # 50 requests per 10 seconds per account
+    RATE_LIMITS = {'total': (5, 10), 'order': (3, 6), 'cancel': (3, 6), 'query': (2, 5)}
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize EdgeX client."""
         super().__init__(config)
@@ -55,6 +59,9 @@ class EdgeXClient(BaseExchangeClient):
         self._ws_disconnected = asyncio.Event()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
+        # Public depth book feeding bbo_cache (written from the SDK's websocket thread)
+        self._depth_book = OrderBook()
+
     def _validate_config(self) -> None:
         """Validate EdgeX configuration."""
         required_env_vars = ['EDGEX_ACCOUNT_ID', 'EDGEX_STARK_PRIVATE_KEY']
@@ -85,6 +92,16 @@ class EdgeXClient(BaseExchangeClient):
         if not self._ws_task or self._ws_task.done():
             self._ws_task = asyncio.create_task(self._run_private_ws())
 
+        # Public depth stream for the BBO cache; if it drops, fetch_bbo_prices falls back to REST
+        if self.market_data_owner:
+            try:
+                public_client = self.ws_manager.get_public_client()
+                public_client.on_message("depth", self._handle_depth_update)
+                self.ws_manager.connect_public()
+                public_client.subscribe(f"depth.{self.config.contract_id}.15")
+            except Exception as e:
+                self.logger.log(f"[WS] failed to subscribe to depth: {e}", "ERROR")
+
         # give first connection a moment (optional)
         await asyncio.sleep(0.5)
 
@@ -163,77 +180,118 @@ class EdgeXClient(BaseExchangeClient):
         """Setup order update handler for WebSocket."""
         self._order_update_handler = handler
 
-        def order_update_handler(message):
-            """Handle order updates from WebSocket."""
-            try:
-                # Parse the message structure
-                if isinstance(message, str):
-                    message = json.loads(message)
-
-                # Check if this is a trade-event with ORDER_UPDATE
-                content = message.get("content", {})
-                event = content.get("event", "")
-                if event == "ORDER_UPDATE":
-                    # Extract order data from the nested structure
-                    data = content.get('data', {})
-                    orders = data.get('order', [])
-
-                    if orders and len(orders) > 0:
-                        order = orders[0]  # Get the first order
-                        if order.get('contractId') != self.config.contract_id:
-                            return
-
-                        order_id = order.get('id')
-                        status = order.get('status')
-                        side = order.get('side', '').lower()
-                        filled_size = order.get('cumMatchSize')
-
-                        if side == self.config.close_order_side:
-                            order_type = "CLOSE"
-                        else:
-                            order_type = "OPEN"
-
-                        # edgex returns TWO filled events for the same order; take the first one
-                        if status == "FILLED" and len(data.get('collateral', [])):
-                            return
-
-                        # ignore canceled close orders
-                        if status == "CANCELED" and order_type == "CLOSE":
-                            return
-
-                        # edgex returns partially filled events as "OPEN" orders
-                        if status == "OPEN" and Decimal(filled_size) > 0:
-                            status = "PARTIALLY_FILLED"
-
-                        if status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
-                            if self._order_update_handler:
-                                self._order_update_handler({
-                                    'order_id': order_id,
-                                    'side': side,
-                                    'order_type': order_type,
-                                    'status': status,
-                                    'size': order.get('size'),
-                                    'price': order.get('price'),
-                                    'contract_id': order.get('contractId'),
-                                    'filled_size': filled_size
-                                })
-
-            except Exception as e:
-                self.logger.log(f"Error handling order update: {e}", "ERROR")
-                self.logger.log(f"Traceback: {traceback.format_exc()}", "ERROR")
-
         try:
             private_client = self.ws_manager.get_private_client()
-            private_client.on_message("trade-event", order_update_handler)
+            private_client.on_message("trade-event", self.handle_order_update)
         except Exception as e:
             self.logger.log(f"Could not add trade-event handler: {e}", "ERROR")
 
+    def handle_order_update(self, message):
+        """Handle order updates from WebSocket."""
+        try:
+            # Parse the message structure
+            if isinstance(message, str):
+                message = json.loads(message)
+
+            # Check if this is a trade-event with ORDER_UPDATE
+            content = message.get("content", {})
+            event = content.get("event", "")
+            if event == "ORDER_UPDATE":
+                # Extract order data from the nested structure
+                data = content.get('data', {})
+                orders = data.get('order', [])
+
+                if orders and len(orders) > 0:
+                    order = orders[0]  # Get the first order
+                    if order.get('contractId') != self.config.contract_id:
+                        return
+
+                    order_id = order.get('id')
+                    status = order.get('status')
+                    side = order.get('side', '').lower()
+                    filled_size = order.get('cumMatchSize')
+
+                    if side == self.config.close_order_side:
+                        order_type = "CLOSE"
+                    else:
+                        order_type = "OPEN"
+
+                    # edgex returns TWO filled events for the same order; take the first one
+                    if status == "FILLED" and len(data.get('collateral', [])):
+                        return
+
+                    # edgex returns partially filled events as "OPEN" orders
+                    if status == "OPEN" and Decimal(filled_size) > 0:
+                        status = "PARTIALLY_FILLED"
+
+                    update = {
+                        'order_id': order_id,
+                        'side': side,
+                        'order_type': order_type,
+                        'status': status,
+                        'size': order.get('size'),
+                        'price': order.get('price'),
+                        'contract_id': order.get('contractId'),
+                        'filled_size': filled_size
+                    }
+
+                    # ignore canceled close orders, but resolve a close placement waiting for its
+                    # acknowledgement (post-only rejections arrive as CANCELED)
+                    if status == "CANCELED" and order_type == "CLOSE" or \
+                            status not in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
+                        self.order_state.apply_message(update)
+                        return
+
+                    if self._order_update_handler:
+                        self._order_update_handler(update)
+
+        except Exception as e:
+            self.logger.log(f"Error handling order update: {e}", "ERROR")
+            self.logger.log(f"Traceback: {traceback.format_exc()}", "ERROR")
+
+    def _handle_depth_update(self, message):
+        """Maintain the public depth book and bbo_cache from depth.<contract>.15 messages."""
+        try:
+            if isinstance(message, str):
+                message = json.loads(message)
+
+            if message.get("type") != "quote-event" or not message.get("channel", "").startswith("depth."):
+                return
+
+            data = message.get("content", {}).get("data", [])
+            if not data:
+                return
+
+            order_book_data = data[0]
+            depth_type = order_book_data.get('depthType', '')
+            if depth_type == 'SNAPSHOT':
+                self._depth_book.clear()
+            elif depth_type != 'CHANGED':
+                return
+
+            # Levels are [{"price": "121699.0", "size": "5.128"}, ...]; size 0 removes a level
+            for bid in order_book_data.get('bids', []):
+                self._depth_book.update('bids', Decimal(bid['price']), Decimal(bid['size']))
+            for ask in order_book_data.get('asks', []):
+                self._depth_book.update('asks', Decimal(ask['price']), Decimal(ask['size']))
+
+            best_bid, best_ask = self._depth_book.best_levels()
+            if best_bid and best_ask:
+                self.bbo_cache.update(best_bid[0], best_ask[0])
+
+        except Exception as e:
+            self.logger.log(f"Error handling depth update: {e}", "ERROR")
+
     # ---------------------------
     # REST-ish helpers
     # ---------------------------
 
-    @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """Fetch best bid and ask prices, from the depth stream when it is fresh."""
+        return await self.get_cached_bbo_prices(contract_id, self._fetch_bbo_prices_rest)
+
+    @query_retry(default_return=(0, 0))
+    async def _fetch_bbo_prices_rest(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         depth_params = GetOrderBookDepthParams(contract_id=contract_id, limit=15)
         order_book = await self.client.quote.get_order_book_depth(depth_params)
         order_book_data = order_book['data']
@@ -273,6 +331,8 @@ class EdgeXClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             try:
                 best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
 
@@ -305,9 +365,8 @@ class EdgeXClient(BaseExchangeClient):
                 if not order_id:
                     return OrderResult(success=False, error_message='No order ID in response')
 
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
+                # Post-only rejections show up as CANCELED on the order stream
+                order_info = await self.wait_for_order_ack(order_id)
 
                 if order_info:
                     if order_info.status == 'CANCELED':
@@ -355,6 +414,8 @@ class EdgeXClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             try:
                 best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
 
@@ -394,9 +455,8 @@ class EdgeXClient(BaseExchangeClient):
                 if not order_id:
                     return OrderResult(success=False, error_message='No order ID in response')
 
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
+                # Post-only rejections show up as CANCELED on the order stream
+                order_info = await self.wait_for_order_ack(order_id)
 
                 if order_info:
                     if order_info.status == 'CANCELED':
@@ -567,6 +627,7 @@ class EdgeXClient(BaseExchangeClient):
         if self.config.quantity < min_quantity:
             self.logger.log(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}", "ERROR")
             raise ValueError(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}")
+        self.min_quantity = min_quantity
 
         self.config.tick_size = Decimal(current_contract.get('tickSize'))
 
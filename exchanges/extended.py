@@ -11,6 +11,10 @@ from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
 from helpers.logger import TradingLogger
+from helpers.order_book import OrderBook
+from helpers.http_session import HttpSessionHolder
+from helpers.market_data import recorder_from_env
+from helpers.json_codec import loads
 
 from x10.perpetual.trading_client import PerpetualTradingClient
 from x10.perpetual.configuration import STARKNET_MAINNET_CONFIG
@@ -25,14 +29,10 @@ import time
 import json
 import traceback
 import asyncio
-import aiohttp
 
-from dotenv import load_dotenv
 import os
 from datetime import datetime, timezone, timedelta
 
-load_dotenv()
-
 async def _stream_worker(
     url: str,
     handler,
@@ -52,7 +52,7 @@ async def _stream_worker(
                         await ws.send("pong")
                         continue
                     try:
-                        msg = json.loads(raw)
+                        msg = loads(raw)
                     except Exception:
                         continue
 
@@ -72,6 +72,10 @@ def utc_now():
 class ExtendedClient(BaseExchangeClient):
     """Extended exchange client implementation."""
 
+    # 1000 requests a minute per IP
+    RATE_LIMITS = {'total': (16, 32), 'order': (8, 16), 'cancel': (8, 16), 'query': (8, 16)}
+    METADATA_ATTRIBUTES = ('min_quantity', 'min_order_size')
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize the exchange client with configuration."""
         super().__init__(config)
@@ -91,6 +95,11 @@ class ExtendedClient(BaseExchangeClient):
         self.logger = TradingLogger(exchange="extended", ticker=self.config.ticker, log_to_console=True)
         self._order_update_handler = None
 
+        # Pooled keep-alive session for the REST calls made outside the SDK
+        self.http_session = HttpSessionHolder()
+        # Raw orderbook frames are recorded when MARKET_DATA_RECORD_DIR is set
+        self.book_recorder = recorder_from_env(f"extended-{self.config.ticker}")
+
         self.orderbook = None
         
         # For websocket
@@ -115,7 +124,8 @@ class ExtendedClient(BaseExchangeClient):
         """Connect to the exchange (WebSocket, etc.)."""
         
         self._stop_event.clear()
-        
+        self.http_session.get()
+
         host = STARKNET_MAINNET_CONFIG.stream_url
         self._tasks = [
             # connect to the account update stream (for order updates)
@@ -141,10 +151,8 @@ class ExtendedClient(BaseExchangeClient):
             
             # 1. Cancel outstanding buy orders
             active_orders = await self.get_active_orders(self.config.contract_id)
-            for order in active_orders:
-                if order.side == "buy":
-                    await self.cancel_order(order.order_id)
-                
+            await self.cancel_orders_batch([order.order_id for order in active_orders if order.side == "buy"])
+
             
             # Stop WebSocket streams
             self._stop_event.set()
@@ -160,7 +168,10 @@ class ExtendedClient(BaseExchangeClient):
                     self.logger.log("Main client connection closed", "INFO")
                 except Exception as e:
                     self.logger.log(f"Error closing main client: {e}", "WARNING")
-            
+            await self.http_session.close()
+            if self.book_recorder:
+                self.book_recorder.close()
+
             # 5. Reset internal state
             self.orderbook = None
             self._order_update_handler = None
@@ -174,6 +185,10 @@ class ExtendedClient(BaseExchangeClient):
         
         
     async def fetch_bbo_prices(self, contract_id: str) -> tuple[Decimal, Decimal]:
+        """Fetch best bid and offer prices, from the streamed BBO cache when it is fresh."""
+        return await self.get_cached_bbo_prices(contract_id, self._fetch_bbo_prices_from_orderbook)
+
+    async def _fetch_bbo_prices_from_orderbook(self, contract_id: str) -> tuple[Decimal, Decimal]:
         """Fetch best bid and offer prices from orderbook."""
         try:
             # Get the orderbook from the websocket updated cache
@@ -184,14 +199,10 @@ class ExtendedClient(BaseExchangeClient):
                 return Decimal('0'), Decimal('0')
             
             # Get best bid (highest bid price)
-            best_bid = Decimal('0')
-            if orderbook["bid"] and len(orderbook["bid"]) > 0:
-                best_bid = Decimal(orderbook["bid"][0]["p"])
-            
-            # Get best ask (lowest ask price)  
-            best_ask = Decimal('0')
-            if orderbook["ask"] and len(orderbook["ask"]) > 0:
-                best_ask = Decimal(orderbook["ask"][0]["p"])
+            best_bid = orderbook.bids.best_price() or Decimal('0')
+
+            # Get best ask (lowest ask price)
+            best_ask = orderbook.asks.best_price() or Decimal('0')
 
             return best_bid, best_ask
             
@@ -205,6 +216,8 @@ class ExtendedClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             try:
                 if self.orderbook == None:
                     # the websocket orderbook is not updated yet, sleep for 1 second
@@ -249,9 +262,8 @@ class ExtendedClient(BaseExchangeClient):
                 if not order_id:
                     return OrderResult(success=False, error_message='No order ID in response')
 
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
+                # Post-only rejections show up as CANCELED on the order stream
+                order_info = await self.wait_for_order_ack(order_id)
 
                 if order_info:
                     if order_info.status in ['CANCELED', 'REJECTED']:
@@ -301,6 +313,8 @@ class ExtendedClient(BaseExchangeClient):
         retry_count = 0
 
         while retry_count < max_retries:
+            # One request per attempt; the first uses the slot of the order entry wrapper
+            await self.throttle('order')
             try:
                 best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
                 print(f"best_bid: {best_bid}, best_ask: {best_ask}")
@@ -367,9 +381,8 @@ class ExtendedClient(BaseExchangeClient):
                 if not order_id:
                     return OrderResult(success=False, error_message='No order ID in response')
 
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
+                # Post-only rejections show up as CANCELED on the order stream
+                order_info = await self.wait_for_order_ack(order_id)
 
                 if order_info:
                     if order_info.status == 'CANCELED':
@@ -431,9 +444,8 @@ class ExtendedClient(BaseExchangeClient):
                 self.logger.log(f"Reverted partially filled size and price: {self.partially_filled_size} and {self.partially_filled_avg_price}", level="INFO")
                 return OrderResult(success=False, error_message='Failed to cancel order')
 
-            await asyncio.sleep(0.1)
             # get order info to know what was the (partially) filled order size
-            order_info = await self.get_order_info(order_id)
+            order_info = await self.wait_for_order_ack(order_id, statuses=('CANCELED', 'FILLED'))
             min_order_size = self.min_order_size
             filled_size = 0
             if order_info:
@@ -472,44 +484,46 @@ class ExtendedClient(BaseExchangeClient):
         attempt = 0
         while not order_info and attempt < 50:
             attempt += 1
+            await self.throttle('query')
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            if data.get("status") != "OK" or not data.get("data"):
-                                self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: {data}", "ERROR")
-                                return None
-                            
-                            order_data = data["data"]
-                            
-                            # Convert status to match expected format
-                            status = order_data.get("status", "")
-                            if status == "NEW":
-                                status = "OPEN"
-                            elif status == "CANCELLED":
-                                status = "CANCELED"
-                            
-                            # Create OrderInfo object
-                            order_info = OrderInfo(
-                                order_id=str(order_data.get("id", "")),
-                                side=order_data.get("side", "").lower(),
-                                size=Decimal(order_data.get("qty", "0")) - Decimal(order_data.get("filledQty", "0")),
-                                price=Decimal(order_data.get("price", "0")),
-                                status=status,
-                                filled_size=Decimal(order_data.get("filledQty", "0")),
-                                remaining_size=Decimal(order_data.get("qty", "0")) - Decimal(order_data.get("filledQty", "0"))
-                            )
-                            return order_info
+                session = self.http_session.get()
+                async with session.get(url, headers=headers) as response:
+                    self.rate_limiter.observe_response(response.status, response.headers)
+                    if response.status == 200:
+                        data = await response.json()
                         
-                        elif response.status == 404:
-                            # Order not found
-                            self.logger.log(f"Order {order_id} not found attempt {attempt}", "INFO")
+                        if data.get("status") != "OK" or not data.get("data"):
+                            self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: {data}", "ERROR")
+                            return None
+                        
+                        order_data = data["data"]
+                        
+                        # Convert status to match expected format
+                        status = order_data.get("status", "")
+                        if status == "NEW":
+                            status = "OPEN"
+                        elif status == "CANCELLED":
+                            status = "CANCELED"
+                        
+                        # Create OrderInfo object
+                        order_info = OrderInfo(
+                            order_id=str(order_data.get("id", "")),
+                            side=order_data.get("side", "").lower(),
+                            size=Decimal(order_data.get("qty", "0")) - Decimal(order_data.get("filledQty", "0")),
+                            price=Decimal(order_data.get("price", "0")),
+                            status=status,
+                            filled_size=Decimal(order_data.get("filledQty", "0")),
+                            remaining_size=Decimal(order_data.get("qty", "0")) - Decimal(order_data.get("filledQty", "0"))
+                        )
+                        return order_info
+                    
+                    elif response.status == 404:
+                        # Order not found
+                        self.logger.log(f"Order {order_id} not found attempt {attempt}", "INFO")
+                    
+                    else:
+                        self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: HTTP {response.status}", "ERROR")
                         
-                        else:
-                            self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: HTTP {response.status}", "ERROR")
-                            
             except Exception as e:
                 self.logger.log(f"Error getting order info attempt {attempt} for {order_id}: {str(e)}", "ERROR")
             
@@ -617,7 +631,7 @@ class ExtendedClient(BaseExchangeClient):
             
             # Parse the message structure
             if isinstance(message, str):
-                message = json.loads(message)
+                message = loads(message)
 
             # Check if this is a order update
             event = message.get("type", "")
@@ -660,18 +674,23 @@ class ExtendedClient(BaseExchangeClient):
                         elif status == "CANCELED" or status == "FILLED":
                             self.open_orders.pop(order_id, None)
                         
+                        update = {
+                            'order_id': order_id,
+                            'side': side,
+                            'order_type': order_type,
+                            'status': status,
+                            'size': order.get('qty'),
+                            'price': order.get('price'),
+                            'contract_id': order.get('market'),
+                            'filled_size': filled_size
+                        }
                         if status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
                             if self._order_update_handler:
-                                self._order_update_handler({
-                                    'order_id': order_id,
-                                    'side': side,
-                                    'order_type': order_type,
-                                    'status': status,
-                                    'size': order.get('qty'),
-                                    'price': order.get('price'),
-                                    'contract_id': order.get('market'),
-                                    'filled_size': filled_size
-                                })
+                                self._order_update_handler(update)
+                        else:
+                            # Not for the bot, but resolves a placement waiting for its
+                            # acknowledgement (post-only rejections arrive as REJECTED)
+                            self.order_state.apply_message(update)
                             
         except asyncio.CancelledError:
             self.logger.log("Order update handler cancelled", "INFO")
@@ -686,12 +705,15 @@ class ExtendedClient(BaseExchangeClient):
                 
     async def handle_orderbook(self, message):
         """Handle orderbook updates from WebSocket using correct pattern."""
+        if self.book_recorder:
+            self.book_recorder.record(message)
+
         try:
             self.logger.log("Received orderbook update", "DEBUG")
 
             # Parse the message structure
             if isinstance(message, str):
-                message = json.loads(message)
+                message = loads(message)
 
             # Check if this is a orderbook update
             event = message.get("type", "")
@@ -701,12 +723,17 @@ class ExtendedClient(BaseExchangeClient):
                 bids = data.get('b', [])
                 asks = data.get('a', [])
                 
-                # update orderbook
-                self.orderbook = {
-                    'market': market,
-                    'bid': bids,  # should be list of [{"p": price, "q": quantity}] with a length of 1 
-                    'ask': asks   # should be list of [{"p": price, "q": quantity}] with a length of 1
-                }
+                # update orderbook, levels should be list of [{"p": price, "q": quantity}] with a length of 1
+                orderbook = self.orderbook if self.orderbook is not None else OrderBook()
+                orderbook.clear()
+                for bid in bids:
+                    orderbook.bids.update(Decimal(bid["p"]), Decimal(bid["q"]))
+                for ask in asks:
+                    orderbook.asks.update(Decimal(ask["p"]), Decimal(ask["q"]))
+                self.orderbook = orderbook
+                # Wakes the bot's open order monitor when the top of book moves
+                if self.market_data_owner:
+                    self.bbo_cache.update(orderbook.bids.best_price(), orderbook.asks.best_price())
                 
                 self.logger.log(f"Orderbook updated for {market}: bid={bids[0] if bids else 'N/A'}, ask={asks[0] if asks else 'N/A'}", "DEBUG")
                 
@@ -742,7 +769,7 @@ class ExtendedClient(BaseExchangeClient):
         
         # Check if config quantity is less than min order size
         min_quantity = Decimal(str(market_information.data[0].trading_config.min_order_size))
-        self.min_order_size = min_quantity
+        self.min_order_size = self.min_quantity = min_quantity
         if self.config.quantity < min_quantity:
             self.logger.log(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}", "ERROR")
             raise ValueError(f"Order quantity is less than min quantity: {self.config.quantity} < {min_quantity}")
@@ -18,6 +18,9 @@ from helpers.logger import TradingLogger
 class GrvtClient(BaseExchangeClient):
     """GRVT exchange client implementation."""
 
+    # Per-endpoint limits of 10 requests/s and more; the venue bucket covers the REST client
+    RATE_LIMITS = {'total': (30, 60), 'order': (10, 20), 'cancel': (10, 20), 'query': (10, 20)}
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize GRVT client."""
         super().__init__(config)
@@ -106,6 +109,9 @@ class GrvtClient(BaseExchangeClient):
             await self._ws_client.initialize()
             await asyncio.sleep(2)  # Wait for connection to establish
 
+            if self.market_data_owner:
+                asyncio.create_task(self._subscribe_to_bbo())
+
             # If an order update callback was set before connect, subscribe now
             if self._order_update_callback is not None:
                 asyncio.create_task(self._subscribe_to_orders(self._order_update_callback))
@@ -180,6 +186,7 @@ class GrvtClient(BaseExchangeClient):
                                 if self._order_update_handler:
                                     self._order_update_handler({
                                         'order_id': order_id,
+                                        'client_order_id': data.get('metadata', {}).get('client_order_id'),
                                         'side': side,
                                         'order_type': order_type,
                                         'status': mapped_status,
@@ -231,11 +238,34 @@ class GrvtClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Error in subscription task: {e}", "ERROR")
 
-    @query_retry(reraise=True)
+    async def _subscribe_to_bbo(self):
+        """Subscribe to the mini ticker snapshot stream to keep bbo_cache updated."""
+        async def bbo_callback(message: Dict[str, Any]):
+            feed = message.get('feed', {})
+            if feed.get('instrument') == self.config.contract_id:
+                self.bbo_cache.update(feed.get('best_bid_price'), feed.get('best_ask_price'))
+
+        try:
+            # Snapshots every 500ms also act as a heartbeat for the staleness check
+            await self._ws_client.subscribe(
+                stream="mini.s",
+                callback=bbo_callback,
+                ws_end_point_type=GrvtWSEndpointType.MARKET_DATA_RPC_FULL,
+                params={"instrument": self.config.contract_id, "rate": 500}
+            )
+            self.logger.log(f"Subscribed to mini ticker for {self.config.contract_id}", "INFO")
+        except Exception as e:
+            self.logger.log(f"Error subscribing to mini ticker: {e}", "ERROR")
+
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """Fetch best bid and ask prices, from the mini ticker stream when it is fresh."""
+        return await self.get_cached_bbo_prices(contract_id, self._fetch_bbo_prices_rest)
+
+    @query_retry(reraise=True)
+    async def _fetch_bbo_prices_rest(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         """Fetch best bid and offer prices for a contract."""
         # Get order book from GRVT
-        order_book = self.rest_client.fetch_order_book(contract_id, limit=10)
+        order_book = await self.run_blocking(self.rest_client.fetch_order_book, contract_id, limit=10)
 
         if not order_book or 'bids' not in order_book or 'asks' not in order_book:
             raise ValueError(f"Unable to get order book: {order_book}")
@@ -253,7 +283,7 @@ class GrvtClient(BaseExchangeClient):
         """Place a post only order with GRVT using official SDK."""
 
         # Place the order using GRVT SDK
-        order_result = self.rest_client.create_limit_order(
+        order_result = await self.run_blocking(self.rest_client.create_limit_order,
             symbol=contract_id,
             side=side,
             amount=quantity,
@@ -268,6 +298,13 @@ class GrvtClient(BaseExchangeClient):
 
         client_order_id = order_result.get('metadata').get('client_order_id')
         order_status = order_result.get('state').get('status')
+
+        # The order stream usually acknowledges the order before a REST query would see it; other
+        # outcomes (rejected, cancelled, partially filled) are read from REST in its vocabulary
+        order_info = await self.order_state.wait_for_update(client_order_id=client_order_id)
+        if order_info is not None and order_info.status in ['OPEN', 'FILLED']:
+            return order_info
+
         order_status_start_time = time.time()
         order_info = await self.get_order_info(client_order_id=client_order_id)
         if order_info is not None:
@@ -413,7 +450,7 @@ class GrvtClient(BaseExchangeClient):
         """Cancel an order with GRVT."""
         try:
             # Cancel the order using GRVT SDK
-            cancel_result = self.rest_client.cancel_order(id=order_id)
+            cancel_result = await self.run_blocking(self.rest_client.cancel_order, id=order_id)
 
             if cancel_result:
                 return OrderResult(success=True)
@@ -428,9 +465,9 @@ class GrvtClient(BaseExchangeClient):
         """Get order information from GRVT."""
         # Get order information using GRVT SDK
         if order_id is not None:
-            order_data = self.rest_client.fetch_order(id=order_id)
+            order_data = await self.run_blocking(self.rest_client.fetch_order, id=order_id)
         elif client_order_id is not None:
-            order_data = self.rest_client.fetch_order(params={'client_order_id': client_order_id})
+            order_data = await self.run_blocking(self.rest_client.fetch_order, params={'client_order_id': client_order_id})
         else:
             raise ValueError("Either order_id or client_order_id must be provided")
 
@@ -470,7 +507,7 @@ class GrvtClient(BaseExchangeClient):
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
         """Get active orders for a contract."""
         # Get active orders using GRVT SDK
-        orders = self.rest_client.fetch_open_orders(symbol=contract_id)
+        orders = await self.run_blocking(self.rest_client.fetch_open_orders, symbol=contract_id)
 
         if not orders:
             return []
@@ -502,7 +539,7 @@ class GrvtClient(BaseExchangeClient):
     async def get_account_positions(self) -> Decimal:
         """Get account positions."""
         # Get positions using GRVT SDK
-        positions = self.rest_client.fetch_positions()
+        positions = await self.run_blocking(self.rest_client.fetch_positions)
 
         for position in positions:
             if position.get('instrument') == self.config.contract_id:
@@ -517,7 +554,7 @@ class GrvtClient(BaseExchangeClient):
             raise ValueError("Ticker is empty")
 
         # Get markets from GRVT
-        markets = self.rest_client.fetch_markets()
+        markets = await self.run_blocking(self.rest_client.fetch_markets)
 
         for market in markets:
             if (market.get('base') == ticker and
@@ -529,6 +566,7 @@ class GrvtClient(BaseExchangeClient):
 
                 # Validate minimum quantity
                 min_size = Decimal(market.get('min_size', 0))
+                self.min_quantity = min_size
                 if self.config.quantity < min_size:
                     raise ValueError(
                         f"Order quantity is less than min quantity: {self.config.quantity} < {min_size}"
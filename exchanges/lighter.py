@@ -9,7 +9,7 @@ import logging
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
 
-from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .base import BaseExchangeClient, CloseOrderRequest, OrderResult, OrderInfo, batches, query_retry
 from helpers.logger import TradingLogger
 
 # Import official Lighter SDK for API client
@@ -26,10 +26,18 @@ root_logger = logging.getLogger()
 if root_logger.level == logging.DEBUG:
     root_logger.setLevel(logging.WARNING)
 
+# Transactions per sendTxBatch request
+LIGHTER_BATCH_TXS = 10
+
 
 class LighterClient(BaseExchangeClient):
     """Lighter exchange client implementation."""
 
+    # Standard accounts get 60 weighted requests a minute; RATE_LIMIT_LIGHTER raises it for premium
+    RATE_LIMITS = {'total': (1, 10), 'order': (1, 10), 'cancel': (1, 10), 'query': (1, 5)}
+    METADATA_ATTRIBUTES = ('base_amount_multiplier', 'price_multiplier')
+    NATIVE_AMEND = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Lighter client."""
         super().__init__(config)
@@ -133,11 +141,14 @@ class LighterClient(BaseExchangeClient):
             self.config.market_index = self.config.contract_id
             self.config.account_index = self.account_index
             self.config.lighter_client = self.lighter_client
+            self.config.price_multiplier = self.price_multiplier
+            self.config.base_amount_multiplier = self.base_amount_multiplier
 
             # Initialize WebSocket manager (using custom implementation)
             self.ws_manager = LighterCustomWebSocketManager(
                 config=self.config,
-                order_update_callback=self._handle_websocket_order_update
+                order_update_callback=self._handle_websocket_order_update,
+                bbo_callback=self.bbo_cache.update
             )
 
             # Set logger for WebSocket manager
@@ -208,6 +219,9 @@ class LighterClient(BaseExchangeClient):
             if status == 'OPEN' and filled_size > 0:
                 status = 'PARTIALLY_FILLED'
 
+            self.order_state.apply_update(order_id, side, size, price, status, filled_size,
+                                          client_order_id=order_data['client_order_index'])
+
             if status == 'OPEN':
                 self.logger.log(f"[{order_type}] [{order_id}] {status} "
                                 f"{size} @ {price}", "INFO")
@@ -237,8 +251,8 @@ class LighterClient(BaseExchangeClient):
         # Use WebSocket data if available
         if (hasattr(self, 'ws_manager') and
                 self.ws_manager.best_bid and self.ws_manager.best_ask):
-            best_bid = Decimal(str(self.ws_manager.best_bid))
-            best_ask = Decimal(str(self.ws_manager.best_ask))
+            best_bid = self.ws_manager.best_bid
+            best_ask = self.ws_manager.best_ask
 
             if best_bid <= 0 or best_ask <= 0 or best_bid >= best_ask:
                 self.logger.log("Invalid bid/ask prices", "ERROR")
@@ -284,7 +298,6 @@ class LighterClient(BaseExchangeClient):
 
         # Generate unique client order index
         client_order_index = int(time.time() * 1000) % 1000000  # Simple unique ID
-        self.current_order_client_id = client_order_index
 
         # Create order parameters
         order_params = {
@@ -313,15 +326,11 @@ class LighterClient(BaseExchangeClient):
         order_result = await self.place_limit_order(contract_id, quantity, order_price, direction)
         if not order_result.success:
             raise Exception(f"[OPEN] Error placing order: {order_result.error_message}")
+        self.current_order_client_id = int(order_result.order_id)
 
-        start_time = time.time()
-        order_status = 'OPEN'
-
-        # While waiting for order to be filled
-        while time.time() - start_time < 10 and order_status != 'FILLED':
-            await asyncio.sleep(0.1)
-            if self.current_order is not None:
-                order_status = self.current_order.status
+        # Wait for the fill (or a post-only cancel) for up to 10s; the order update resolves it
+        await self.order_state.wait_for_update(client_order_id=self.current_order_client_id,
+                                               statuses=('FILLED', 'CANCELED'), timeout=10)
 
         return OrderResult(
             success=True,
@@ -334,7 +343,7 @@ class LighterClient(BaseExchangeClient):
 
     async def _get_active_close_orders(self, contract_id: str) -> int:
         """Get active close orders for a contract using official SDK."""
-        active_orders = await self.get_active_orders(contract_id)
+        active_orders = await self.get_cached_active_orders(contract_id)
         active_close_orders = 0
         for order in active_orders:
             if order.side == self.config.close_order_side:
@@ -343,13 +352,12 @@ class LighterClient(BaseExchangeClient):
 
     async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
         """Place a close order with Lighter using official SDK."""
-        self.current_order = None
-        self.current_order_client_id = None
+        # current_order tracks the open order, which may be live while a close is placed
         order_result = await self.place_limit_order(contract_id, quantity, price, side)
 
-        # wait for 5 seconds to ensure order is placed
-        await asyncio.sleep(5)
         if order_result.success:
+            # Wait until the order shows up on the account stream (up to 5s)
+            await self.order_state.wait_for_update(client_order_id=int(order_result.order_id), timeout=5)
             return OrderResult(
                 success=True,
                 order_id=order_result.order_id,
@@ -371,7 +379,7 @@ class LighterClient(BaseExchangeClient):
 
         order_price = (best_bid + best_ask) / 2
 
-        active_orders = await self.get_active_orders(self.config.contract_id)
+        active_orders = await self.get_cached_active_orders(self.config.contract_id)
         close_orders = [order for order in active_orders if order.side == self.config.close_order_side]
         for order in close_orders:
             if side == 'buy':
@@ -401,6 +409,106 @@ class LighterClient(BaseExchangeClient):
         else:
             return OrderResult(success=False, error_message='Failed to send cancellation transaction')
 
+    async def amend_order(self, order_id: str, contract_id: str, quantity: Decimal, price: Decimal,
+                          side: str) -> OrderResult:
+        """Modify the order's price and size in place with one transaction (it keeps its index)."""
+        if self.lighter_client is None:
+            await self._initialize_lighter_client()
+
+        price = self.round_to_tick(price)
+        _, tx_hash, error = await self.lighter_client.modify_order(
+            market_index=self.config.contract_id,
+            order_index=int(order_id),
+            base_amount=int(quantity * self.base_amount_multiplier),
+            price=int(price * self.price_multiplier),
+            trigger_price=0
+        )
+
+        if error is not None:
+            return OrderResult(success=False, order_id=order_id, error_message=f"Modify order error: {error}")
+        if not tx_hash:
+            return OrderResult(success=False, order_id=order_id,
+                               error_message='Failed to send modification transaction')
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='OPEN')
+
+    def _can_batch(self, count: int) -> bool:
+        # Batches are signed with explicit nonces, so they need the SDK's nonce manager
+        return (count > 1 and self.lighter_client is not None and hasattr(self.lighter_client, 'send_tx_batch')
+                and getattr(self.lighter_client, 'nonce_manager', None) is not None)
+
+    async def _send_tx_batch(self, tx_type: int, sign_calls) -> Optional[str]:
+        """Sign one transaction per `sign_calls` item (a function of the nonce) and send them in one
+        request. Returns an error message, or None on success."""
+        nonce_manager = self.lighter_client.nonce_manager
+        api_key_index = None
+        tx_infos = []
+        try:
+            for sign in sign_calls:
+                api_key_index, nonce = nonce_manager.next_nonce()
+                tx_info, error = sign(nonce)
+                if error is not None:
+                    raise Exception(f"Sign error: {error}")
+                tx_infos.append(tx_info)
+            await self.lighter_client.send_tx_batch(tx_types=[tx_type] * len(tx_infos), tx_infos=tx_infos)
+        except Exception as e:
+            if api_key_index is not None:
+                # Some of the reserved nonces may be unused; resync with the server
+                nonce_manager.hard_refresh_nonce(api_key_index)
+            return str(e)
+        return None
+
+    async def place_orders_batch(self, orders: List[CloseOrderRequest]) -> List[OrderResult]:
+        """Sign the close orders locally and send them as one transaction batch."""
+        if not self._can_batch(len(orders)):
+            return await super().place_orders_batch(orders)
+
+        results = []
+        base_index = int(time.time() * 1000)
+        for chunk_index, chunk in enumerate(batches(orders, LIGHTER_BATCH_TXS)):
+            await self.throttle('order')
+            client_order_indexes = [(base_index + chunk_index * LIGHTER_BATCH_TXS + i) % 1000000
+                                    for i in range(len(chunk))]
+            sign_calls = [
+                lambda nonce, order=order, client_order_index=client_order_index:
+                    self.lighter_client.sign_create_order(
+                        market_index=self.config.contract_id,
+                        client_order_index=client_order_index,
+                        base_amount=int(order.quantity * self.base_amount_multiplier),
+                        price=int(order.price * self.price_multiplier),
+                        is_ask=order.side.lower() == 'sell',
+                        order_type=self.lighter_client.ORDER_TYPE_LIMIT,
+                        time_in_force=self.lighter_client.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME,
+                        reduce_only=False,
+                        trigger_price=0,
+                        nonce=nonce)
+                for order, client_order_index in zip(chunk, client_order_indexes)]
+            error = await self._send_tx_batch(self.lighter_client.TX_TYPE_CREATE_ORDER, sign_calls)
+            for order, client_order_index in zip(chunk, client_order_indexes):
+                if error is not None:
+                    results.append(OrderResult(success=False, error_message=f"Order creation error: {error}"))
+                else:
+                    results.append(OrderResult(success=True, order_id=str(client_order_index), side=order.side,
+                                               size=order.quantity, price=order.price, status='OPEN'))
+        return results
+
+    async def cancel_orders_batch(self, order_ids: List[str]) -> List[OrderResult]:
+        """Sign the cancels locally and send them as one transaction batch."""
+        if not self._can_batch(len(order_ids)):
+            return await super().cancel_orders_batch(order_ids)
+
+        results = []
+        for chunk in batches(order_ids, LIGHTER_BATCH_TXS):
+            await self.throttle('cancel')
+            sign_calls = [
+                lambda nonce, order_id=order_id: self.lighter_client.sign_cancel_order(
+                    market_index=self.config.contract_id, order_index=int(order_id), nonce=nonce)
+                for order_id in chunk]
+            error = await self._send_tx_batch(self.lighter_client.TX_TYPE_CANCEL_ORDER, sign_calls)
+            results.extend(OrderResult(success=error is None, order_id=order_id,
+                                       error_message=f"Cancel order error: {error}" if error else None)
+                           for order_id in chunk)
+        return results
+
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information from Lighter using official SDK."""
         try:
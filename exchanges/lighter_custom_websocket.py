@@ -1,27 +1,54 @@
 """
 Custom Lighter WebSocket implementation without using the official SDK.
 Based on the sample code provided by the user.
+
+The manager owns the Lighter order book and account orders streams and is shared by
+LighterClient and the hedge bots. Besides the callbacks, consumers can await the
+initial snapshot (wait_until_ready), the next BBO change (wait_for_bbo) and the fill of
+a specific order (wait_for_fill).
 """
 
 import asyncio
 import json
+import logging
 import time
+from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple, Callable
 import websockets
 
+from helpers.json_codec import JSONDecodeError, loads
+from helpers.market_data import MarketDataRecorder, recorder_from_env
+from helpers.metrics import get_metrics
+from helpers.order_book import OrderBook
+from .messages import BookDelta
+
 
 class LighterCustomWebSocketManager:
     """Custom WebSocket manager for Lighter order updates and order book without SDK."""
 
-    def __init__(self, config: Dict[str, Any], order_update_callback: Optional[Callable] = None):
+    def __init__(self, config: Dict[str, Any], order_update_callback: Optional[Callable] = None,
+                 fill_callback: Optional[Callable] = None, recorder: Optional[MarketDataRecorder] = None,
+                 bbo_callback: Optional[Callable] = None):
         self.config = config
         self.order_update_callback = order_update_callback
+        self.fill_callback = fill_callback
+        # bbo_callback(best_bid, best_ask) after every order book update
+        self.bbo_callback = bbo_callback
         self.logger = None
         self.running = False
         self.ws = None
-
-        # Order book state
-        self.order_book = {"bids": {}, "asks": {}}
+        # Raw frames are recorded when MARKET_DATA_RECORD_DIR is set (see helpers/market_data.py)
+        self.recorder = recorder or recorder_from_env(f"lighter-{config.contract_id}")
+        # Frame received -> decoded and applied to the book, see helpers/metrics.py
+        self.frame_latency = get_metrics().histogram('ws_frame', source='lighter', market=config.contract_id)
+
+        # Order book state, prices/sizes kept as integer ticks/lots scaled by the market multipliers
+        self.order_book = OrderBook(price_multiplier=config.price_multiplier,
+                                    size_multiplier=config.base_amount_multiplier)
+        # Minimum level notional (~$40000) for get_best_levels, in the book's units
+        self.min_level_notional = 40000
+        if self.order_book.is_fixed_point:
+            self.min_level_notional *= config.price_multiplier * config.base_amount_multiplier
         self.best_bid = None
         self.best_ask = None
         self.snapshot_loaded = False
@@ -29,6 +56,12 @@ class LighterCustomWebSocketManager:
         self.order_book_sequence_gap = False
         self.order_book_lock = asyncio.Lock()
 
+        # Awaitable stream events
+        self.ready = asyncio.Event()
+        self._bbo_event = asyncio.Event()
+        self._top_of_book = (None, None)
+        self._fill_waiters: Dict[int, asyncio.Future] = {}
+
         # WebSocket URL
         self.ws_url = "wss://mainnet.zklighter.elliot.ai/stream"
         self.market_index = config.contract_id
@@ -41,11 +74,66 @@ class LighterCustomWebSocketManager:
 
     def _log(self, message: str, level: str = "INFO"):
         """Log message using the logger if available."""
-        if self.logger:
+        if isinstance(self.logger, logging.Logger):
+            self.logger.log(getattr(logging, level, logging.INFO), message)
+        elif self.logger:
             self.logger.log(message, level)
 
-    def update_order_book(self, side: str, updates: List[Dict[str, Any]]):
-        """Update the order book with new price/size information."""
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first order book snapshot. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_bbo(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the next top of book change. Returns False on timeout."""
+        event = self._bbo_event
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def expect_fill(self, client_order_index: int) -> asyncio.Future:
+        """Register interest in the fill of an order before it is sent, so a fast fill is not missed."""
+        future = self._fill_waiters.get(client_order_index)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._fill_waiters[client_order_index] = future
+        return future
+
+    async def wait_for_fill(self, client_order_index: int, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait until the order with the given client order index is filled.
+
+        Returns the filled order data, or None on timeout.
+        """
+        future = self.expect_fill(client_order_index)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._fill_waiters.pop(client_order_index, None)
+
+    def _notify_bbo(self):
+        """Wake up everyone waiting for a top of book change, if the top of book moved."""
+        top = (self.order_book.bids.best_price(), self.order_book.asks.best_price())
+        if top == self._top_of_book:
+            return
+        self._top_of_book = top
+        event = self._bbo_event
+        self._bbo_event = asyncio.Event()
+        event.set()
+
+    def get_top_levels(self) -> Tuple[Optional[Tuple[Decimal, Decimal]], Optional[Tuple[Decimal, Decimal]]]:
+        """Return the unfiltered best bid and ask levels as Decimal (price, size), None for an empty side."""
+        best_bid, best_ask = self.order_book.best_levels()
+        return self.order_book.level_to_decimal(best_bid), self.order_book.level_to_decimal(best_ask)
+
+    def update_order_book(self, side: str, updates: List[Any]):
+        """Update the order book with (price, size) levels, as pairs or {"price", "size"} dicts."""
         if side not in ["bids", "asks"]:
             self._log(f"Invalid side parameter: {side}. Must be 'bids' or 'asks'", "ERROR")
             return
@@ -58,16 +146,19 @@ class LighterCustomWebSocketManager:
 
         for update in updates:
             try:
-                if not isinstance(update, dict):
+                if isinstance(update, (tuple, list)) and len(update) >= 2:
+                    raw_price, raw_size = update[0], update[1]
+                elif isinstance(update, dict):
+                    if "price" not in update or "size" not in update:
+                        self._log(f"Missing required fields in update: {update}", "ERROR")
+                        continue
+                    raw_price, raw_size = update["price"], update["size"]
+                else:
                     self._log(f"Invalid update format: expected dict, got {type(update)}", "ERROR")
                     continue
 
-                if "price" not in update or "size" not in update:
-                    self._log(f"Missing required fields in update: {update}", "ERROR")
-                    continue
-
-                price = float(update["price"])
-                size = float(update["size"])
+                price = self.order_book.parse_price(raw_price)
+                size = self.order_book.parse_size(raw_size)
 
                 # Validate price and size are reasonable
                 if price <= 0:
@@ -78,10 +169,7 @@ class LighterCustomWebSocketManager:
                     self._log(f"Invalid size in update: {size}", "ERROR")
                     continue
 
-                if size == 0:
-                    ob.pop(price, None)
-                else:
-                    ob[price] = size
+                ob.update(price, size)
             except (KeyError, ValueError, TypeError) as e:
                 self._log(f"Error processing order book update: {e}, update: {update}", "ERROR")
                 continue
@@ -139,8 +227,8 @@ class LighterCustomWebSocketManager:
                 return True
 
             # Get best bid and best ask
-            best_bid = max(self.order_book["bids"].keys())
-            best_ask = min(self.order_book["asks"].keys())
+            best_bid = self.order_book.bids.best_price()
+            best_ask = self.order_book.asks.best_price()
 
             # Check if best bid is higher than best ask (inconsistent)
             if best_bid >= best_ask:
@@ -174,20 +262,15 @@ class LighterCustomWebSocketManager:
             self._log(f"Error requesting fresh snapshot: {e}", "ERROR")
             raise
 
-    def get_best_levels(self) -> Tuple[Tuple[Optional[float], Optional[float]], Tuple[Optional[float], Optional[float]]]:
-        """Get the best bid and ask levels with sufficient size for our order (~$5000)."""
+    def get_best_levels(self) -> Tuple[Tuple[Optional[int], Optional[int]], Tuple[Optional[int], Optional[int]]]:
+        """Get the best bid and ask levels (in ticks/lots) with sufficient size for our order (~$5000)."""
         try:
-            # Get all bid levels with sufficient size
-            bid_levels = [(price, size) for price, size in self.order_book["bids"].items()
-                          if size * price >= 40000]
-
-            # Get all ask levels with sufficient size
-            ask_levels = [(price, size) for price, size in self.order_book["asks"].items()
-                          if size * price >= 40000]
-
-            # Get best bid (highest price) and best ask (lowest price)
-            best_bid = max(bid_levels) if bid_levels else (None, None)
-            best_ask = min(ask_levels) if ask_levels else (None, None)
+            min_notional = self.min_level_notional
+            # Walk each side from the touch and take the first level with sufficient size
+            best_bid = next(((price, size) for price, size in self.order_book.bids.levels()
+                             if size * price >= min_notional), (None, None))
+            best_ask = next(((price, size) for price, size in self.order_book.asks.levels()
+                             if size * price >= min_notional), (None, None))
 
             return best_bid, best_ask
         except (ValueError, KeyError) as e:
@@ -200,19 +283,9 @@ class LighterCustomWebSocketManager:
             # Keep only the top 100 levels on each side to prevent memory bloat
             max_levels = 100
 
-            # Clean up bids (keep highest prices)
-            if len(self.order_book["bids"]) > max_levels:
-                sorted_bids = sorted(self.order_book["bids"].items(), reverse=True)
-                self.order_book["bids"].clear()
-                for price, size in sorted_bids[:max_levels]:
-                    self.order_book["bids"][price] = size
-
-            # Clean up asks (keep lowest prices)
-            if len(self.order_book["asks"]) > max_levels:
-                sorted_asks = sorted(self.order_book["asks"].items())
-                self.order_book["asks"].clear()
-                for price, size in sorted_asks[:max_levels]:
-                    self.order_book["asks"][price] = size
+            # Levels are kept sorted, so trimming drops the ones furthest from the touch
+            self.order_book.bids.trim(max_levels)
+            self.order_book.asks.trim(max_levels)
 
         except Exception as e:
             self._log(f"Error cleaning up order book levels: {e}", "ERROR")
@@ -220,13 +293,14 @@ class LighterCustomWebSocketManager:
     async def reset_order_book(self):
         """Reset the order book state when reconnecting."""
         async with self.order_book_lock:
-            self.order_book["bids"].clear()
-            self.order_book["asks"].clear()
+            self.order_book.clear()
             self.snapshot_loaded = False
             self.best_bid = None
             self.best_ask = None
             self.order_book_offset = None
             self.order_book_sequence_gap = False
+            self.ready.clear()
+            self._top_of_book = (None, None)
 
     def handle_order_update(self, order_data_list: List[Dict[str, Any]]):
         """Handle order update from WebSocket."""
@@ -238,6 +312,118 @@ class LighterCustomWebSocketManager:
         except Exception as e:
             self._log(f"Error handling order update: {e}", "ERROR")
 
+        for order_data in order_data_list:
+            if order_data.get("status") == "filled":
+                self.handle_order_fill(order_data)
+
+    def handle_order_fill(self, order_data: Dict[str, Any]):
+        """Dispatch a filled order to the fill callback and resolve any waiter."""
+        try:
+            if self.fill_callback:
+                self.fill_callback(order_data)
+        except Exception as e:
+            self._log(f"Error handling order fill: {e}", "ERROR")
+
+        try:
+            client_order_index = int(order_data.get("client_order_index", order_data.get("client_order_id")))
+        except (TypeError, ValueError):
+            return
+        future = self._fill_waiters.get(client_order_index)
+        if future is not None and not future.done():
+            future.set_result(order_data)
+
+    async def handle_message(self, msg) -> bool:
+        """Apply one raw stream frame. Returns False when the connection must be re-established
+        for a fresh snapshot (sequence gap or failed integrity check)."""
+        try:
+            data = loads(msg)
+        except JSONDecodeError as e:
+            self._log(f"JSON parsing error in Lighter websocket: {e}", "ERROR")
+            return True
+
+        async with self.order_book_lock:
+            if data.get("type") == "subscribed/order_book":
+                # Initial snapshot - clear and populate the order book
+                self.order_book.clear()
+
+                # Handle the initial snapshot
+                snapshot = BookDelta.from_lighter(data)
+                if snapshot.offset is not None:
+                    # Set the initial offset from the snapshot
+                    self.order_book_offset = snapshot.offset
+                    self._log(f"Initial order book offset set to: {self.order_book_offset}", "INFO")
+
+                self.update_order_book("bids", snapshot.bids)
+                self.update_order_book("asks", snapshot.asks)
+                self.snapshot_loaded = True
+                self.ready.set()
+                self._notify_bbo()
+
+                self._log(f"Lighter order book snapshot loaded with "
+                          f"{len(self.order_book['bids'])} bids and "
+                          f"{len(self.order_book['asks'])} asks", "INFO")
+
+            elif data.get("type") == "update/order_book" and self.snapshot_loaded:
+                # Check for cutoff/incomplete updates first
+                if not self.handle_order_book_cutoff(data):
+                    self._log("Skipping incomplete order book update", "WARNING")
+                    return True
+
+                # Extract levels and offset from the message
+                delta = BookDelta.from_lighter(data)
+                if delta.offset is None:
+                    self._log("Order book update missing offset, skipping", "WARNING")
+                    return True
+
+                new_offset = delta.offset
+
+                # Validate offset sequence
+                if not self.validate_order_book_offset(new_offset):
+                    # Sequence gap detected, try to request fresh snapshot first
+                    if self.order_book_sequence_gap:
+                        self._log("Sequence gap detected, requesting fresh snapshot...", "WARNING")
+                        return False
+                    else:
+                        # For out-of-order updates, just skip this one
+                        return True
+
+                # Update the order book with new data
+                self.update_order_book("bids", delta.bids)
+                self.update_order_book("asks", delta.asks)
+
+                # Validate order book integrity after update
+                if not self.validate_order_book_integrity():
+                    self._log("Order book integrity check failed, requesting fresh snapshot...", "WARNING")
+                    return False
+
+                self._notify_bbo()
+
+                # Get the best bid and ask levels
+                (best_bid_price, best_bid_size), (best_ask_price, best_ask_size) = self.get_best_levels()
+
+                # Update global variables, converting ticks to Decimal at the boundary
+                if best_bid_price is not None:
+                    self.best_bid = self.order_book.price_to_decimal(best_bid_price)
+                if best_ask_price is not None:
+                    self.best_ask = self.order_book.price_to_decimal(best_ask_price)
+                if self.bbo_callback is not None:
+                    self.bbo_callback(self.best_bid, self.best_ask)
+
+            elif data.get("type") == "ping":
+                # Respond to ping with pong (no socket when replaying a recording)
+                if self.ws is not None:
+                    await self.ws.send(json.dumps({"type": "pong"}))
+            elif data.get("type") == "update/account_orders":
+                # Handle account orders updates
+                orders = data.get("orders", {}).get(str(self.market_index), [])
+                self.handle_order_update(orders)
+            elif data.get("type") == "update/order_book" and not self.snapshot_loaded:
+                # Ignore updates until we have the initial snapshot
+                return True
+            else:
+                self._log(f"Unknown message type: {data.get('type', 'unknown')}", "DEBUG")
+        return True
+
     async def connect(self):
         """Connect to Lighter WebSocket using custom implementation."""
         cleanup_counter = 0
@@ -288,93 +474,18 @@ class LighterCustomWebSocketManager:
                     while self.running:
                         try:
                             msg = await asyncio.wait_for(self.ws.recv(), timeout=1)
+                            received = time.perf_counter()
 
-                            try:
-                                data = json.loads(msg)
-                            except json.JSONDecodeError as e:
-                                self._log(f"JSON parsing error in Lighter websocket: {e}", "ERROR")
-                                continue
+                            if self.recorder:
+                                self.recorder.record(msg)
 
                             # Reset timeout counter on successful message
                             timeout_count = 0
 
-                            async with self.order_book_lock:
-                                if data.get("type") == "subscribed/order_book":
-                                    # Initial snapshot - clear and populate the order book
-                                    self.order_book["bids"].clear()
-                                    self.order_book["asks"].clear()
-
-                                    # Handle the initial snapshot
-                                    order_book = data.get("order_book", {})
-                                    if order_book and "offset" in order_book:
-                                        # Set the initial offset from the snapshot
-                                        self.order_book_offset = order_book["offset"]
-                                        self._log(f"Initial order book offset set to: {self.order_book_offset}", "INFO")
-
-                                    self.update_order_book("bids", order_book.get("bids", []))
-                                    self.update_order_book("asks", order_book.get("asks", []))
-                                    self.snapshot_loaded = True
-
-                                    self._log(f"Lighter order book snapshot loaded with "
-                                              f"{len(self.order_book['bids'])} bids and "
-                                              f"{len(self.order_book['asks'])} asks", "INFO")
-
-                                elif data.get("type") == "update/order_book" and self.snapshot_loaded:
-                                    # Check for cutoff/incomplete updates first
-                                    if not self.handle_order_book_cutoff(data):
-                                        self._log("Skipping incomplete order book update", "WARNING")
-                                        continue
-
-                                    # Extract offset from the message
-                                    order_book = data.get("order_book", {})
-                                    if not order_book or "offset" not in order_book:
-                                        self._log("Order book update missing offset, skipping", "WARNING")
-                                        continue
-
-                                    new_offset = order_book["offset"]
-
-                                    # Validate offset sequence
-                                    if not self.validate_order_book_offset(new_offset):
-                                        # Sequence gap detected, try to request fresh snapshot first
-                                        if self.order_book_sequence_gap:
-                                            self._log("Sequence gap detected, requesting fresh snapshot...", "WARNING")
-                                            # Release lock before network I/O
-                                            break
-                                        else:
-                                            # For out-of-order updates, just continue
-                                            continue
-
-                                    # Update the order book with new data
-                                    self.update_order_book("bids", order_book.get("bids", []))
-                                    self.update_order_book("asks", order_book.get("asks", []))
-
-                                    # Validate order book integrity after update
-                                    if not self.validate_order_book_integrity():
-                                        self._log("Order book integrity check failed, requesting fresh snapshot...", "WARNING")
-                                        # Release lock before network I/O
-                                        break
-
-                                    # Get the best bid and ask levels
-                                    (best_bid_price, best_bid_size), (best_ask_price, best_ask_size) = self.get_best_levels()
-
-                                    # Update global variables
-                                    if best_bid_price is not None:
-                                        self.best_bid = best_bid_price
-                                    if best_ask_price is not None:
-                                        self.best_ask = best_ask_price
-
-                                elif data.get("type") == "ping":
-                                    # Respond to ping with pong
-                                    await self.ws.send(json.dumps({"type": "pong"}))
-                                elif data.get("type") == "update/account_orders":
-                                    # Handle account orders updates
-                                    orders = data.get("orders", {}).get(str(self.market_index), [])
-                                    self.handle_order_update(orders)
-                                elif data.get("type") == "update/order_book" and not self.snapshot_loaded:
-                                    # Ignore updates until we have the initial snapshot
-                                    continue
-                                else:
-                                    self._log(f"Unknown message type: {data.get('type', 'unknown')}", "DEBUG")
+                            if not await self.handle_message(msg):
+                                # Sequence gap or integrity failure, reconnect for a fresh snapshot
+                                break
+                            self.frame_latency.record(time.perf_counter() - received)
 
                             # Periodic cleanup outside the lock
                             cleanup_counter += 1
@@ -429,4 +540,6 @@ class LighterCustomWebSocketManager:
                 await self.ws.close()
             except Exception as e:
                 self._log(f"Error closing websocket: {e}", "ERROR")
+        if self.recorder:
+            self.recorder.close()
         self._log("WebSocket disconnected", "INFO")
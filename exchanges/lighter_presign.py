@@ -0,0 +1,233 @@
+"""
+Pre-signed Lighter hedge orders.
+
+Signing a Lighter transaction is synchronous and, when no nonce is given, also fetches the
+next nonce over HTTP. The hedge bots know the side and size of their next hedge before the
+maker fill arrives, so this cache keeps ready-to-send signed orders at the current
+aggressive price and the fill handler only has to call send_tx.
+
+All cached transactions share one nonce reserved from the SignerClient's nonce manager.
+Only one of them is ever sent; after that the reservation is consumed and the next refresh
+reserves the following nonce.
+
+LighterHedgeDispatch is the hedge bots' side of this: it starts the hedge task straight
+from the maker fill callback and keeps the cache refreshed while no hedge is running.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from helpers.metrics import get_metrics
+
+
+@dataclass
+class PresignedOrder:
+    """A signed Lighter limit order ready for send_tx."""
+    side: str
+    is_ask: bool
+    quantity: Decimal
+    price: Decimal
+    reference_price: Decimal
+    client_order_index: int
+    nonce: int
+    tx_info: Any
+    signed_at: float
+
+
+class LighterPresignCache:
+    """Keeps one pre-signed aggressive limit order per side, refreshed as the BBO moves."""
+
+    def __init__(self, lighter_client, market_index: int, base_amount_multiplier: int, price_multiplier: int,
+                 slippage: Decimal = Decimal('0.002'), refresh_band: Decimal = Decimal('0.0005'), logger=None):
+        self.lighter_client = lighter_client
+        self.market_index = market_index
+        self.base_amount_multiplier = base_amount_multiplier
+        self.price_multiplier = price_multiplier
+        self.slippage = slippage
+        # Re-sign once the reference price has moved by more than this fraction
+        self.refresh_band = refresh_band
+        self.logger = logger
+
+        # Pre-signing needs explicit nonces; without a nonce manager every order is signed live
+        self.nonce_manager = getattr(lighter_client, 'nonce_manager', None)
+        self._reservation: Optional[Tuple[int, int]] = None
+        self._orders: Dict[str, PresignedOrder] = {}
+        self._last_client_order_index = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.nonce_manager is not None
+
+    def _next_client_order_index(self) -> int:
+        client_order_index = max(int(time.time() * 1000), self._last_client_order_index + 1)
+        self._last_client_order_index = client_order_index
+        return client_order_index
+
+    def _reserve_nonce(self) -> Tuple[int, int]:
+        if self._reservation is None:
+            self._reservation = self.nonce_manager.next_nonce()
+        return self._reservation
+
+    def aggressive_price(self, side: str, best_bid: Decimal, best_ask: Decimal) -> Tuple[Decimal, Decimal]:
+        """Return (order price, reference price) for a marketable hedge on the given side."""
+        if side.lower() == 'buy':
+            return best_ask * (1 + self.slippage), best_ask
+        return best_bid * (1 - self.slippage), best_bid
+
+    def is_fresh(self, order: PresignedOrder, quantity: Decimal, reference_price: Decimal) -> bool:
+        if order.quantity != quantity:
+            return False
+        if self._reservation is None or order.nonce != self._reservation[1]:
+            return False
+        return abs(reference_price - order.reference_price) <= order.reference_price * self.refresh_band
+
+    def sign(self, side: str, quantity: Decimal, best_bid: Decimal, best_ask: Decimal) -> PresignedOrder:
+        """Sign an aggressive limit order for side/quantity at the current BBO."""
+        is_ask = side.lower() != 'buy'
+        price, reference_price = self.aggressive_price(side, best_bid, best_ask)
+        client_order_index = self._next_client_order_index()
+
+        nonce_kwargs = {}
+        nonce = -1
+        if self.enabled:
+            _, nonce = self._reserve_nonce()
+            nonce_kwargs['nonce'] = nonce
+
+        tx_info, error = self.lighter_client.sign_create_order(
+            market_index=self.market_index,
+            client_order_index=client_order_index,
+            base_amount=int(quantity * self.base_amount_multiplier),
+            price=int(price * self.price_multiplier),
+            is_ask=is_ask,
+            order_type=self.lighter_client.ORDER_TYPE_LIMIT,
+            time_in_force=self.lighter_client.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME,
+            reduce_only=False,
+            trigger_price=0,
+            **nonce_kwargs
+        )
+        if error is not None:
+            raise Exception(f"Sign error: {error}")
+
+        return PresignedOrder(side=side.lower(), is_ask=is_ask, quantity=quantity, price=price,
+                              reference_price=reference_price, client_order_index=client_order_index,
+                              nonce=nonce, tx_info=tx_info, signed_at=time.time())
+
+    def refresh(self, side: str, quantity: Decimal, best_bid: Optional[Decimal], best_ask: Optional[Decimal]) -> bool:
+        """Re-sign the cached order for a side if it is missing or stale. Returns True if it signed."""
+        if not self.enabled or best_bid is None or best_ask is None:
+            return False
+        side = side.lower()
+        _, reference_price = self.aggressive_price(side, best_bid, best_ask)
+        order = self._orders.get(side)
+        if order is not None and self.is_fresh(order, quantity, reference_price):
+            return False
+        try:
+            self._orders[side] = self.sign(side, quantity, best_bid, best_ask)
+        except Exception as e:
+            self._orders.pop(side, None)
+            if self.logger:
+                self.logger.warning(f"⚠️ Failed to pre-sign Lighter {side} order: {e}")
+            return False
+        return True
+
+    def take(self, side: str, quantity: Decimal, best_bid: Decimal, best_ask: Decimal) -> PresignedOrder:
+        """Return a signed order for side/quantity, using the cached one when it is still fresh."""
+        side = side.lower()
+        _, reference_price = self.aggressive_price(side, best_bid, best_ask)
+        order = self._orders.pop(side, None)
+        if order is not None and self.is_fresh(order, quantity, reference_price):
+            self.hits += 1
+            return order
+        self.misses += 1
+        return self.sign(side, quantity, best_bid, best_ask)
+
+    def mark_sent(self, success: bool) -> None:
+        """Record the outcome of send_tx for an order returned by take()."""
+        self._orders.clear()
+        reservation, self._reservation = self._reservation, None
+        if not success and reservation is not None:
+            # The nonce may or may not have been used; resync with the server
+            self.nonce_manager.hard_refresh_nonce(reservation[0])
+
+
+class LighterHedgeDispatch:
+    """Event-driven Lighter hedge dispatch shared by the hedge bots.
+
+    The bot sets loop, stop_flag, ticker, order_quantity, lighter_stream, lighter_presign,
+    lighter_hedge_task, lighter_hedge_started (an asyncio.Event), maker_fill_time, hedge_trace
+    and current_lighter_side/quantity/price, and provides get_lighter_best_levels().
+    """
+
+    HEDGE_BOT = 'hedge'
+
+    def lighter_hedge_order(self, side: str, quantity: Decimal, price: Decimal):
+        """Coroutine that places the hedge for a maker fill."""
+        return self.place_lighter_market_order(side, quantity, price)
+
+    def trigger_lighter_hedge(self):
+        """Start the Lighter hedge for the latest maker fill. Safe to call from websocket threads."""
+        self.maker_fill_time = time.perf_counter()
+        self.hedge_trace = get_metrics().trace('hedge_stage', start=self.maker_fill_time,
+                                               bot=self.HEDGE_BOT, ticker=self.ticker)
+        if self.loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self.start_lighter_hedge()
+        else:
+            self.loop.call_soon_threadsafe(self.start_lighter_hedge)
+
+    def start_lighter_hedge(self):
+        """Create the hedge task for the current step, at most once."""
+        if self.lighter_hedge_started.is_set():
+            return
+        self.lighter_hedge_started.set()
+        self.lighter_hedge_task = asyncio.create_task(self.lighter_hedge_order(
+            self.current_lighter_side,
+            self.current_lighter_quantity,
+            self.current_lighter_price
+        ))
+
+    def reset_lighter_hedge(self):
+        """Reset hedge dispatch state before placing the next maker order."""
+        self.lighter_hedge_task = None
+        self.lighter_hedge_started.clear()
+
+    async def wait_for_lighter_hedge(self, timeout: float) -> bool:
+        """Wait for the hedge of the current step to finish. Returns False on timeout or stop."""
+        deadline = time.time() + timeout
+        while not self.stop_flag:
+            task = self.lighter_hedge_task
+            if task is not None and task.done():
+                return True
+            if time.time() > deadline:
+                return False
+            # Wake up when the hedge starts or finishes, or once a second to check the stop flag
+            waiter = asyncio.shield(task) if task is not None else self.lighter_hedge_started.wait()
+            try:
+                await asyncio.wait_for(waiter, timeout=1)
+            except asyncio.TimeoutError:
+                pass
+        return False
+
+    async def presign_lighter_hedges(self):
+        """Keep pre-signed hedge orders for both sides in line with the Lighter BBO."""
+        while not self.stop_flag:
+            await self.lighter_stream.wait_for_bbo(timeout=1)
+            # The cached orders share the nonce of an in-flight hedge, so wait for the next step
+            if self.lighter_hedge_started.is_set():
+                continue
+            best_bid, best_ask = self.get_lighter_best_levels()
+            if best_bid is None or best_ask is None:
+                continue
+            for side in ('buy', 'sell'):
+                self.lighter_presign.refresh(side, self.order_quantity, best_bid[0], best_ask[0])
@@ -0,0 +1,74 @@
+"""
+Typed websocket messages.
+
+Slot-based structs for the high-volume frames: order book deltas and account order updates.
+They are built once from the decoded frame (see helpers.json_codec) so the handlers read
+attributes instead of walking nested dicts with chains of .get() calls. Prices and sizes keep
+the venue's string form; the order book parses them into its own units.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+Level = Tuple[Any, Any]
+
+
+class BookDelta:
+    """Order book snapshot or update as (price, size) levels; size 0 removes the level."""
+
+    __slots__ = ('bids', 'asks', 'offset', 'snapshot')
+
+    def __init__(self, bids: Optional[List[Level]] = None, asks: Optional[List[Level]] = None,
+                 offset: Optional[int] = None, snapshot: bool = False):
+        self.bids = bids if bids is not None else []
+        self.asks = asks if asks is not None else []
+        self.offset = offset
+        self.snapshot = snapshot
+
+    @classmethod
+    def from_lighter(cls, message: Dict[str, Any]) -> 'BookDelta':
+        """From a Lighter subscribed/order_book or update/order_book frame."""
+        order_book = message.get('order_book') or {}
+        return cls(bids=[(level['price'], level['size']) for level in order_book.get('bids', ())],
+                   asks=[(level['price'], level['size']) for level in order_book.get('asks', ())],
+                   offset=order_book.get('offset'),
+                   snapshot=message.get('type') == 'subscribed/order_book')
+
+    @classmethod
+    def from_backpack(cls, message: Dict[str, Any]) -> 'BookDelta':
+        """From a Backpack depth.<symbol> stream frame (levels are already [price, size] pairs)."""
+        data = message.get('data') or {}
+        return cls(bids=data.get('b', []), asks=data.get('a', []), offset=data.get('u'))
+
+
+class OrderUpdate:
+    """One account order event, in the venue's own vocabulary (side, status)."""
+
+    __slots__ = ('order_id', 'symbol', 'side', 'status', 'size', 'price', 'filled_size', 'event')
+
+    def __init__(self, order_id: str, symbol: str, side: str, status: str, size: str = '0', price: str = '0',
+                 filled_size: str = '0', event: str = ''):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.status = status
+        self.size = size
+        self.price = price
+        self.filled_size = filled_size
+        self.event = event
+
+    @classmethod
+    def from_backpack(cls, payload: Dict[str, Any]) -> 'OrderUpdate':
+        """From the data of a Backpack account.orderUpdate frame."""
+        get = payload.get
+        # Positional: keyword arguments are measurably slower on this path
+        return cls(get('i', ''), get('s', ''), get('S', ''), get('X', ''), get('q', '0'), get('p', '0'),
+                   get('z', '0'), get('e', ''))
+
+    @classmethod
+    def from_aster(cls, message: Dict[str, Any]) -> 'OrderUpdate':
+        """From an Aster ORDER_TRADE_UPDATE frame."""
+        order = message.get('o') or {}
+        get = order.get
+        return cls(get('i', ''), get('s', ''), get('S', ''), get('X', ''), get('q', '0'), get('p', '0'),
+                   get('z', '0'), message.get('e', ''))
+
@@ -9,61 +9,56 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, Any, List, Optional, Tuple
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 
+from paradex_py import Paradex
+from paradex_py.api.http_client import HttpClient
+from paradex_py.api.models import ApiErrorSchema
+from paradex_py.api.ws_client import ParadexWebsocketChannel
+from paradex_py.common.order import Order, OrderType, OrderSide
+from paradex_py.environment import TESTNET, PROD
+from starknet_py.common import int_from_hex
+
 from .base import BaseExchangeClient, OrderResult, OrderInfo
 from helpers.logger import TradingLogger
 
 
 def patch_paradex_http_client():
     """Patch Paradex SDK HttpClient to suppress unwanted print statements."""
-    try:
-        from paradex_py.api.http_client import HttpClient
-
-        def patched_request(self, url, http_method, params=None, payload=None, headers=None):
-            res = self.client.request(
-                method=http_method.value,
-                url=url,
-                params=params,
-                json=payload,
-                headers=headers,
-            )
-            if res.status_code >= 300:
-                from paradex_py.api.models import ApiErrorSchema
-                error = ApiErrorSchema().loads(res.text)
-                raise Exception(error)
-            try:
-                return res.json()
-            except ValueError:
-                # Suppress the "No response request" print statement
-                # This is expected for DELETE requests that don't return JSON
-                # The original code would print: f"HttpClient: No response request({url}, {http_method.value})"
-                pass
-
-        # Replace the request method
-        HttpClient.request = patched_request
-
-    except ImportError:
-        # Paradex SDK not available, skip patching
-        pass
+    def patched_request(self, url, http_method, params=None, payload=None, headers=None):
+        res = self.client.request(
+            method=http_method.value,
+            url=url,
+            params=params,
+            json=payload,
+            headers=headers,
+        )
+        if res.status_code >= 300:
+            error = ApiErrorSchema().loads(res.text)
+            raise Exception(error)
+        try:
+            return res.json()
+        except ValueError:
+            # Suppress the "No response request" print statement
+            # This is expected for DELETE requests that don't return JSON
+            # The original code would print: f"HttpClient: No response request({url}, {http_method.value})"
+            pass
+
+    # Replace the request method
+    HttpClient.request = patched_request
 
 
 class ParadexClient(BaseExchangeClient):
     """Simplified Paradex exchange client - L2 credentials only."""
 
+    # Order endpoints allow 800 requests/s per account, private GETs 120 requests/s per account
+    RATE_LIMITS = {'total': (100, 200), 'order': (50, 100), 'cancel': (50, 100), 'query': (40, 80)}
+    # Not cached: get_contract_attributes checks the order notional against the current mark price
+    METADATA_ATTRIBUTES = None
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Paradex client with L2 credentials only."""
-        # Import paradex_py modules only when this class is instantiated
-        from paradex_py import Paradex
-        from paradex_py.environment import Environment, TESTNET, PROD
-        from paradex_py.common.order import Order, OrderType, OrderSide, OrderStatus
-        from paradex_py.api.ws_client import ParadexWebsocketChannel
-        # from paradex_py.common.console_logging import console_logger  # Disabled to turn off native logging
-
         # Apply the patch when this class is instantiated
         patch_paradex_http_client()
 
-        # Set config first
-        self.config = config
-
         # Paradex credentials from environment - L1 address + L2 private key
         self.l1_address = os.getenv('PARADEX_L1_ADDRESS')
         self.l2_private_key_hex = os.getenv('PARADEX_L2_PRIVATE_KEY')
@@ -83,9 +78,11 @@ class ParadexClient(BaseExchangeClient):
                 "Run 'python get_paradex_api_key.py' to generate L2 credentials from L1 credentials."
             )
 
+        # Sets config and validates it once the credentials are loaded
+        super().__init__(config)
+
         # Convert L2 private key from hex to int
         try:
-            from starknet_py.common import int_from_hex
             self.l2_private_key = int_from_hex(self.l2_private_key_hex)
         except Exception as e:
             raise ValueError(f"Invalid L2 private key format: {e}")
@@ -110,9 +107,6 @@ class ParadexClient(BaseExchangeClient):
     def _initialize_paradex_client(self) -> None:
         """Initialize the Paradex client with L2 credentials only."""
         try:
-            # Import paradex_py modules locally
-            from paradex_py import Paradex
-
             # Initialize Paradex client without credentials first
             self.paradex = Paradex(
                 env=self.env,
@@ -151,6 +145,8 @@ class ParadexClient(BaseExchangeClient):
 
         # Setup WebSocket subscription for order updates if handler is set
         await self._setup_websocket_subscription()
+        if self.market_data_owner:
+            await self._subscribe_to_bbo()
 
     async def disconnect(self) -> None:
         """Disconnect from Paradex."""
@@ -158,6 +154,7 @@ class ParadexClient(BaseExchangeClient):
             if hasattr(self, 'paradex') and self.paradex:
                 await self.paradex.ws_client._close_connection()
                 self._ws_connected = False
+                self.bbo_cache.clear()
         except Exception as e:
             self.logger.log(f"Error during Paradex disconnect: {e}", "ERROR")
 
@@ -171,8 +168,6 @@ class ParadexClient(BaseExchangeClient):
 
         async def order_update_handler(ws_channel, message):
             """Handle order updates from WebSocket."""
-            from paradex_py.api.ws_client import ParadexWebsocketChannel
-
             params = message.get("params", {})
             data = params.get("data", {})
 
@@ -241,8 +236,6 @@ class ParadexClient(BaseExchangeClient):
             self.logger.log("WebSocket connected for order monitoring", "INFO")
 
         # Subscribe to orders channel for the specific market
-        from paradex_py.api.ws_client import ParadexWebsocketChannel
-
         contract_id = self.config.contract_id
         try:
             await self.paradex.ws_client.subscribe(
@@ -254,15 +247,36 @@ class ParadexClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Failed to subscribe to order updates: {e}", "ERROR")
 
+    async def _subscribe_to_bbo(self) -> None:
+        """Subscribe to the BBO channel to keep bbo_cache updated."""
+        async def bbo_handler(ws_channel, message):
+            data = message.get("params", {}).get("data", {})
+            if data.get("market") == self.config.contract_id:
+                self.bbo_cache.update(data.get("bid"), data.get("ask"))
+
+        try:
+            await self.paradex.ws_client.subscribe(
+                ParadexWebsocketChannel.BBO,
+                callback=bbo_handler,
+                params={"market": self.config.contract_id}
+            )
+            self.logger.log(f"Subscribed to BBO for {self.config.contract_id}", "INFO")
+        except Exception as e:
+            self.logger.log(f"Failed to subscribe to BBO: {e}", "ERROR")
+
+    async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """Fetch best bid and ask prices, from the BBO stream when it is fresh."""
+        return await self.get_cached_bbo_prices(contract_id, self._fetch_bbo_prices_rest)
+
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_fixed(3),
         retry=retry_if_exception_type(Exception),
         reraise=True
     )
-    async def fetch_bbo_prices(self, contract_id: str) -> Dict[str, Any]:
+    async def _fetch_bbo_prices_rest(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         """Get orderbook using official SDK."""
-        orderbook_data = self.paradex.api_client.fetch_orderbook(contract_id, {"depth": 1})
+        orderbook_data = await self.run_blocking(self.paradex.api_client.fetch_orderbook, contract_id, {"depth": 1})
         if not orderbook_data:
             self.logger.log("Failed to get orderbook", "ERROR")
             raise ValueError("Failed to get orderbook")
@@ -289,8 +303,6 @@ class ParadexClient(BaseExchangeClient):
         best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
 
         # Determine order side and price
-        from paradex_py.common.order import OrderSide
-
         if direction == 'buy':
             # For buy orders, place slightly below best ask to ensure execution
             order_price = best_ask - self.config.tick_size
@@ -312,10 +324,10 @@ class ParadexClient(BaseExchangeClient):
         retry=retry_if_exception_type(Exception),
         reraise=True
     )
-    def _submit_order_with_retry(self, order) -> OrderResult:
+    async def _submit_order_with_retry(self, order) -> OrderResult:
         """Submit an order with Paradex using official SDK."""
         # Submit order using official SDK
-        order_result = self.paradex.api_client.submit_order(order)
+        order_result = await self.run_blocking(self.paradex.api_client.submit_order, order)
 
         # Extract order ID from response
         order_id = order_result.get('id')
@@ -326,8 +338,6 @@ class ParadexClient(BaseExchangeClient):
     async def place_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
                                     side: str) -> OrderResult:
         """Place a post only order with Paradex using official SDK."""
-        from paradex_py.common.order import Order, OrderType, OrderSide, OrderStatus
-
         # Create order using Paradex SDK
         order = Order(
             market=contract_id,
@@ -338,7 +348,7 @@ class ParadexClient(BaseExchangeClient):
             instruction="POST_ONLY"
         )
 
-        order_result = self._submit_order_with_retry(order)
+        order_result = await self._submit_order_with_retry(order)
 
         order_id = order_result.get('id')
         order_status = order_result.get('status')
@@ -361,7 +371,6 @@ class ParadexClient(BaseExchangeClient):
     async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
         """Place an open order with Paradex using official SDK."""
         attempt = 0
-        from paradex_py.common.order import OrderSide
         while True:
             attempt += 1
             if attempt % 5 == 0:
@@ -450,7 +459,6 @@ class ParadexClient(BaseExchangeClient):
             best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
 
             # Convert side string to OrderSide enum
-            from paradex_py.common.order import OrderSide
             order_side = OrderSide.Buy if side.lower() == 'buy' else OrderSide.Sell
 
             # Adjust order price based on market conditions and side
@@ -497,7 +505,7 @@ class ParadexClient(BaseExchangeClient):
         """Cancel an order with Paradex using official SDK."""
         try:
             # Cancel the order using official SDK
-            self.paradex.api_client.cancel_order(order_id)
+            await self.run_blocking(self.paradex.api_client.cancel_order, order_id)
             return OrderResult(success=True)
 
         except Exception as e:
@@ -507,7 +515,7 @@ class ParadexClient(BaseExchangeClient):
         """Get order information from Paradex using official SDK."""
         try:
             # Get order by ID using official SDK
-            order_data = self.paradex.api_client.fetch_order(order_id)
+            order_data = await self.run_blocking(self.paradex.api_client.fetch_order, order_id)
             size = Decimal(order_data.get('size', 0)).quantize(self.order_size_increment, rounding=ROUND_HALF_UP)
             remaining_size = Decimal(order_data.get('remaining_size', 0))
             return OrderInfo(
@@ -533,7 +541,8 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_orders_with_retry(self, contract_id: str) -> List[Dict[str, Any]]:
         """Get orders using official SDK."""
-        orders_response = self.paradex.api_client.fetch_orders({"market": contract_id, "status": "OPEN"})
+        orders_response = await self.run_blocking(self.paradex.api_client.fetch_orders,
+                                                  {"market": contract_id, "status": "OPEN"})
         if not orders_response or 'results' not in orders_response:
             self.logger.log("Failed to get orders", "ERROR")
             raise ValueError("Failed to get orders")
@@ -567,7 +576,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_positions_with_retry(self) -> List[Dict[str, Any]]:
         """Get positions using official SDK."""
-        positions_response = self.paradex.api_client.fetch_positions()
+        positions_response = await self.run_blocking(self.paradex.api_client.fetch_positions)
         if not positions_response or 'results' not in positions_response:
             self.logger.log("Failed to get positions", "ERROR")
             raise ValueError("Failed to get positions")
@@ -599,7 +608,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_market_with_retry(self, symbol: str) -> Dict[str, Any]:
         """Get market using official SDK."""
-        market_response = self.paradex.api_client.fetch_markets({"market": symbol})
+        market_response = await self.run_blocking(self.paradex.api_client.fetch_markets, {"market": symbol})
         if not market_response or 'results' not in market_response:
             self.logger.log("Failed to get markets", "ERROR")
             raise ValueError("Failed to get markets")
@@ -620,7 +629,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_markets_summary_with_retry(self, symbol: str) -> Dict[str, Any]:
         """Get markets summary using official SDK."""
-        market_summary_response = self.paradex.api_client.fetch_markets_summary({"market": symbol})
+        market_summary_response = await self.run_blocking(self.paradex.api_client.fetch_markets_summary, {"market": symbol})
         if not market_summary_response or 'results' not in market_summary_response:
             self.logger.log("Failed to get markets summary", "ERROR")
             raise ValueError("Failed to get markets summary")
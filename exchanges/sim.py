@@ -0,0 +1,474 @@
+"""
+Simulated exchange client for offline testing and benchmarks.
+
+An in-process venue with a price-time priority matching engine. A synthetic market maker
+quotes around a random-walk mid price and synthetic takers hit the book, so the bot's
+post-only orders rest, queue behind earlier orders at the same price and get filled like
+on a real venue. Order updates go through setup_order_update_handler in the same message
+format as the other adapters.
+
+Settings (environment, all optional):
+    SIM_MID_PRICE       starting mid price (default 3000)
+    SIM_TICK_SIZE       price tick (default 0.01)
+    SIM_SPREAD_TICKS    synthetic maker spread in ticks (default 2)
+    SIM_MAKER_SIZE      synthetic maker size per side (default 1)
+    SIM_TAKER_SIZE      max synthetic taker order size (default 1)
+    SIM_MARKET_INTERVAL seconds between market steps (default 0.01); 0 disables the market task
+    SIM_ACK_LATENCY     seconds before place/cancel calls return (default 0)
+    SIM_FILL_LATENCY    seconds before order updates reach the handler (default 0)
+    SIM_SEED            random seed (default 7)
+"""
+
+import asyncio
+import os
+import random
+import time
+from bisect import insort
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .base import BaseExchangeClient, CloseOrderRequest, OrderResult, OrderInfo
+from helpers.logger import TradingLogger
+
+BOT = 'bot'
+MARKET = 'market'
+
+
+@dataclass
+class SimOrder:
+    """A limit order resting in (or removed from) the simulated book."""
+    order_id: str
+    side: str
+    price: Decimal
+    size: Decimal
+    owner: str = BOT
+    filled_size: Decimal = Decimal(0)
+    status: str = 'OPEN'
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def remaining_size(self) -> Decimal:
+        return self.size - self.filled_size
+
+
+class SimMatchingEngine:
+    """Price-time priority limit order book for a single market."""
+
+    def __init__(self, on_order_update: Optional[Callable[[SimOrder, Decimal], None]] = None):
+        """on_order_update(order, fill_quantity) is called for every maker fill and cancel."""
+        self.on_order_update = on_order_update
+        self.orders: Dict[str, SimOrder] = {}
+        # price -> FIFO queue; price lists are kept sorted ascending
+        self._levels: Dict[str, Dict[Decimal, Deque[SimOrder]]] = {'buy': {}, 'sell': {}}
+        self._prices: Dict[str, List[Decimal]] = {'buy': [], 'sell': []}
+        self._next_order_id = 1
+        self.fills = 0
+
+    def _new_order_id(self) -> str:
+        order_id = str(self._next_order_id)
+        self._next_order_id += 1
+        return order_id
+
+    def best_price(self, side: str) -> Optional[Decimal]:
+        prices = self._prices[side]
+        if not prices:
+            return None
+        return prices[-1] if side == 'buy' else prices[0]
+
+    def best_bid(self) -> Optional[Decimal]:
+        return self.best_price('buy')
+
+    def best_ask(self) -> Optional[Decimal]:
+        return self.best_price('sell')
+
+    def level_size(self, side: str, price: Decimal) -> Decimal:
+        return sum((order.remaining_size for order in self._levels[side].get(price, ())), Decimal(0))
+
+    def _crosses(self, side: str, price: Optional[Decimal]) -> bool:
+        """Whether an order on `side` at `price` (None = market) would trade immediately."""
+        opposite = self.best_price('sell' if side == 'buy' else 'buy')
+        if opposite is None:
+            return False
+        if price is None:
+            return True
+        return price >= opposite if side == 'buy' else price <= opposite
+
+    def _notify(self, order: SimOrder, fill_quantity: Decimal = Decimal(0)) -> None:
+        if self.on_order_update:
+            self.on_order_update(order, fill_quantity)
+
+    def _rest(self, order: SimOrder) -> None:
+        levels = self._levels[order.side]
+        if order.price not in levels:
+            levels[order.price] = deque()
+            insort(self._prices[order.side], order.price)
+        levels[order.price].append(order)
+        self.orders[order.order_id] = order
+
+    def _remove_level(self, side: str, price: Decimal) -> None:
+        del self._levels[side][price]
+        self._prices[side].remove(price)
+
+    def _match(self, side: str, size: Decimal, limit_price: Optional[Decimal]) -> Decimal:
+        """Take liquidity from the opposite side. Returns the filled size."""
+        opposite = 'sell' if side == 'buy' else 'buy'
+        remaining = size
+        while remaining > 0 and self._crosses(side, limit_price):
+            price = self.best_price(opposite)
+            queue = self._levels[opposite][price]
+            maker = queue[0]
+            quantity = min(remaining, maker.remaining_size)
+            maker.filled_size += quantity
+            remaining -= quantity
+            self.fills += 1
+            if maker.remaining_size <= 0:
+                maker.status = 'FILLED'
+                queue.popleft()
+                del self.orders[maker.order_id]
+                if not queue:
+                    self._remove_level(opposite, price)
+            else:
+                maker.status = 'PARTIALLY_FILLED'
+            self._notify(maker, quantity)
+        return size - remaining
+
+    def submit_limit(self, side: str, price: Decimal, size: Decimal, post_only: bool = True,
+                     owner: str = BOT) -> SimOrder:
+        """Submit a limit order. Post-only orders that would cross are rejected."""
+        order = SimOrder(order_id=self._new_order_id(), side=side, price=price, size=size, owner=owner)
+        if post_only and self._crosses(side, price):
+            order.status = 'REJECTED'
+            return order
+        # Marketable part of a regular limit order takes liquidity; taker fills are not queued
+        order.filled_size = self._match(side, size, price)
+        if order.remaining_size <= 0:
+            order.status = 'FILLED'
+            return order
+        if order.filled_size > 0:
+            order.status = 'PARTIALLY_FILLED'
+        self._rest(order)
+        return order
+
+    def submit_market(self, side: str, size: Decimal) -> Decimal:
+        """Submit a market order. Returns the filled size."""
+        return self._match(side, size, None)
+
+    def _unrest(self, order: SimOrder) -> None:
+        del self.orders[order.order_id]
+        queue = self._levels[order.side][order.price]
+        queue.remove(order)
+        if not queue:
+            self._remove_level(order.side, order.price)
+
+    def amend(self, order_id: str, price: Decimal, size: Decimal) -> Optional[SimOrder]:
+        """Move a resting order to `price` and `size`, keeping its id (it loses time priority).
+        Returns None if the order is not open or would cross the book (post-only)."""
+        order = self.orders.get(order_id)
+        if order is None or size <= order.filled_size or self._crosses(order.side, price):
+            return None
+        self._unrest(order)
+        order.price = price
+        order.size = size
+        self._rest(order)
+        return order
+
+    def cancel(self, order_id: str) -> Optional[SimOrder]:
+        order = self.orders.get(order_id)
+        if order is None:
+            return None
+        self._unrest(order)
+        order.status = 'CANCELED'
+        self._notify(order)
+        return order
+
+
+class SimExchangeClient(BaseExchangeClient):
+    """Simulated exchange client backed by SimMatchingEngine."""
+
+    # No client-side rate limits unless RATE_LIMIT_SIM is set
+    RATE_LIMITS = {}
+    # Nothing to download, so nothing to cache
+    METADATA_ATTRIBUTES = None
+    NATIVE_AMEND = True
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the simulated venue from SIM_* environment settings."""
+        super().__init__(config)
+
+        self.tick_size = Decimal(os.getenv('SIM_TICK_SIZE', '0.01'))
+        self.mid_price = Decimal(os.getenv('SIM_MID_PRICE', '3000'))
+        self.spread_ticks = int(os.getenv('SIM_SPREAD_TICKS', '2'))
+        self.maker_size = Decimal(os.getenv('SIM_MAKER_SIZE', '1'))
+        self.taker_size = Decimal(os.getenv('SIM_TAKER_SIZE', '1'))
+        self.market_interval = float(os.getenv('SIM_MARKET_INTERVAL', '0.01'))
+        self.ack_latency = float(os.getenv('SIM_ACK_LATENCY', '0'))
+        self.fill_latency = float(os.getenv('SIM_FILL_LATENCY', '0'))
+        self.random = random.Random(int(os.getenv('SIM_SEED', '7')))
+
+        self.logger = TradingLogger(exchange="sim", ticker=self.config.ticker, log_to_console=False)
+        self._order_update_handler = None
+
+        self.engine = SimMatchingEngine(on_order_update=self._handle_engine_update)
+        self.position = Decimal(0)
+        # All bot orders by id, including filled and canceled ones (get_order_info keeps answering)
+        self.bot_orders: Dict[str, SimOrder] = {}
+        self._maker_orders: Tuple[Optional[str], Optional[str]] = (None, None)
+        self._market_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.orders_placed = 0
+        self.orders_rejected = 0
+        self.orders_canceled = 0
+        self.orders_amended = 0
+        self._requote()
+
+    def _validate_config(self) -> None:
+        """No credentials needed."""
+        pass
+
+    async def connect(self) -> None:
+        """Start the synthetic market."""
+        self._loop = asyncio.get_running_loop()
+        if self.market_interval > 0 and (self._market_task is None or self._market_task.done()):
+            self._market_task = asyncio.create_task(self._run_market())
+
+    async def disconnect(self) -> None:
+        """Stop the synthetic market."""
+        if self._market_task and not self._market_task.done():
+            self._market_task.cancel()
+            try:
+                await self._market_task
+            except asyncio.CancelledError:
+                pass
+
+    def get_exchange_name(self) -> str:
+        """Get the exchange name."""
+        return "sim"
+
+    def setup_order_update_handler(self, handler) -> None:
+        """Setup order update handler."""
+        self._order_update_handler = handler
+
+    # ---------------------------
+    # Synthetic market
+    # ---------------------------
+
+    def _requote(self) -> None:
+        """Replace the synthetic maker quotes around the current mid."""
+        for order_id in self._maker_orders:
+            if order_id is not None:
+                self.engine.cancel(order_id)
+        half_spread = self.tick_size * self.spread_ticks / 2
+        bid = (self.mid_price - half_spread).quantize(self.tick_size)
+        ask = (self.mid_price + half_spread).quantize(self.tick_size)
+        # Not post-only: a moving market trades through resting orders
+        bid_order = self.engine.submit_limit('buy', bid, self.maker_size, post_only=False, owner=MARKET)
+        ask_order = self.engine.submit_limit('sell', ask, self.maker_size, post_only=False, owner=MARKET)
+        self._maker_orders = (bid_order.order_id if bid_order.status != 'FILLED' else None,
+                              ask_order.order_id if ask_order.status != 'FILLED' else None)
+        self._update_bbo()
+
+    def step_market(self) -> None:
+        """Advance the synthetic market by one step: move the mid, requote, send taker flow."""
+        move = self.random.choice((-1, 0, 0, 1))
+        if move:
+            self.mid_price += self.tick_size * move
+            self._requote()
+        side = self.random.choice(('buy', 'sell'))
+        size = (self.taker_size * Decimal(self.random.random())).quantize(Decimal('0.001'))
+        if size > 0:
+            self.engine.submit_market(side, size)
+            if self.engine.best_bid() is None or self.engine.best_ask() is None:
+                self._requote()
+        self._update_bbo()
+
+    async def _run_market(self):
+        while True:
+            self.step_market()
+            await asyncio.sleep(self.market_interval)
+
+    def _update_bbo(self) -> None:
+        self.bbo_cache.update(self.engine.best_bid(), self.engine.best_ask())
+
+    # ---------------------------
+    # Order updates
+    # ---------------------------
+
+    def _order_message(self, order: SimOrder) -> Dict[str, Any]:
+        return {
+            'order_id': order.order_id,
+            'side': order.side,
+            'order_type': 'CLOSE' if order.side == self.config.close_order_side else 'OPEN',
+            'status': order.status,
+            'size': str(order.size),
+            'price': str(order.price),
+            'contract_id': self.config.contract_id,
+            'filled_size': str(order.filled_size)
+        }
+
+    def _handle_engine_update(self, order: SimOrder, fill_quantity: Decimal) -> None:
+        if order.owner == MARKET:
+            if order.status == 'FILLED':
+                self._maker_orders = tuple(None if order_id == order.order_id else order_id
+                                           for order_id in self._maker_orders)
+            return
+        if fill_quantity > 0:
+            self.position += fill_quantity if order.side == 'buy' else -fill_quantity
+        self._dispatch(order)
+
+    def _dispatch(self, order: SimOrder) -> None:
+        """Send an order update to the handler, after SIM_FILL_LATENCY if set."""
+        if not self._order_update_handler:
+            return
+        message = self._order_message(order)
+        if self.fill_latency > 0 and self._loop is not None:
+            self._loop.call_later(self.fill_latency, self._order_update_handler, message)
+        else:
+            self._order_update_handler(message)
+
+    async def _ack(self) -> None:
+        if self.ack_latency > 0:
+            await asyncio.sleep(self.ack_latency)
+
+    # ---------------------------
+    # Trading
+    # ---------------------------
+
+    async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """Best bid and ask from the simulated book."""
+        return self.engine.best_bid() or Decimal(0), self.engine.best_ask() or Decimal(0)
+
+    async def get_order_price(self, direction: str) -> Decimal:
+        """Post-only price one tick inside the opposite side."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            self.logger.log("Invalid bid/ask prices", "ERROR")
+            raise ValueError("Invalid bid/ask prices")
+
+        if direction == 'buy':
+            order_price = best_ask - self.tick_size
+        else:
+            order_price = best_bid + self.tick_size
+        return self.round_to_tick(order_price)
+
+    def _submit_bot_order(self, side: str, price: Decimal, quantity: Decimal) -> SimOrder:
+        order = self.engine.submit_limit(side, price, quantity, post_only=True, owner=BOT)
+        self.orders_placed += 1
+        if order.status == 'REJECTED':
+            self.orders_rejected += 1
+            return order
+        self.bot_orders[order.order_id] = order
+        self._dispatch(order)
+        return order
+
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place a post-only open order, re-pricing on post-only rejections."""
+        for _ in range(15):
+            order_price = await self.get_order_price(direction)
+            order = self._submit_bot_order(direction, order_price, quantity)
+            await self._ack()
+            if order.status != 'REJECTED':
+                return OrderResult(success=True, order_id=order.order_id, side=direction, size=quantity,
+                                   price=order_price, status=order.status)
+        return OrderResult(success=False, error_message='Post-only order rejected 15 times')
+
+    def _submit_close_order(self, quantity: Decimal, price: Decimal, side: str, best_bid: Decimal,
+                            best_ask: Decimal) -> OrderResult:
+        price = self.round_to_tick(price)
+        if side == 'sell' and best_bid > 0 and price <= best_bid:
+            price = best_bid + self.tick_size
+        elif side == 'buy' and best_ask > 0 and price >= best_ask:
+            price = best_ask - self.tick_size
+
+        order = self._submit_bot_order(side, price, quantity)
+        if order.status == 'REJECTED':
+            return OrderResult(success=False, error_message='Post-only order rejected')
+        return OrderResult(success=True, order_id=order.order_id, side=side, size=quantity,
+                           price=price, status=order.status)
+
+    async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
+        """Place a post-only close order, moved to the touch if it would cross."""
+        best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
+        result = self._submit_close_order(quantity, price, side, best_bid, best_ask)
+        await self._ack()
+        return result
+
+    async def place_orders_batch(self, orders: List[CloseOrderRequest]) -> List[OrderResult]:
+        """Place close orders in one simulated request (one ack latency)."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        results = [self._submit_close_order(order.quantity, order.price, order.side, best_bid, best_ask)
+                   for order in orders]
+        await self._ack()
+        return results
+
+    async def place_market_order(self, contract_id: str, quantity: Decimal, side: str) -> OrderResult:
+        """Place a market order (boost mode)."""
+        best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
+        filled_size = self.engine.submit_market(side, quantity)
+        self.position += filled_size if side == 'buy' else -filled_size
+        await self._ack()
+        return OrderResult(success=filled_size > 0, side=side, size=quantity,
+                           price=best_ask if side == 'buy' else best_bid,
+                           status='FILLED' if filled_size >= quantity else 'PARTIALLY_FILLED',
+                           filled_size=filled_size)
+
+    def _cancel(self, order_id: str) -> OrderResult:
+        order = self.engine.cancel(str(order_id))
+        if order is None:
+            return OrderResult(success=False, error_message=f'Order {order_id} not open')
+        self.orders_canceled += 1
+        return OrderResult(success=True, order_id=order.order_id, filled_size=order.filled_size)
+
+    async def cancel_order(self, order_id: str) -> OrderResult:
+        """Cancel a resting order."""
+        result = self._cancel(order_id)
+        await self._ack()
+        return result
+
+    async def cancel_orders_batch(self, order_ids: List[str]) -> List[OrderResult]:
+        """Cancel orders in one simulated request (one ack latency)."""
+        results = [self._cancel(order_id) for order_id in order_ids]
+        await self._ack()
+        return results
+
+    async def amend_order(self, order_id: str, contract_id: str, quantity: Decimal, price: Decimal,
+                          side: str) -> OrderResult:
+        """Re-price a resting order in one simulated request (one ack latency)."""
+        price = self.round_to_tick(price)
+        order = self.engine.amend(str(order_id), price, quantity)
+        if order is not None:
+            self.orders_amended += 1
+            self._dispatch(order)
+        await self._ack()
+        if order is None:
+            return OrderResult(success=False, error_message=f'Order {order_id} not amended')
+        return OrderResult(success=True, order_id=order.order_id, side=side, size=quantity,
+                           price=price, status=order.status)
+
+    async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
+        """Get order information for a bot order."""
+        order = self.bot_orders.get(str(order_id))
+        if order is None:
+            return None
+        return OrderInfo(order_id=order.order_id, side=order.side, size=order.size, price=order.price,
+                         status='OPEN' if order.status == 'PARTIALLY_FILLED' else order.status,
+                         filled_size=order.filled_size, remaining_size=order.remaining_size)
+
+    async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
+        """Resting bot orders (size is the remaining size, as for the other adapters)."""
+        return [OrderInfo(order_id=order.order_id, side=order.side, size=order.remaining_size,
+                          price=order.price, status=order.status, filled_size=order.filled_size,
+                          remaining_size=order.remaining_size)
+                for order in self.bot_orders.values() if order.order_id in self.engine.orders]
+
+    async def get_account_positions(self) -> Decimal:
+        """Absolute position from the bot's fills."""
+        return abs(self.position)
+
+    async def get_contract_attributes(self) -> Tuple[str, Decimal]:
+        """Contract id and tick size of the simulated market."""
+        self.config.contract_id = f"{self.config.ticker}-SIM"
+        self.config.tick_size = self.tick_size
+        return self.config.contract_id, self.tick_size
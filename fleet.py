@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Fleet host - runs many TradingBot instances in one process.
+
+Every bot in the fleet file gets its own TradingConfig and exchange client, but they all
+share one event loop, the blocking-call executor and, for bots on the same exchange and
+ticker, one public market data stream. A bot that crashes is restarted (or left stopped)
+without affecting the others.
+
+Fleet file (JSON, or YAML if PyYAML is installed), see fleet_example.json:
+
+    {
+      "defaults": {"quantity": "0.1", "take_profit": "0.02", "max_orders": 40},
+      "bots": [
+        {"name": "aster-eth", "exchange": "aster", "ticker": "ETH"},
+        {"name": "aster-eth-2", "exchange": "aster", "ticker": "ETH", "env_file": "account2.env"}
+      ]
+    }
+
+Bot keys match runbot.py arguments (with underscores). Credentials come from the process
+environment (--env-file), overridden per bot by "env_file" and/or an "env" mapping; they are
+applied only while that bot's exchange client is constructed. Logs are named after the bot
+(ACCOUNT_NAME defaults to its name), so the two ETH bots above write aster_ETH_aster-eth_*
+and aster_ETH_aster-eth-2_* files.
+
+Usage: python fleet.py --fleet fleet.json [--env-file .env]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import traceback
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import dotenv
+
+from exchanges import ExchangeFactory
+from exchanges.base import BaseExchangeClient, BBOCache, RequestCoalescer
+from runbot import setup_logging
+from trading_bot import TradingBot, TradingConfig
+
+# Same defaults as runbot.py
+BOT_DEFAULTS = {
+    'quantity': '0.1',
+    'take_profit': '0.02',
+    'direction': 'buy',
+    'max_orders': 40,
+    'wait_time': 450,
+    'grid_step': '-100',
+    'stop_price': '-1',
+    'pause_price': '-1',
+    'boost': False,
+    'pipeline': 0,
+    'restart': True,
+    'max_restarts': 5,
+}
+
+# Exchanges whose public BBO stream can be shared between clients of the same market
+SHARED_MARKET_DATA_EXCHANGES = {'aster', 'backpack', 'edgex', 'grvt', 'paradex'}
+
+RESTART_DELAY = 30
+
+
+@dataclass
+class BotSpec:
+    """One bot of the fleet."""
+    name: str
+    config: TradingConfig
+    env: Dict[str, str] = field(default_factory=dict)
+    restart: bool = True
+    max_restarts: int = 5
+
+
+def load_fleet_file(path: Path) -> Dict[str, Any]:
+    """Load a JSON or YAML fleet file."""
+    text = path.read_text()
+    if path.suffix.lower() in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is required for YAML fleet files; use JSON or pip install pyyaml")
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def parse_fleet(fleet: Dict[str, Any], base_dir: Path) -> List[BotSpec]:
+    """Build BotSpecs from a loaded fleet file. Relative env_file paths are resolved against base_dir."""
+    defaults = {**BOT_DEFAULTS, **fleet.get('defaults', {})}
+    supported = ExchangeFactory.get_supported_exchanges()
+
+    specs = []
+    for index, entry in enumerate(fleet.get('bots', [])):
+        params = {**defaults, **entry}
+        exchange = str(params.get('exchange', '')).lower()
+        ticker = str(params.get('ticker', '')).upper()
+        if exchange not in supported:
+            raise ValueError(f"Bot #{index}: unsupported exchange '{exchange}'. Available: {', '.join(supported)}")
+        if not ticker:
+            raise ValueError(f"Bot #{index}: ticker is required")
+        if params['boost'] and exchange not in ('aster', 'backpack'):
+            raise ValueError(f"Bot #{index}: boost can only be used with aster or backpack")
+
+        env = {}
+        if params.get('env_file'):
+            env_path = base_dir / params['env_file']
+            if not env_path.exists():
+                raise ValueError(f"Bot #{index}: env file not found: {env_path.resolve()}")
+            env.update({key: value for key, value in dotenv.dotenv_values(env_path).items() if value is not None})
+        env.update({key: str(value) for key, value in params.get('env', {}).items()})
+
+        config = TradingConfig(
+            ticker=ticker,
+            contract_id='',  # will be set in the bot's run method
+            tick_size=Decimal(0),
+            quantity=Decimal(str(params['quantity'])),
+            take_profit=Decimal(str(params['take_profit'])),
+            direction=str(params['direction']).lower(),
+            max_orders=int(params['max_orders']),
+            wait_time=int(params['wait_time']),
+            exchange=exchange,
+            grid_step=Decimal(str(params['grid_step'])),
+            stop_price=Decimal(str(params['stop_price'])),
+            pause_price=Decimal(str(params['pause_price'])),
+            boost_mode=bool(params['boost']),
+            pipeline=int(params['pipeline'])
+        )
+        name = params.get('name') or f"{exchange}_{ticker}_{index}"
+        specs.append(BotSpec(name=name, config=config, env=env, restart=bool(params['restart']),
+                             max_restarts=int(params['max_restarts'])))
+
+    names = [spec.name for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate bot names: {', '.join(duplicates)}")
+    # Same logger and log files, so their fills would mix together
+    log_keys = [(spec.config.exchange, spec.config.ticker, bot_account_name(spec)) for spec in specs]
+    duplicates = sorted({'/'.join(key) for key in log_keys if log_keys.count(key) > 1})
+    if duplicates:
+        raise ValueError(f"Bots on the same market need different ACCOUNT_NAMEs: {', '.join(duplicates)}")
+    if not specs:
+        raise ValueError("Fleet file has no bots")
+    return specs
+
+
+def bot_account_name(spec: BotSpec) -> str:
+    """ACCOUNT_NAME the bot's logs are named with: its env's, or the bot name."""
+    return spec.env.get('ACCOUNT_NAME') or spec.name
+
+
+@contextlib.contextmanager
+def bot_environment(env: Dict[str, str]):
+    """Temporarily overlay environment variables (exchange clients read credentials in __init__)."""
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class FleetHost:
+    """Runs a list of BotSpecs concurrently with per-bot failure isolation."""
+
+    def __init__(self, specs: List[BotSpec], restart_delay: float = RESTART_DELAY):
+        self.specs = specs
+        self.restart_delay = restart_delay
+        self.bots: Dict[str, TradingBot] = {}
+        # (exchange, ticker) -> (owner bot name, shared cache)
+        self._market_data: Dict[Tuple[str, str], Tuple[str, BBOCache]] = {}
+        # (exchange, account env) -> query coalescer shared by the bots of that account
+        self._requests: Dict[Tuple[str, Tuple], RequestCoalescer] = {}
+
+    def create_bot(self, spec: BotSpec) -> TradingBot:
+        with bot_environment({**spec.env, 'ACCOUNT_NAME': bot_account_name(spec)}):
+            bot = TradingBot(spec.config)
+        self._share_market_data(spec, bot.exchange_client)
+        self._share_requests(spec, bot.exchange_client)
+        self.bots[spec.name] = bot
+        return bot
+
+    def _share_market_data(self, spec: BotSpec, client: BaseExchangeClient) -> None:
+        """Let the first bot of each market stream its BBO and the others read that cache."""
+        if spec.config.exchange not in SHARED_MARKET_DATA_EXCHANGES:
+            return
+        key = (spec.config.exchange, spec.config.ticker)
+        if key not in self._market_data:
+            self._market_data[key] = (spec.name, client.bbo_cache)
+            return
+        owner_name, bbo_cache = self._market_data[key]
+        # A restarted owner reopens the stream into the same cache the others read
+        client.use_shared_market_data(bbo_cache, owner=(owner_name == spec.name))
+
+    def _share_requests(self, spec: BotSpec, client: BaseExchangeClient) -> None:
+        """Let bots on the same account share in-flight queries (positions, open orders, BBO)."""
+        key = (spec.config.exchange, tuple(sorted(spec.env.items())))
+        coalescer = self._requests.get(key)
+        if coalescer is None:
+            self._requests[key] = client.request_coalescer
+        else:
+            client.use_shared_requests(coalescer)
+
+    async def _run_bot(self, spec: BotSpec) -> None:
+        restarts = 0
+        while True:
+            try:
+                bot = self.create_bot(spec)
+                print(f"[fleet] [{spec.name}] starting {spec.config.exchange} {spec.config.ticker}")
+                await bot.run()
+                print(f"[fleet] [{spec.name}] stopped")
+                return
+            except asyncio.CancelledError:
+                raise
+            except (Exception, SystemExit) as e:
+                # SystemExit too: some adapters call sys.exit() on fatal order errors
+                print(f"[fleet] [{spec.name}] failed: {e!r}")
+                traceback.print_exc()
+
+            if not spec.restart or restarts >= spec.max_restarts:
+                print(f"[fleet] [{spec.name}] not restarting after {restarts} restarts")
+                return
+            restarts += 1
+            print(f"[fleet] [{spec.name}] restarting in {self.restart_delay}s ({restarts}/{spec.max_restarts})")
+            await asyncio.sleep(self.restart_delay)
+
+    async def run(self) -> None:
+        tasks = [asyncio.create_task(self._run_bot(spec), name=spec.name) for spec in self.specs]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Run many trading bots in one process')
+    parser.add_argument('--fleet', type=str, required=True, help='Fleet file (JSON or YAML)')
+    parser.add_argument('--env-file', type=str, default=".env", help=".env file path (default: .env)")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_arguments()
+    setup_logging("WARNING")
+
+    env_path = Path(args.env_file)
+    if env_path.exists():
+        dotenv.load_dotenv(args.env_file)
+
+    fleet_path = Path(args.fleet)
+    try:
+        specs = parse_fleet(load_fleet_file(fleet_path), fleet_path.parent)
+    except (OSError, ValueError) as e:
+        print(f"Invalid fleet file: {e}")
+        sys.exit(1)
+
+    print(f"[fleet] running {len(specs)} bots")
+    await FleetHost(specs).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,23 +8,38 @@ import time
 import requests
 import argparse
 import traceback
-import csv
 from decimal import Decimal
 from typing import Dict, Any, Tuple
 
 from lighter.signer_client import SignerClient
 from edgex_sdk import Client, OrderSide, WebSocketManager, CancelOrderParams
-import websockets
 from datetime import datetime
 import pytz
 import dotenv
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-dotenv.load_dotenv()
+from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+from helpers.order_book import OrderBook
+from helpers.latency import LatencyHistogram
+from helpers.metadata_cache import MarketMetadataCache, get_metadata_cache
+from exchanges.lighter_presign import LighterHedgeDispatch
+from helpers.metrics import get_metrics, start_metrics_server_from_env
+from helpers.log_writer import BackgroundLogHandler, LOG_MAX_BYTES, csv_line, get_log_writer
+from helpers.market_data import recorder_from_env
 
 
-class HedgeBot:
+class Config:
+    """Simple config class to wrap dictionary for the Lighter stream."""
+    def __init__(self, config_dict):
+        for key, value in config_dict.items():
+            setattr(self, key, value)
+
+
+class HedgeBot(LighterHedgeDispatch):
     """Trading bot that places post-only orders on edgeX and hedges with market orders on Lighter."""
 
+    HEDGE_BOT = 'hedge_edgex'
+
     def __init__(self, ticker: str, order_quantity: Decimal, fill_timeout: int = 5, iterations: int = 20, sleep_time: int = 0):
         self.ticker = ticker
         self.order_quantity = order_quantity
@@ -56,8 +71,8 @@ class HedgeBot:
         logging.getLogger('requests').setLevel(logging.WARNING)
         logging.getLogger('websockets').setLevel(logging.WARNING)
         
-        # Create file handler
-        file_handler = logging.FileHandler(self.log_filename)
+        # Create file handler (written by the background log writer, off the event loop)
+        file_handler = BackgroundLogHandler(self.log_filename, max_bytes=LOG_MAX_BYTES)
         file_handler.setLevel(logging.INFO)
         
         # Create console handler
@@ -90,24 +105,27 @@ class HedgeBot:
         self.edgex_order_status = None
         
         # edgeX websocket order book state
-        self.edgex_order_book = {"bids": {}, "asks": {}}
+        self.edgex_order_book = OrderBook()
         self.edgex_best_bid = None
         self.edgex_best_ask = None
         self.edgex_order_book_ready = False
         
-        # Lighter order book state
+        # Lighter client and shared market data/account stream
         self.lighter_client = None
-        self.lighter_order_book = {"bids": {}, "asks": {}}
-        self.lighter_best_bid = None
-        self.lighter_best_ask = None
-        self.lighter_order_book_ready = False
-        self.lighter_order_book_offset = 0
-        self.lighter_order_book_sequence_gap = False
-        self.lighter_snapshot_loaded = False
-        self.lighter_order_book_lock = asyncio.Lock()
-        
-        # Lighter WebSocket state
+        self.lighter_stream = None
         self.lighter_ws_task = None
+
+        # Raw edgeX depth frames are recorded when MARKET_DATA_RECORD_DIR is set
+        self.book_recorder = recorder_from_env(f"edgex-{ticker}")
+
+        # Event-driven hedge dispatch: the maker fill callback starts the Lighter hedge directly
+        self.loop = None
+        self.lighter_hedge_task = None
+        self.lighter_hedge_started = asyncio.Event()
+        self.maker_fill_time = None
+        self.fill_to_hedge_latency = LatencyHistogram("fill_to_hedge_sent")
+        # Stage timestamps from the maker fill frame, served by the metrics endpoint (METRICS_PORT)
+        self.hedge_trace = None
         
         # Lighter order management
         self.lighter_order_price = None
@@ -154,6 +172,12 @@ class HedgeBot:
             except Exception as e:
                 self.logger.error(f"Error cancelling Lighter WebSocket task: {e}")
 
+        # Flush market data recordings
+        if self.book_recorder:
+            self.book_recorder.close()
+        if self.lighter_stream and self.lighter_stream.recorder:
+            self.lighter_stream.recorder.close()
+
         # Close logging handlers properly
         for handler in self.logger.handlers[:]:
             try:
@@ -163,26 +187,21 @@ class HedgeBot:
                 pass
 
     def _initialize_csv_file(self):
-        """Initialize CSV file with headers if it doesn't exist."""
-        if not os.path.exists(self.csv_filename):
-            with open(self.csv_filename, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['exchange', 'timestamp', 'side', 'price', 'quantity'])
-    
+        """Register the CSV file with the background writer (headers are written if it doesn't exist)."""
+        get_log_writer().register(self.csv_filename, header=['exchange', 'timestamp', 'side', 'price', 'quantity'])
+
     def log_trade_to_csv(self, exchange: str, side: str, price: str, quantity: str):
         """Log trade details to CSV file."""
         timestamp = datetime.now(pytz.UTC).isoformat()
-        
-        with open(self.csv_filename, 'a', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                exchange,
-                timestamp,
-                side,
-                price,
-                quantity
-            ])
-        
+
+        get_log_writer().write(self.csv_filename, csv_line([
+            exchange,
+            timestamp,
+            side,
+            price,
+            quantity
+        ]))
+
         self.logger.info(f"📊 Trade logged to CSV: {exchange} {side} {quantity} @ {price}")
 
     def setup_signal_handlers(self):
@@ -235,7 +254,15 @@ class HedgeBot:
         return self.edgex_client
 
     async def get_lighter_market_config(self) -> Tuple[int, int, int, Decimal]:
-        """Get Lighter market configuration."""
+        """Get Lighter market configuration (from the market-metadata cache when fresh)."""
+        cache = get_metadata_cache()
+        cache_key = MarketMetadataCache.key('lighter', self.ticker)
+        found = cache.lookup(cache_key) if cache is not None else None
+        if found is not None:
+            market = found[0]
+            return (market['contract_id'], market['base_amount_multiplier'],
+                    market['price_multiplier'], market['tick_size'])
+
         url = f"{self.lighter_base_url}/api/v1/orderBooks"
         headers = {"accept": "application/json"}
 
@@ -254,11 +281,14 @@ class HedgeBot:
             for market in data["order_books"]:
                 if market["symbol"] == self.ticker:
                     price_multiplier = pow(10, market["supported_price_decimals"])
-                    return (market["market_id"], 
-                           pow(10, market["supported_size_decimals"]), 
-                           price_multiplier,
-                           Decimal("1") / (Decimal("10") ** market["supported_price_decimals"])
-                           )
+                    config = (market["market_id"],
+                              pow(10, market["supported_size_decimals"]),
+                              price_multiplier,
+                              Decimal("1") / (Decimal("10") ** market["supported_price_decimals"]))
+                    if cache is not None:
+                        cache.store(cache_key, dict(zip(
+                            ('contract_id', 'base_amount_multiplier', 'price_multiplier', 'tick_size'), config)))
+                    return config
             raise Exception(f"Ticker {self.ticker} not found")
 
         except Exception as e:
@@ -417,6 +447,9 @@ class HedgeBot:
 
     def handle_edgex_order_book_update(self, message):
         """Handle edgeX order book updates from WebSocket."""
+        if self.book_recorder:
+            self.book_recorder.record(message)
+
         try:
             if isinstance(message, str):
                 message = json.loads(message)
@@ -445,28 +478,20 @@ class HedgeBot:
                             for bid in bids:
                                 price = Decimal(bid['price'])
                                 size = Decimal(bid['size'])
-                                if size > 0:
-                                    self.edgex_order_book['bids'][price] = size
-                                else:
-                                    # Remove zero size orders
-                                    self.edgex_order_book['bids'].pop(price, None)
+                                self.edgex_order_book['bids'].update(price, size)
                             
                             # Update asks - format is [{"price": "121699.0", "size": "5.128"}, ...]
                             asks = order_book_data.get('asks', [])
                             for ask in asks:
                                 price = Decimal(ask['price'])
                                 size = Decimal(ask['size'])
-                                if size > 0:
-                                    self.edgex_order_book['asks'][price] = size
-                                else:
-                                    # Remove zero size orders
-                                    self.edgex_order_book['asks'].pop(price, None)
+                                self.edgex_order_book['asks'].update(price, size)
                             
                             # Update best bid and ask
                             if self.edgex_order_book['bids']:
-                                self.edgex_best_bid = max(self.edgex_order_book['bids'].keys())
+                                self.edgex_best_bid = self.edgex_order_book['bids'].best_price()
                             if self.edgex_order_book['asks']:
-                                self.edgex_best_ask = min(self.edgex_order_book['asks'].keys())
+                                self.edgex_best_ask = self.edgex_order_book['asks'].best_price()
                             
                             if not self.edgex_order_book_ready:
                                 self.edgex_order_book_ready = True
@@ -507,70 +532,9 @@ class HedgeBot:
         except Exception as e:
             self.logger.error(f"Error handling Lighter order result: {e}")
 
-    async def reset_lighter_order_book(self):
-        """Reset Lighter order book state."""
-        async with self.lighter_order_book_lock:
-            self.lighter_order_book["bids"].clear()
-            self.lighter_order_book["asks"].clear()
-            self.lighter_order_book_offset = 0
-            self.lighter_order_book_sequence_gap = False
-            self.lighter_snapshot_loaded = False
-            self.lighter_best_bid = None
-            self.lighter_best_ask = None
-
-    def update_lighter_order_book(self, side: str, levels: list):
-        """Update Lighter order book with new levels."""
-        for level in levels:
-            # Handle different data structures - could be list [price, size] or dict {"price": ..., "size": ...}
-            if isinstance(level, list) and len(level) >= 2:
-                price = Decimal(level[0])
-                size = Decimal(level[1])
-            elif isinstance(level, dict):
-                price = Decimal(level.get("price", 0))
-                size = Decimal(level.get("size", 0))
-            else:
-                self.logger.warning(f"⚠️ Unexpected level format: {level}")
-                continue
-                
-            if size > 0:
-                self.lighter_order_book[side][price] = size
-            else:
-                # Remove zero size orders
-                self.lighter_order_book[side].pop(price, None)
-
-    def validate_order_book_offset(self, new_offset: int) -> bool:
-        """Validate order book offset sequence."""
-        if new_offset <= self.lighter_order_book_offset:
-            self.logger.warning(f"⚠️ Out-of-order update: new_offset={new_offset}, current_offset={self.lighter_order_book_offset}")
-            return False
-        return True
-
-    def validate_order_book_integrity(self) -> bool:
-        """Validate order book integrity."""
-        # Check for negative prices or sizes
-        for side in ["bids", "asks"]:
-            for price, size in self.lighter_order_book[side].items():
-                if price <= 0 or size <= 0:
-                    self.logger.error(f"❌ Invalid order book data: {side} price={price}, size={size}")
-                    return False
-        return True
-
     def get_lighter_best_levels(self) -> Tuple[Tuple[Decimal, Decimal], Tuple[Decimal, Decimal]]:
         """Get best bid and ask levels from Lighter order book."""
-        best_bid = None
-        best_ask = None
-        
-        if self.lighter_order_book["bids"]:
-            best_bid_price = max(self.lighter_order_book["bids"].keys())
-            best_bid_size = self.lighter_order_book["bids"][best_bid_price]
-            best_bid = (best_bid_price, best_bid_size)
-        
-        if self.lighter_order_book["asks"]:
-            best_ask_price = min(self.lighter_order_book["asks"].keys())
-            best_ask_size = self.lighter_order_book["asks"][best_ask_price]
-            best_ask = (best_ask_price, best_ask_size)
-        
-        return best_bid, best_ask
+        return self.lighter_stream.get_top_levels()
 
     def get_lighter_order_price(self, is_ask: bool) -> Decimal:
         """Get mid price from Lighter order book."""
@@ -597,169 +561,6 @@ class HedgeBot:
             # For sell orders, decrease price to improve fill probability
             return original_price - adjustment
 
-    async def request_fresh_snapshot(self, ws):
-        """Request fresh order book snapshot."""
-        await ws.send(json.dumps({"type": "subscribe", "channel": f"order_book/{self.lighter_market_index}"}))
-
-    async def handle_lighter_ws(self):
-        """Handle Lighter WebSocket connection and messages."""
-        url = "wss://mainnet.zklighter.elliot.ai/stream"
-        cleanup_counter = 0
-        
-        while not self.stop_flag:
-            timeout_count = 0
-            try:
-                # Reset order book state before connecting
-                await self.reset_lighter_order_book()
-                
-                async with websockets.connect(url) as ws:
-                    # Subscribe to order book updates
-                    await ws.send(json.dumps({"type": "subscribe", "channel": f"order_book/{self.lighter_market_index}"}))
-
-                    # Subscribe to account orders updates
-                    account_orders_channel = f"account_orders/{self.lighter_market_index}/{self.account_index}"
-
-                    # Get auth token for the subscription
-                    try:
-                        # Set auth token to expire in 10 minutes
-                        ten_minutes_deadline = int(time.time() + 10 * 60)
-                        auth_token, err = self.lighter_client.create_auth_token_with_expiry(ten_minutes_deadline)
-                        if err is not None:
-                            self.logger.warning(f"⚠️ Failed to create auth token for account orders subscription: {err}")
-                        else:
-                            auth_message = {
-                                "type": "subscribe",
-                                "channel": account_orders_channel,
-                                "auth": auth_token
-                            }
-                            await ws.send(json.dumps(auth_message))
-                            self.logger.info("✅ Subscribed to account orders with auth token (expires in 10 minutes)")
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Error creating auth token for account orders subscription: {e}")
-
-                    while not self.stop_flag:
-                        try:
-                            msg = await asyncio.wait_for(ws.recv(), timeout=1)
-
-                            try:
-                                data = json.loads(msg)
-                            except json.JSONDecodeError as e:
-                                self.logger.warning(f"⚠️ JSON parsing error in Lighter websocket: {e}")
-                                continue
-
-                            # Reset timeout counter on successful message
-                            timeout_count = 0
-
-                            async with self.lighter_order_book_lock:
-                                if data.get("type") == "subscribed/order_book":
-                                    # Initial snapshot - clear and populate the order book
-                                    self.lighter_order_book["bids"].clear()
-                                    self.lighter_order_book["asks"].clear()
-
-                                    # Handle the initial snapshot
-                                    order_book = data.get("order_book", {})
-                                    if order_book and "offset" in order_book:
-                                        self.lighter_order_book_offset = order_book["offset"]
-                                        self.logger.info(f"✅ Initial order book offset set to: {self.lighter_order_book_offset}")
-
-                                    # Debug: Log the structure of bids and asks
-                                    bids = order_book.get("bids", [])
-                                    asks = order_book.get("asks", [])
-                                    if bids:
-                                        self.logger.debug(f"📊 Sample bid structure: {bids[0] if bids else 'None'}")
-                                    if asks:
-                                        self.logger.debug(f"📊 Sample ask structure: {asks[0] if asks else 'None'}")
-
-                                    self.update_lighter_order_book("bids", bids)
-                                    self.update_lighter_order_book("asks", asks)
-                                    self.lighter_snapshot_loaded = True
-                                    self.lighter_order_book_ready = True
-
-                                    self.logger.info(f"✅ Lighter order book snapshot loaded with "
-                                          f"{len(self.lighter_order_book['bids'])} bids and "
-                                          f"{len(self.lighter_order_book['asks'])} asks")
-
-                                elif data.get("type") == "update/order_book" and self.lighter_snapshot_loaded:
-                                    # Extract offset from the message
-                                    order_book = data.get("order_book", {})
-                                    if not order_book or "offset" not in order_book:
-                                        self.logger.warning("⚠️ Order book update missing offset, skipping")
-                                        continue
-
-                                    new_offset = order_book["offset"]
-
-                                    # Validate offset sequence
-                                    if not self.validate_order_book_offset(new_offset):
-                                        self.lighter_order_book_sequence_gap = True
-                                        break
-
-                                    # Update the order book with new data
-                                    self.update_lighter_order_book("bids", order_book.get("bids", []))
-                                    self.update_lighter_order_book("asks", order_book.get("asks", []))
-
-                                    # Validate order book integrity after update
-                                    if not self.validate_order_book_integrity():
-                                        self.logger.warning("🔄 Order book integrity check failed, requesting fresh snapshot...")
-                                        break
-
-                                    # Get the best bid and ask levels
-                                    best_bid, best_ask = self.get_lighter_best_levels()
-
-                                    # Update global variables
-                                    if best_bid is not None:
-                                        self.lighter_best_bid = best_bid[0]
-                                    if best_ask is not None:
-                                        self.lighter_best_ask = best_ask[0]
-
-                                elif data.get("type") == "ping":
-                                    # Respond to ping with pong
-                                    await ws.send(json.dumps({"type": "pong"}))
-                                elif data.get("type") == "update/account_orders":
-                                    # Handle account orders updates
-                                    orders = data.get("orders", {}).get(str(self.lighter_market_index), [])
-                                    if len(orders) == 1:
-                                        order_data = orders[0]
-                                        if order_data.get("status") == "filled":
-                                            self.handle_lighter_order_result(order_data)
-                                elif data.get("type") == "update/order_book" and not self.lighter_snapshot_loaded:
-                                    # Ignore updates until we have the initial snapshot
-                                    continue
-
-                            # Periodic cleanup outside the lock
-                            cleanup_counter += 1
-                            if cleanup_counter >= 1000:
-                                cleanup_counter = 0
-
-                            # Handle sequence gap and integrity issues outside the lock
-                            if self.lighter_order_book_sequence_gap:
-                                try:
-                                    await self.request_fresh_snapshot(ws)
-                                    self.lighter_order_book_sequence_gap = False
-                                except Exception as e:
-                                    self.logger.error(f"⚠️ Failed to request fresh snapshot: {e}")
-                                    break
-
-                        except asyncio.TimeoutError:
-                            timeout_count += 1
-                            if timeout_count % 3 == 0:
-                                self.logger.warning(f"⏰ No message from Lighter websocket for {timeout_count} seconds")
-                            continue
-                        except websockets.exceptions.ConnectionClosed as e:
-                            self.logger.warning(f"⚠️ Lighter websocket connection closed: {e}")
-                            break
-                        except websockets.exceptions.WebSocketException as e:
-                            self.logger.warning(f"⚠️ Lighter websocket error: {e}")
-                            break
-                        except Exception as e:
-                            self.logger.error(f"⚠️ Error in Lighter websocket: {e}")
-                            self.logger.error(f"⚠️ Full traceback: {traceback.format_exc()}")
-                            break
-            except Exception as e:
-                self.logger.error(f"⚠️ Failed to connect to Lighter websocket: {e}")
-            
-            # Wait a bit before reconnecting
-            await asyncio.sleep(2)
-
     def handle_edgex_order_update(self, order_data):
         """Handle edgeX order updates from WebSocket."""
         order_id = order_data.get('order_id')
@@ -787,9 +588,14 @@ class HedgeBot:
         }
 
         self.waiting_for_lighter_fill = True
+        self.trigger_lighter_hedge()
         
         self.logger.info(f"📋 Ready to place Lighter order: {lighter_side} {filled_size} @ {price}")
 
+    def lighter_hedge_order(self, side: str, quantity: Decimal, price: Decimal):
+        """Hedge with a mid-price limit order rather than a market order."""
+        return self.place_lighter_limit_order(side, quantity, price)
+
     async def place_lighter_limit_order(self, lighter_side: str, quantity: Decimal, price: Decimal):
         """Place a limit order on Lighter with mid price strategy."""
         if not self.lighter_client:
@@ -820,6 +626,10 @@ class HedgeBot:
 
         self.logger.info(f"[{order_type}] [Lighter] [{lighter_side}] Placing limit order at mid price: {order_price}")
         
+        trace = self.hedge_trace or get_metrics().trace('hedge_stage', bot='hedge_edgex', ticker=self.ticker)
+        self.hedge_trace = None
+        trace.mark('decided')
+
         # Reset order state
         self.lighter_order_filled = False
         self.lighter_order_price = order_price
@@ -842,6 +652,10 @@ class HedgeBot:
                 reduce_only=False,
                 trigger_price=0,
             )
+            trace.mark('sent')
+            if self.maker_fill_time is not None:
+                self.fill_to_hedge_latency.record(time.perf_counter() - self.maker_fill_time)
+                self.maker_fill_time = None
             
             if error is not None:
                 self.logger.error(f"❌ Lighter order error: {error}")
@@ -851,6 +665,8 @@ class HedgeBot:
             
             # Start monitoring in a separate task
             await self.monitor_lighter_order(client_order_index)
+            if self.lighter_order_filled:
+                trace.mark('filled')
             
             return tx_hash
             
@@ -898,7 +714,8 @@ class HedgeBot:
                 self.order_execution_complete = True
                 break
                 
-            await asyncio.sleep(0.1)  # Check every 100ms
+            # Woken by the account orders stream as soon as the fill arrives
+            await self.lighter_stream.wait_for_fill(client_order_index, timeout=0.1)
 
     async def modify_lighter_order(self, client_order_index: int, new_price: Decimal):
         """Modify current Lighter order with new price using client_order_index."""
@@ -1032,6 +849,8 @@ class HedgeBot:
     async def trading_loop(self):
         """Main trading loop implementing the new strategy."""
         self.logger.info(f"🚀 Starting hedge bot for {self.ticker}")
+        self.loop = asyncio.get_running_loop()
+        await start_metrics_server_from_env()
         
         # Initialize clients
         try:
@@ -1041,6 +860,17 @@ class HedgeBot:
             # Get contract info
             self.edgex_contract_id, self.edgex_tick_size = await self.get_edgex_contract_info()
             self.lighter_market_index, self.base_amount_multiplier, self.price_multiplier, self.tick_size = await self.get_lighter_market_config()
+            self.lighter_stream = LighterCustomWebSocketManager(
+                Config({
+                    'contract_id': self.lighter_market_index,
+                    'account_index': self.account_index,
+                    'lighter_client': self.lighter_client,
+                    'price_multiplier': self.price_multiplier,
+                    'base_amount_multiplier': self.base_amount_multiplier,
+                }),
+                fill_callback=self.handle_lighter_order_result
+            )
+            self.lighter_stream.set_logger(self.logger)
             
             self.logger.info(f"Contract info loaded - edgeX: {self.edgex_contract_id}, Lighter: {self.lighter_market_index}")
             
@@ -1082,23 +912,16 @@ class HedgeBot:
 
         # Setup Lighter websocket
         try:
-            self.lighter_ws_task = asyncio.create_task(self.handle_lighter_ws())
+            self.lighter_ws_task = asyncio.create_task(self.lighter_stream.connect())
             self.logger.info("✅ Lighter WebSocket task started")
-            
+
             # Wait for initial Lighter order book data with timeout
             self.logger.info("⏳ Waiting for initial Lighter order book data...")
             timeout = 10  # seconds
-            start_time = time.time()
-            while not self.lighter_order_book_ready and not self.stop_flag:
-                if time.time() - start_time > timeout:
-                    self.logger.warning(f"⚠️ Timeout waiting for Lighter WebSocket order book data after {timeout}s")
-                    break
-                await asyncio.sleep(0.5)
-            
-            if self.lighter_order_book_ready:
+            if await self.lighter_stream.wait_until_ready(timeout):
                 self.logger.info("✅ Lighter WebSocket order book data received")
             else:
-                self.logger.warning("⚠️ Lighter WebSocket order book not ready")
+                self.logger.warning(f"⚠️ Timeout waiting for Lighter WebSocket order book data after {timeout}s")
             
         except Exception as e:
             self.logger.error(f"❌ Failed to setup Lighter websocket: {e}")
@@ -1121,6 +944,7 @@ class HedgeBot:
 
             self.order_execution_complete = False
             self.waiting_for_lighter_fill = False
+            self.reset_lighter_hedge()
             try:
                 # Determine side based on some logic (for now, alternate)
                 side = 'buy'
@@ -1140,21 +964,8 @@ class HedgeBot:
                 break
 
             # Wait for edgeX order to fill and then place Lighter order
-            start_time = time.time()
-            while not self.order_execution_complete and not self.stop_flag:
-                # Check if edgeX order filled and we need to place Lighter order
-                if self.waiting_for_lighter_fill:
-                    await self.place_lighter_limit_order(
-                        self.current_lighter_side,
-                        self.current_lighter_quantity,
-                        self.current_lighter_price
-                    )
-                    break
-                
-                await asyncio.sleep(0.01)
-                if time.time() - start_time > 180:
-                    self.logger.error(f"❌ Timeout waiting for trade completion")
-                    break
+            if not await self.wait_for_lighter_hedge(timeout=180) and not self.stop_flag:
+                self.logger.error("❌ Timeout waiting for trade completion")
 
             if self.stop_flag:
                 break
@@ -1168,6 +979,7 @@ class HedgeBot:
             self.logger.info(f"[STEP 2] EdgeX position: {self.edgex_position} | Lighter position: {self.lighter_position}")
             self.order_execution_complete = False
             self.waiting_for_lighter_fill = False
+            self.reset_lighter_hedge()
             try:
                 # Determine side based on some logic (for now, alternate)
                 side = 'sell'
@@ -1178,20 +990,8 @@ class HedgeBot:
                 break
 
             # Wait for edgeX order to fill and then place Lighter order
-            start_time2 = time.time()
-            while not self.order_execution_complete and not self.stop_flag:
-                # Check if edgeX order filled and we need to place Lighter order
-                if self.waiting_for_lighter_fill:
-                    await self.place_lighter_limit_order(
-                        self.current_lighter_side,
-                        self.current_lighter_quantity,
-                        self.current_lighter_price
-                    )
-                    break
-                await asyncio.sleep(0.01)
-                if time.time() - start_time2 > 180:
-                    self.logger.error(f"❌ Timeout waiting for trade completion")
-                    break
+            if not await self.wait_for_lighter_hedge(timeout=180) and not self.stop_flag:
+                self.logger.error("❌ Timeout waiting for trade completion")
 
             # Sleep after step 2
             if self.sleep_time > 0:
@@ -1202,6 +1002,7 @@ class HedgeBot:
             self.logger.info(f"[STEP 3] EdgeX position: {self.edgex_position} | Lighter position: {self.lighter_position}")
             self.order_execution_complete = False
             self.waiting_for_lighter_fill = False
+            self.reset_lighter_hedge()
             if self.edgex_position == 0:
                 continue
             elif self.edgex_position > 0:
@@ -1217,20 +1018,8 @@ class HedgeBot:
                 self.logger.error(f"⚠️ Full traceback: {traceback.format_exc()}")
                 break
 
-            start_time3 = time.time()
-            while not self.order_execution_complete and not self.stop_flag:
-                # Check if edgeX order filled and we need to place Lighter order
-                if self.waiting_for_lighter_fill:
-                    await self.place_lighter_limit_order(
-                        self.current_lighter_side,
-                        self.current_lighter_quantity,
-                        self.current_lighter_price
-                    )
-                    break
-                await asyncio.sleep(0.01)
-                if time.time() - start_time3 > 180:
-                    self.logger.error(f"❌ Timeout waiting for trade completion")
-                    break
+            if not await self.wait_for_lighter_hedge(timeout=180) and not self.stop_flag:
+                self.logger.error("❌ Timeout waiting for trade completion")
 
     async def run(self):
         """Run the hedge bot."""
@@ -1242,6 +1031,9 @@ class HedgeBot:
             self.logger.info("\n🛑 Received interrupt signal...")
         finally:
             self.logger.info("🔄 Cleaning up...")
+            self.logger.info(f"⏱️ {self.fill_to_hedge_latency.summary()}")
+            for line in get_metrics().summaries():
+                self.logger.info(f"⏱️ {line}")
             self.shutdown()
 
 
@@ -1265,6 +1057,7 @@ def parse_arguments():
 async def main():
     """Main entry point."""
     args = parse_arguments()
+    dotenv.load_dotenv()
 
     # Create and run the hedge bot
     bot = HedgeBot(
@@ -3,5 +3,7 @@ Helper modules for perp-dex-tools.
 """
 
 from .logger import TradingLogger
+from .order_book import OrderBook, OrderBookSide
+from .latency import LatencyHistogram
 
-__all__ = ['TradingLogger']
+__all__ = ['TradingLogger', 'OrderBook', 'OrderBookSide', 'LatencyHistogram']
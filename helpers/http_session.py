@@ -0,0 +1,51 @@
+"""
+Long-lived aiohttp sessions for REST adapters.
+
+Opening a ClientSession per request pays DNS, TCP and TLS setup on every call. Exchange
+clients keep one session from connect() to disconnect() so requests reuse pooled
+keep-alive connections.
+"""
+
+from typing import Optional
+
+import aiohttp
+
+# Total connections per session and per exchange host
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+# Keep idle connections for this long (seconds) before closing them
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_DNS_CACHE_TTL = 300
+HTTP_REQUEST_TIMEOUT = 10
+
+
+def create_http_session(limit: int = HTTP_POOL_LIMIT, limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+                        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+                        timeout: float = HTTP_REQUEST_TIMEOUT) -> aiohttp.ClientSession:
+    """Create a keep-alive session with a bounded connection pool. Must be called inside a running loop."""
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+
+class HttpSessionHolder:
+    """Lazily created session that can be shared by a client and its websocket manager."""
+
+    def __init__(self, **session_kwargs):
+        self._session_kwargs = session_kwargs
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def get(self) -> aiohttp.ClientSession:
+        """Return the open session, creating it on first use or after close()."""
+        if self._session is None or self._session.closed:
+            self._session = create_http_session(**self._session_kwargs)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,25 @@
+"""
+JSON decoding for websocket feeds.
+
+Uses orjson when it is installed and falls back to the standard library. Set JSON_DECODER=stdlib
+to force the fallback. orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+catch json.JSONDecodeError (re-exported here) whichever decoder is active.
+"""
+
+import json
+import os
+from typing import Any, Callable, Union
+
+JSONDecodeError = json.JSONDecodeError
+
+try:
+    if os.getenv('JSON_DECODER', '').lower() == 'stdlib':
+        raise ImportError
+    import orjson
+except ImportError:
+    orjson = None
+
+DECODER = 'orjson' if orjson is not None else 'stdlib'
+
+# Bound directly (no wrapper call per frame); accepts str or bytes
+loads: Callable[[Union[str, bytes, bytearray]], Any] = orjson.loads if orjson is not None else json.loads
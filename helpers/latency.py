@@ -0,0 +1,78 @@
+"""
+Lightweight latency histogram for hot-path timing.
+"""
+
+from bisect import bisect_left
+from typing import List, Optional, Sequence, Tuple
+
+# Bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def log_buckets_ms(lowest_ms: float, highest_ms: float, per_decade: int) -> Tuple[float, ...]:
+    """Log-spaced bucket bounds, HDR-style: constant relative error (10 ** (1 / per_decade))
+    from `lowest_ms` to `highest_ms`."""
+    bounds = []
+    i = 0
+    while not bounds or bounds[-1] < highest_ms:
+        bounds.append(float(f"{lowest_ms * 10 ** (i / per_decade):.3g}"))
+        i += 1
+    return tuple(bounds)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram.
+
+    Recording is a bisect and two additions, so it is cheap enough to call on every
+    order. Percentiles are reported as the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self, name: str, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        """Record one sample given in seconds."""
+        value_ms = seconds * 1000
+        self.counts[bisect_left(self.buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if self.min_ms is None or value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if self.max_ms is None or value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return the bucket upper bound (ms) containing the p-th percentile, or None if empty."""
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets_ms, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def mean(self) -> Optional[float]:
+        return self.total_ms / self.count if self.count else None
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def summary(self) -> str:
+        """One-line summary suitable for logging."""
+        if not self.count:
+            return f"{self.name}: no samples"
+        return (f"{self.name}: n={self.count} mean={self.mean():.2f}ms min={self.min_ms:.2f}ms "
+                f"p50<={self.percentile(50):.2f}ms p90<={self.percentile(90):.2f}ms "
+                f"p99<={self.percentile(99):.2f}ms max={self.max_ms:.2f}ms")
@@ -0,0 +1,251 @@
+"""
+Background file writer for logs and CSV trade records.
+
+Callers (event loop, websocket callbacks) only put items on a queue; a single daemon thread
+formats log records, appends them in batches to files it keeps open, flushes once per batch
+and rotates files by size and/or age. Rotated files are gzip-compressed on another thread,
+so neither the callers nor the writer wait on compression.
+
+    writer = get_log_writer()
+    writer.register('logs/trades.csv', header=['timestamp', 'side', 'price'])
+    writer.write('logs/trades.csv', csv_line([timestamp, side, price]))
+    logger.addHandler(BackgroundLogHandler('logs/activity.log', max_bytes=LOG_MAX_BYTES))
+"""
+
+import atexit
+import csv
+import gzip
+import io
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+BATCH_SIZE = 512
+LOG_MAX_BYTES = 100 * 1024 * 1024
+FLUSH_TIMEOUT = 5
+
+_WRITE = 0
+_RECORD = 1
+_FLUSH = 2
+_STOP = 3
+
+
+def csv_line(row) -> str:
+    """One CSV row as text, with the csv module's quoting and line terminator."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+def compress_file(path: str) -> None:
+    """gzip a rotated file and remove the original."""
+    try:
+        with open(path, 'rb') as source, gzip.open(f"{path}.gz", 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(path)
+    except OSError as e:
+        print(f"[log_writer] Failed to compress {path}: {e}", file=sys.stderr)
+
+
+@dataclass
+class FilePolicy:
+    """Per-file settings: CSV header for new files and rotation limits (0 = never)."""
+    header: Optional[str] = None
+    max_bytes: int = 0
+    rotate_interval: float = 0
+
+
+class _OpenFile:
+    def __init__(self, path: str, policy: FilePolicy):
+        self.path = path
+        self.policy = policy
+        self.open()
+
+    def open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handle = open(self.path, 'a', newline='', encoding='utf-8')
+        self.size = self.handle.tell()
+        self.opened_at = time.time()
+        if self.size == 0 and self.policy.header:
+            self.write(self.policy.header)
+
+    def write(self, text: str) -> None:
+        self.handle.write(text)
+        self.size += len(text)
+
+    def due_for_rotation(self, now: float) -> bool:
+        policy = self.policy
+        return ((policy.max_bytes and self.size >= policy.max_bytes) or
+                (policy.rotate_interval and now - self.opened_at >= policy.rotate_interval))
+
+    def rotate(self, now: float) -> str:
+        """Close, rename to <path>.<timestamp> and reopen. Returns the rotated name."""
+        self.handle.close()
+        rotated = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}"
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(f"{rotated}.gz"):
+            rotated = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{suffix}"
+            suffix += 1
+        os.rename(self.path, rotated)
+        self.open()
+        return rotated
+
+
+class BackgroundWriter:
+    """Queue-fed writer thread shared by all loggers of the process."""
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._policies: Dict[str, FilePolicy] = {}
+        self._files: Dict[str, _OpenFile] = {}
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def register(self, path: str, header: Optional[List[str]] = None, max_bytes: int = 0,
+                 rotate_interval: float = 0) -> None:
+        """Set the header and rotation policy of a file (before its first write)."""
+        self._policies[os.path.abspath(path)] = FilePolicy(
+            header=csv_line(header) if header else None, max_bytes=max_bytes, rotate_interval=rotate_interval)
+
+    def write(self, path: str, text: str) -> None:
+        """Append text to path in the background."""
+        self._queue.put((_WRITE, os.path.abspath(path), text))
+
+    def write_record(self, path: str, record: logging.LogRecord, formatter: logging.Formatter) -> None:
+        """Format a log record on the writer thread and append it to path."""
+        self._queue.put((_RECORD, os.path.abspath(path), (record, formatter)))
+
+    def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> bool:
+        """Wait until everything queued so far is written. Returns False on timeout."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> None:
+        """Write everything queued, close the files and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None, None))
+        self._thread.join(timeout)
+
+    def _file(self, path: str) -> _OpenFile:
+        open_file = self._files.get(path)
+        if open_file is None:
+            open_file = _OpenFile(path, self._policies.get(path, FilePolicy()))
+            self._files[path] = open_file
+        return open_file
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._write_batch(batch):
+                break
+
+        for open_file in self._files.values():
+            open_file.handle.close()
+        self._files.clear()
+
+    def _write_batch(self, batch) -> bool:
+        """Write one batch. Returns False when the writer should stop."""
+        now = time.time()
+        touched = set()
+        waiters = []
+        running = True
+
+        for kind, path, payload in batch:
+            if kind == _FLUSH:
+                waiters.append(payload)
+                continue
+            if kind == _STOP:
+                running = False
+                continue
+            try:
+                if kind == _RECORD:
+                    record, formatter = payload
+                    text = formatter.format(record) + '\n'
+                else:
+                    text = payload
+                open_file = self._file(path)
+                if open_file.due_for_rotation(now):
+                    rotated = open_file.rotate(now)
+                    threading.Thread(target=compress_file, args=(rotated,), name="log-compress", daemon=True).start()
+                open_file.write(text)
+                touched.add(open_file)
+            except Exception as e:
+                print(f"[log_writer] Failed to write {path}: {e}", file=sys.stderr)
+
+        for open_file in touched:
+            try:
+                open_file.handle.flush()
+            except OSError as e:
+                print(f"[log_writer] Failed to flush {open_file.path}: {e}", file=sys.stderr)
+        for done in waiters:
+            done.set()
+
+        self.batches += 1
+        self.items += len(batch)
+        return running
+
+
+_log_writer: Optional[BackgroundWriter] = None
+_log_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> BackgroundWriter:
+    """The process-wide background writer, started on first use and drained at exit."""
+    global _log_writer
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = BackgroundWriter()
+            atexit.register(_log_writer.close)
+        return _log_writer
+
+
+class BackgroundLogHandler(logging.Handler):
+    """logging handler that hands records to the background writer instead of writing them."""
+
+    def __init__(self, filename: str, max_bytes: int = 0, rotate_interval: float = 0,
+                 writer: Optional[BackgroundWriter] = None):
+        super().__init__()
+        self.filename = os.path.abspath(filename)
+        self.writer = writer or get_log_writer()
+        self.writer.register(self.filename, max_bytes=max_bytes, rotate_interval=rotate_interval)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Resolve the message and traceback now: args may change before the writer formats it
+            record.message = record.getMessage()
+            record.msg, record.args = record.message, None
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+            self.writer.write_record(self.filename, record, self.formatter or logging.Formatter())
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
@@ -3,12 +3,39 @@ Trading logger with structured output and error handling.
 """
 
 import os
-import csv
 import logging
+import time
 from datetime import datetime
 import pytz
 from decimal import Decimal
 
+from helpers.log_writer import BackgroundLogHandler, LOG_MAX_BYTES, csv_line, get_log_writer
+
+TRANSACTION_HEADER = ['Timestamp', 'OrderID', 'Side', 'Quantity', 'Price', 'Status']
+
+
+class TimeZoneFormatter(logging.Formatter):
+    """Formatter with timestamps in a fixed timezone. With a datefmt, the formatted second is
+    cached, so records within the same second do not build a datetime each."""
+
+    def __init__(self, fmt=None, datefmt=None, tz=None):
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self.tz = tz
+        self._cached = (None, None, None)  # (second, datefmt, text), swapped as one tuple
+
+    def format_timestamp(self, created: float, datefmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+        second = int(created)
+        cached_second, cached_datefmt, text = self._cached
+        if cached_second != second or cached_datefmt != datefmt:
+            text = datetime.fromtimestamp(second, tz=self.tz).strftime(datefmt)
+            self._cached = (second, datefmt, text)
+        return text
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return self.format_timestamp(record.created, datefmt)
+        return datetime.fromtimestamp(record.created, tz=self.tz).isoformat()
+
 
 class TradingLogger:
     """Enhanced logging with structured output and error handling."""
@@ -16,15 +43,16 @@ class TradingLogger:
     def __init__(self, exchange: str, ticker: str, log_to_console: bool = False):
         self.exchange = exchange
         self.ticker = ticker
-        # Ensure logs directory exists at the project root
+        # Ensure logs directory exists (LOG_DIR, by default logs/ at the project root)
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-        logs_dir = os.path.join(project_root, 'logs')
+        logs_dir = os.getenv('LOG_DIR') or os.path.join(project_root, 'logs')
         os.makedirs(logs_dir, exist_ok=True)
 
         order_file_name = f"{exchange}_{ticker}_orders.csv"
         debug_log_file_name = f"{exchange}_{ticker}_activity.log"
 
         account_name = os.getenv('ACCOUNT_NAME')
+        self.account_name = account_name
         if account_name:
             order_file_name = f"{exchange}_{ticker}_{account_name}_orders.csv"
             debug_log_file_name = f"{exchange}_{ticker}_{account_name}_activity.log"
@@ -33,11 +61,21 @@ class TradingLogger:
         self.log_file = os.path.join(logs_dir, order_file_name)
         self.debug_log_file = os.path.join(logs_dir, debug_log_file_name)
         self.timezone = pytz.timezone(os.getenv('TIMEZONE', 'Asia/Shanghai'))
+        self.formatter = TimeZoneFormatter(
+            "%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+            tz=self.timezone
+        )
+        get_log_writer().register(self.log_file, header=TRANSACTION_HEADER)
         self.logger = self._setup_logger(log_to_console)
 
     def _setup_logger(self, log_to_console: bool) -> logging.Logger:
         """Setup the logger with proper configuration."""
-        logger = logging.getLogger(f"trading_bot_{self.exchange}_{self.ticker}")
+        logger_name = f"trading_bot_{self.exchange}_{self.ticker}"
+        if self.account_name:
+            # Several accounts can trade the same market in one process (fleet.py)
+            logger_name = f"{logger_name}_{self.account_name}"
+        logger = logging.getLogger(logger_name)
         logger.setLevel(logging.INFO)
 
         # Prevent propagation to root logger to avoid duplicate messages
@@ -47,25 +85,11 @@ class TradingLogger:
         if logger.handlers:
             return logger
 
-        class TimeZoneFormatter(logging.Formatter):
-            def __init__(self, fmt=None, datefmt=None, tz=None):
-                super().__init__(fmt=fmt, datefmt=datefmt)
-                self.tz = tz
-
-            def formatTime(self, record, datefmt=None):
-                dt = datetime.fromtimestamp(record.created, tz=self.tz)
-                if datefmt:
-                    return dt.strftime(datefmt)
-                return dt.isoformat()
+        # Shared by both handlers; its cached timestamp is safe to use from several threads
+        formatter = self.formatter
 
-        formatter = TimeZoneFormatter(
-            "%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-            tz=self.timezone
-        )
-
-        # File handler
-        file_handler = logging.FileHandler(self.debug_log_file)
+        # File handler: records are formatted and written by the background log writer
+        file_handler = BackgroundLogHandler(self.debug_log_file, max_bytes=LOG_MAX_BYTES)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
@@ -94,19 +118,10 @@ class TradingLogger:
             self.logger.info(formatted_message)
 
     def log_transaction(self, order_id: str, side: str, quantity: Decimal, price: Decimal, status: str):
-        """Log a transaction to CSV file."""
+        """Log a transaction to CSV file (appended by the background log writer)."""
         try:
-            timestamp = datetime.now(self.timezone).strftime("%Y-%m-%d %H:%M:%S")
-            row = [timestamp, order_id, side, quantity, price, status]
-
-            # Check if file exists to write headers
-            file_exists = os.path.isfile(self.log_file)
-
-            with open(self.log_file, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                if not file_exists:
-                    writer.writerow(['Timestamp', 'OrderID', 'Side', 'Quantity', 'Price', 'Status'])
-                writer.writerow(row)
+            timestamp = self.formatter.format_timestamp(time.time())
+            get_log_writer().write(self.log_file, csv_line([timestamp, order_id, side, quantity, price, status]))
 
         except Exception as e:
             self.log(f"Failed to log transaction: {e}", "ERROR")
@@ -0,0 +1,157 @@
+"""
+Persistent market-metadata cache.
+
+Contract ids, tick sizes, size/price decimals and multipliers rarely change, but every bot
+start used to download them again (for Lighter the whole market list and then the market's
+details). They are kept in one JSON file keyed by "<venue>:<ticker>" so a restart, or a
+fleet restart, configures its markets without a request:
+
+- entries younger than MARKET_METADATA_REFRESH (seconds, default 1h) are used as they are;
+- older entries are still used, and refreshed in the background;
+- entries older than MARKET_METADATA_TTL (seconds, default 24h) are fetched again before use.
+
+The file is <project>/.cache/market_metadata.json, or MARKET_METADATA_CACHE (a path, or
+"off" to disable the cache). Writes merge with the file's current content and replace it
+atomically, so bots sharing the file do not drop each other's entries.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+CACHE_ENV = 'MARKET_METADATA_CACHE'
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'market_metadata.json'
+DEFAULT_TTL = 24 * 3600
+DEFAULT_REFRESH_AFTER = 3600
+
+Metadata = Dict[str, Any]
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        return {'$decimal': str(value)}
+    raise TypeError(f"Cannot cache {type(value).__name__}")
+
+
+def _decode(obj):
+    if len(obj) == 1 and '$decimal' in obj:
+        return Decimal(obj['$decimal'])
+    return obj
+
+
+class MarketMetadataCache:
+    """Market metadata by "<venue>:<ticker>", persisted to `path` (memory only when None)."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 refresh_after: float = DEFAULT_REFRESH_AFTER):
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        # key -> {'fetched_at': wall-clock time, 'data': {...}}
+        self._entries: Dict[str, Dict[str, Any]] = self._read() if self.path is not None else {}
+        self._file_lock = threading.Lock()
+        self._fetch_locks: Dict[str, asyncio.Lock] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @staticmethod
+    def key(venue: str, ticker: str) -> str:
+        return f"{venue.lower()}:{ticker.upper()}"
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f, object_hook=_decode)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def lookup(self, key: str) -> Optional[Tuple[Metadata, bool]]:
+        """(data, due for refresh) for an entry within the TTL, else None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry.get('fetched_at', 0)
+        if not 0 <= age < self.ttl:
+            return None
+        return entry['data'], age >= self.refresh_after
+
+    def store(self, key: str, data: Metadata) -> None:
+        """Save an entry and persist it. A failed write only costs the next start a fetch."""
+        entry = {'fetched_at': time.time(), 'data': dict(data)}
+        self._entries[key] = entry
+        if self.path is None:
+            return
+        with self._file_lock:
+            entries = self._read()
+            entries[key] = entry
+            tmp = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, default=_encode, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+            except OSError:
+                if tmp is not None and os.path.exists(tmp):
+                    os.unlink(tmp)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Metadata]],
+                           on_refresh_error: Optional[Callable[[Exception], None]] = None) -> Tuple[Metadata, bool]:
+        """(data, from cache). Concurrent misses of one key share a single fetch; an entry due
+        for refresh is returned at once while `fetch` runs in the background."""
+        found = self.lookup(key)
+        if found is None:
+            lock = self._fetch_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                found = self.lookup(key)
+                if found is None:
+                    self.misses += 1
+                    data = await fetch()
+                    self.store(key, data)
+                    return data, False
+        data, due = found
+        self.hits += 1
+        if due and key not in self._refreshing:
+            task = asyncio.ensure_future(self._refresh(key, fetch, on_refresh_error))
+            self._refreshing[key] = task
+        return data, True
+
+    async def _refresh(self, key: str, fetch, on_refresh_error) -> None:
+        try:
+            self.store(key, await fetch())
+            self.refreshes += 1
+        except Exception as e:
+            if on_refresh_error is not None:
+                on_refresh_error(e)
+        finally:
+            self._refreshing.pop(key, None)
+
+
+_cache: Optional[MarketMetadataCache] = None
+_cache_loaded = False
+
+
+def get_metadata_cache() -> Optional[MarketMetadataCache]:
+    """The process-wide cache configured from the environment, or None when it is off."""
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        path = os.getenv(CACHE_ENV, '').strip()
+        if path.lower() not in ('off', 'none', '0', 'false'):
+            _cache = MarketMetadataCache(
+                path or DEFAULT_CACHE_PATH,
+                ttl=float(os.getenv('MARKET_METADATA_TTL', DEFAULT_TTL)),
+                refresh_after=float(os.getenv('MARKET_METADATA_REFRESH', DEFAULT_REFRESH_AFTER)))
+        _cache_loaded = True
+    return _cache
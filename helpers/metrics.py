@@ -0,0 +1,193 @@
+"""
+Latency metrics and a local Prometheus endpoint.
+
+Histograms are LatencyHistogram instances with log-spaced buckets, kept in one process-wide
+registry by name and labels. Tick-to-trade stages are recorded with a StageTrace: each mark
+observes the time since the trace started (monotonic clock), so `stage="sent"` of the hedge
+trace is "maker fill frame received -> hedge tx sent".
+
+    trace = get_metrics().trace('hedge_stage', bot='hedge_bp')   # at the fill frame
+    ...
+    trace.mark('signed')
+    trace.mark('sent')
+
+With METRICS_PORT set, the bots serve every histogram in Prometheus text format on
+http://127.0.0.1:<port>/metrics (METRICS_HOST to bind elsewhere).
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from helpers.latency import LatencyHistogram, log_buckets_ms
+
+# 10us to 60s, 10 buckets per decade (~26% relative error)
+METRIC_BUCKETS_MS = log_buckets_ms(0.01, 60000, 10)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Named, labelled latency histograms."""
+
+    def __init__(self, buckets_ms=METRIC_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._histograms: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str = '', **labels) -> LatencyHistogram:
+        """The histogram for name and labels, created on first use. Hold on to it on hot paths."""
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series is not None else None
+        if histogram is None:
+            with self._lock:
+                series = self._histograms.setdefault(name, {})
+                histogram = series.get(key)
+                if histogram is None:
+                    histogram = LatencyHistogram(name, buckets_ms=self.buckets_ms)
+                    series[key] = histogram
+                if help_text:
+                    self._help.setdefault(name, help_text)
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        self.histogram(name, **labels).record(seconds)
+
+    def trace(self, name: str, start: Optional[float] = None, **labels) -> 'StageTrace':
+        """Start a stage trace now (or at a perf_counter() value taken earlier)."""
+        return StageTrace(self, name, start, labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def summaries(self):
+        """One summary line per series, for logging at shutdown."""
+        for name, series in sorted(self._histograms.items()):
+            for key, histogram in sorted(series.items()):
+                if histogram.count:
+                    labels = ','.join(f"{k}={v}" for k, v in key)
+                    yield f"{name}{{{labels}}} {histogram.summary().split(': ', 1)[1]}"
+
+    def render(self) -> str:
+        """All histograms in Prometheus text exposition format (seconds)."""
+        lines = []
+        with self._lock:
+            items = sorted((name, sorted(series.items())) for name, series in self._histograms.items())
+        for name, series in items:
+            metric = f"{name}_seconds"
+            if name in self._help:
+                lines.append(f"# HELP {metric} {self._help[name]}")
+            lines.append(f"# TYPE {metric} histogram")
+            for key, histogram in series:
+                labels = ','.join(f'{k}="{_escape(v)}"' for k, v in key)
+                prefix = f"{labels}," if labels else ''
+                cumulative = 0
+                for bound, count in zip(histogram.buckets_ms, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{prefix}le="{bound / 1000:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+                suffix = f"{{{labels}}}" if labels else ''
+                lines.append(f"{metric}_sum{suffix} {histogram.total_ms / 1000:.9g}")
+                lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class StageTrace:
+    """Monotonic stage timestamps of one tick-to-trade path, each observed from the start."""
+
+    __slots__ = ('registry', 'name', 'labels', 'start', 'stages')
+
+    def __init__(self, registry: MetricsRegistry, name: str, start: Optional[float], labels: Dict[str, str]):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.start = time.perf_counter() if start is None else start
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, stage: str) -> Optional[float]:
+        """Record that `stage` was reached now; returns the seconds since the start. A stage is
+        recorded once, so paths that can both see a fill (ack and websocket) may both mark it."""
+        if stage in self.stages:
+            return None
+        now = time.perf_counter()
+        elapsed = now - self.start
+        self.stages[stage] = now
+        self.registry.observe(self.name, elapsed, stage=stage, **self.labels)
+        return elapsed
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """The process-wide registry."""
+    return _metrics
+
+
+def timed_request(method):
+    """Record the duration of an adapter coroutine as exchange_request{exchange, operation}."""
+    operation = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _metrics.observe('exchange_request', time.perf_counter() - start,
+                             exchange=self.get_exchange_name(), operation=operation)
+    return wrapper
+
+
+_server = None
+_server_lock = asyncio.Lock()
+
+
+async def start_metrics_server(port: int, host: str = '127.0.0.1', registry: Optional[MetricsRegistry] = None):
+    """Serve the registry on http://host:port/metrics. Once per process; later calls return the running site."""
+    global _server
+    async with _server_lock:
+        if _server is None:
+            _server = await _serve(port, host, registry or _metrics)
+    return _server
+
+
+async def _serve(port: int, host: str, registry: MetricsRegistry):
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(body=registry.render().encode(),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner
+
+
+async def start_metrics_server_from_env():
+    """Start the endpoint when METRICS_PORT is set. Returns the runner or None."""
+    port = os.getenv('METRICS_PORT')
+    if not port:
+        return None
+    return await start_metrics_server(int(port), os.getenv('METRICS_HOST', '127.0.0.1'))
+
+
+async def stop_metrics_server() -> None:
+    global _server
+    if _server is not None:
+        runner, _server = _server, None
+        await runner.cleanup()
@@ -0,0 +1,263 @@
+"""
+Sorted, incrementally maintained order book.
+"""
+
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+def multiplier_decimals(multiplier: int) -> Optional[int]:
+    """Return n for a multiplier of 10**n, or None if it is not a power of ten."""
+    digits = str(multiplier)
+    if multiplier >= 1 and digits[0] == '1' and digits.count('0') == len(digits) - 1:
+        return len(digits) - 1
+    return None
+
+
+def scale_to_int(value, decimals: int) -> int:
+    """Convert a decimal string such as "3012.45" to an integer scaled by 10**decimals.
+
+    Only string slicing and int() are used, so no Decimal/float is allocated. Digits
+    beyond `decimals` are truncated, matching int(Decimal(value) * 10**decimals).
+    """
+    if isinstance(value, int):
+        return value * 10 ** decimals
+    text = value if isinstance(value, str) else str(value)
+    if 'e' in text or 'E' in text:
+        return int(Decimal(text).scaleb(decimals))
+    whole, _, frac = text.partition('.')
+    if len(frac) < decimals:
+        frac += '0' * (decimals - len(frac))
+    return int(whole + frac[:decimals])
+
+
+class OrderBookSide:
+    """One side of an order book: a price -> size map plus a sorted price ladder.
+
+    The ladder is kept so that the best price is always the last element, which makes
+    the best level an O(1) lookup and lets the levels closest to the touch (the ones
+    that churn the most) be inserted/removed near the end of the list.
+    """
+
+    __slots__ = ('is_bid', '_levels', '_ladder')
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._levels = {}
+        # Bids are stored ascending by price, asks ascending by negated price,
+        # so that for both sides the best level sits at the end of the ladder.
+        self._ladder = []
+
+    def _key(self, price):
+        return price if self.is_bid else -price
+
+    def update(self, price, size) -> None:
+        """Set the size at a price level, removing the level when size is not positive."""
+        if size > 0:
+            if price not in self._levels:
+                key = self._key(price)
+                self._ladder.insert(bisect_left(self._ladder, key), key)
+            self._levels[price] = size
+        else:
+            self.remove(price)
+
+    def remove(self, price) -> None:
+        """Remove a price level if present."""
+        if self._levels.pop(price, None) is None:
+            return
+        key = self._key(price)
+        ladder = self._ladder
+        if ladder[-1] == key:
+            ladder.pop()
+        else:
+            del ladder[bisect_left(ladder, key)]
+
+    def clear(self) -> None:
+        """Remove all levels."""
+        self._levels.clear()
+        self._ladder.clear()
+
+    def best(self) -> Optional[Tuple[Any, Any]]:
+        """Return the best (price, size) level or None if the side is empty."""
+        if not self._ladder:
+            return None
+        price = self._key(self._ladder[-1])
+        return price, self._levels[price]
+
+    def best_price(self):
+        """Return the best price or None if the side is empty."""
+        if not self._ladder:
+            return None
+        return self._key(self._ladder[-1])
+
+    def worst_price(self):
+        """Return the price furthest from the touch or None if the side is empty."""
+        if not self._ladder:
+            return None
+        return self._key(self._ladder[0])
+
+    def top(self, depth: int) -> List[Tuple[Any, Any]]:
+        """Return up to `depth` levels, best first."""
+        if depth <= 0:
+            return []
+        levels = []
+        for key in reversed(self._ladder[-depth:]):
+            price = self._key(key)
+            levels.append((price, self._levels[price]))
+        return levels
+
+    def trim(self, max_levels: int) -> int:
+        """Drop levels beyond `max_levels` from the touch. Returns the number of removed levels."""
+        excess = len(self._ladder) - max_levels
+        if excess <= 0:
+            return 0
+        for key in self._ladder[:excess]:
+            del self._levels[self._key(key)]
+        del self._ladder[:excess]
+        return excess
+
+    def levels(self) -> Iterator[Tuple[Any, Any]]:
+        """Iterate over (price, size) levels, best first."""
+        for key in reversed(self._ladder):
+            price = self._key(key)
+            yield price, self._levels[price]
+
+    def prices(self) -> List[Any]:
+        """Return all prices, best first."""
+        return [self._key(key) for key in reversed(self._ladder)]
+
+    def items(self):
+        return self._levels.items()
+
+    def keys(self):
+        return self._levels.keys()
+
+    def get(self, price, default=None):
+        return self._levels.get(price, default)
+
+    def __getitem__(self, price):
+        return self._levels[price]
+
+    def __contains__(self, price) -> bool:
+        return price in self._levels
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __bool__(self) -> bool:
+        return bool(self._levels)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._levels)
+
+
+class OrderBook:
+    """Two-sided order book with O(log n) level updates and O(1) best bid/ask.
+
+    Prices and sizes can be any ordered numeric type (Decimal, int, float) as long as a
+    single book uses one type consistently. Sides are also reachable as book["bids"] and
+    book["asks"] so code written against the {"bids": {}, "asks": {}} layout keeps working.
+
+    When price_multiplier/size_multiplier are given the book runs in fixed-point mode:
+    use parse_price/parse_size to turn raw feed strings into integer ticks/lots and
+    price_to_decimal/size_to_decimal to get Decimal values back at the order boundary.
+    """
+
+    __slots__ = ('bids', 'asks', 'price_multiplier', 'size_multiplier', '_price_decimals', '_size_decimals')
+
+    def __init__(self, price_multiplier: Optional[int] = None, size_multiplier: Optional[int] = None):
+        self.bids = OrderBookSide(is_bid=True)
+        self.asks = OrderBookSide(is_bid=False)
+        self.price_multiplier = price_multiplier
+        self.size_multiplier = size_multiplier
+        self._price_decimals = multiplier_decimals(price_multiplier) if price_multiplier else None
+        self._size_decimals = multiplier_decimals(size_multiplier) if size_multiplier else None
+
+    @property
+    def is_fixed_point(self) -> bool:
+        return self.price_multiplier is not None and self.size_multiplier is not None
+
+    def parse_price(self, value) -> int:
+        """Convert a raw price to integer ticks (or a Decimal when no multiplier is set)."""
+        if self.price_multiplier is None:
+            return Decimal(value)
+        if self._price_decimals is not None:
+            return scale_to_int(value, self._price_decimals)
+        return int(Decimal(value) * self.price_multiplier)
+
+    def parse_size(self, value) -> int:
+        """Convert a raw size to integer lots (or a Decimal when no multiplier is set)."""
+        if self.size_multiplier is None:
+            return Decimal(value)
+        if self._size_decimals is not None:
+            return scale_to_int(value, self._size_decimals)
+        return int(Decimal(value) * self.size_multiplier)
+
+    def price_to_decimal(self, ticks: int) -> Decimal:
+        """Convert integer ticks back to a Decimal price."""
+        if self.price_multiplier is None:
+            return ticks
+        if self._price_decimals is not None:
+            return Decimal(ticks).scaleb(-self._price_decimals)
+        return Decimal(ticks) / self.price_multiplier
+
+    def size_to_decimal(self, lots: int) -> Decimal:
+        """Convert integer lots back to a Decimal size."""
+        if self.size_multiplier is None:
+            return lots
+        if self._size_decimals is not None:
+            return Decimal(lots).scaleb(-self._size_decimals)
+        return Decimal(lots) / self.size_multiplier
+
+    def level_to_decimal(self, level: Optional[Tuple[int, int]]) -> Optional[Tuple[Decimal, Decimal]]:
+        """Convert a (ticks, lots) level to (price, size) Decimals, passing None through."""
+        if level is None:
+            return None
+        return self.price_to_decimal(level[0]), self.size_to_decimal(level[1])
+
+    def __getitem__(self, side: str) -> OrderBookSide:
+        if side in ('bids', 'bid', 'buy'):
+            return self.bids
+        if side in ('asks', 'ask', 'sell'):
+            return self.asks
+        raise KeyError(side)
+
+    def update(self, side: str, price, size) -> None:
+        """Set the size at a price level on the given side."""
+        self[side].update(price, size)
+
+    def clear(self) -> None:
+        """Remove all levels from both sides."""
+        self.bids.clear()
+        self.asks.clear()
+
+    def best_bid(self) -> Optional[Tuple[Any, Any]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[Any, Any]]:
+        return self.asks.best()
+
+    def best_levels(self) -> Tuple[Optional[Tuple[Any, Any]], Optional[Tuple[Any, Any]]]:
+        """Return ((bid_price, bid_size), (ask_price, ask_size)), with None for an empty side."""
+        return self.bids.best(), self.asks.best()
+
+    def is_valid(self) -> bool:
+        """Check that every price is positive.
+
+        Sizes are always positive because non-positive updates remove the level, and the
+        lowest price of each side is at a known end of its ladder, so this is O(1).
+        """
+        lowest_bid = self.bids.worst_price()
+        if lowest_bid is not None and lowest_bid <= 0:
+            return False
+        lowest_ask = self.asks.best_price()
+        if lowest_ask is not None and lowest_ask <= 0:
+            return False
+        return True
+
+    def is_crossed(self) -> bool:
+        """Return True if the best bid is at or above the best ask."""
+        best_bid = self.bids.best_price()
+        best_ask = self.asks.best_price()
+        return best_bid is not None and best_ask is not None and best_bid >= best_ask
@@ -0,0 +1,199 @@
+"""
+Client-side request rate limiting.
+
+Each exchange client has one RateLimiter: a venue-wide token bucket ('total') plus one
+bucket per endpoint class ('order', 'cancel', 'query'). A request takes a token from its
+class bucket and from the venue bucket. When requests have to wait, they are released in
+priority order (cancels and hedges, then placements, then queries), so a burst of status
+polls cannot delay a cancel. Rate-limit responses (429/418, Retry-After, X-RateLimit-*)
+pause the limiter instead of letting the caller retry into more 429s.
+
+Limits are (requests per second, burst) and can be overridden per exchange:
+
+    RATE_LIMIT_BACKPACK="total=20/40,order=10/20,query=5/10"
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+PRIORITY_CANCEL = 0
+PRIORITY_HEDGE = 0
+PRIORITY_PLACE = 1
+PRIORITY_QUERY = 2
+
+DEFAULT_PRIORITIES = {'cancel': PRIORITY_CANCEL, 'order': PRIORITY_PLACE, 'query': PRIORITY_QUERY}
+
+# (requests per second, burst)
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    'total': (20, 40),
+    'order': (10, 20),
+    'cancel': (10, 20),
+    'query': (10, 20),
+}
+
+# Pause after a 429/418 without a Retry-After header (seconds)
+RATE_LIMITED_PAUSE = 1.0
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`."""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 if it is now)."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float('inf')
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """'total=20/40,order=10' -> {'total': (20, 40), 'order': (10, 10)}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        rate, _, burst = value.partition('/')
+        limits[name.strip()] = (float(rate), float(burst or rate))
+    return limits
+
+
+def rate_limits_for(exchange: str, defaults: Optional[Mapping[str, Tuple[float, float]]] = None):
+    """Adapter defaults updated with RATE_LIMIT_<EXCHANGE> from the environment."""
+    limits = dict(DEFAULT_RATE_LIMITS if defaults is None else defaults)
+    spec = os.getenv(f"RATE_LIMIT_{exchange.upper()}")
+    if spec:
+        limits.update(parse_rate_limits(spec))
+    return limits
+
+
+class RateLimiter:
+    """Token buckets per endpoint class with a shared venue bucket and prioritized waiters."""
+
+    def __init__(self, limits: Optional[Mapping[str, Tuple[float, float]]] = None):
+        limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+        self.total = self.buckets.get('total')
+        self.paused_until = 0.0
+        self.waits = 0
+        self.rate_limited = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _delay(self, endpoint_class: str, now: float) -> float:
+        delay = self.paused_until - now
+        bucket = self.buckets.get(endpoint_class)
+        if bucket is not None:
+            delay = max(delay, bucket.delay(now))
+        if self.total is not None:
+            delay = max(delay, self.total.delay(now))
+        return max(delay, 0.0)
+
+    def _take(self, endpoint_class: str) -> None:
+        bucket = self.buckets.get(endpoint_class)
+        if bucket is not None:
+            bucket.take()
+        if self.total is not None:
+            self.total.take()
+
+    async def acquire(self, endpoint_class: str, priority: Optional[int] = None) -> None:
+        """Wait for a request slot of `endpoint_class`."""
+        if not self._waiters and self._delay(endpoint_class, time.monotonic()) == 0:
+            self._take(endpoint_class)
+            return
+
+        if priority is None:
+            priority = DEFAULT_PRIORITIES.get(endpoint_class, PRIORITY_QUERY)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), endpoint_class, future))
+        self.waits += 1
+        self._schedule(0)
+        await future
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            if delay > 0:
+                return
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Grant waiters in priority order. A waiter held back only by its own class bucket does not
+        block lower priorities; one held back by the venue bucket or a pause blocks everyone."""
+        self._timer = None
+        now = time.monotonic()
+        blocked = []
+        next_delay = None
+        while self._waiters:
+            priority, sequence, endpoint_class, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._delay(endpoint_class, now)
+            if delay == 0:
+                heapq.heappop(self._waiters)
+                self._take(endpoint_class)
+                future.set_result(None)
+                continue
+            next_delay = delay if next_delay is None else min(next_delay, delay)
+            venue_delay = max(self.paused_until - now,
+                              self.total.delay(now) if self.total is not None else 0.0)
+            if venue_delay > 0:
+                break
+            blocked.append(heapq.heappop(self._waiters))
+        for item in blocked:
+            heapq.heappush(self._waiters, item)
+        if self._waiters and next_delay is not None:
+            self._schedule(next_delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for `seconds` (e.g. after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def observe_response(self, status: int, headers: Mapping[str, str]) -> None:
+        """Apply the venue's rate-limit signals from a REST response."""
+        retry_after = _header_seconds(headers.get('Retry-After'))
+        if status in (429, 418):
+            self.rate_limited += 1
+            self.pause(retry_after if retry_after is not None else RATE_LIMITED_PAUSE)
+            return
+        if retry_after is not None:
+            self.pause(retry_after)
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is not None and remaining.strip() in ('0', '0.0'):
+            reset = _header_seconds(headers.get('X-RateLimit-Reset'))
+            self.pause(reset if reset is not None else RATE_LIMITED_PAUSE)
+
+
+def _header_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds from a delay or an epoch timestamp (seconds or milliseconds)."""
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if seconds > 1e11:
+        seconds = seconds / 1000 - time.time()
+    elif seconds > 1e9:
+        seconds -= time.time()
+    return max(seconds, 0.0)
@@ -49,6 +49,10 @@ def parse_arguments():
                         'Sell: pause if price <= pause-price. (default: -1, no pause)')
     parser.add_argument('--boost', action='store_true',
                         help='Use the Boost mode for volume boosting')
+    parser.add_argument('--pipeline', type=int, default=0,
+                        help='Place close orders in the background, at most this many requests at a time '
+                        '(closes queued meanwhile go out in one batch request), while the next open order '
+                        'is placed (default: 0, one after the other)')
 
     return parser.parse_args()
 
@@ -116,7 +120,8 @@ async def main():
         grid_step=Decimal(args.grid_step),
         stop_price=Decimal(args.stop_price),
         pause_price=Decimal(args.pause_price),
-        boost_mode=args.boost
+        boost_mode=args.boost,
+        pipeline=args.pipeline
     )
 
     # Create and run the bot
@@ -0,0 +1,60 @@
+import os
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from exchanges.sim import SimExchangeClient
+from trading_bot import TradingConfig
+
+
+@pytest.fixture(autouse=True, scope='session')
+def log_dir(tmp_path_factory):
+    """Keep the logs of the bots and clients created by the tests out of the project's logs/."""
+    previous = os.environ.get('LOG_DIR')
+    os.environ['LOG_DIR'] = str(tmp_path_factory.mktemp('logs'))
+    yield
+    if previous is None:
+        os.environ.pop('LOG_DIR', None)
+    else:
+        os.environ['LOG_DIR'] = previous
+
+
+@pytest.fixture
+def make_config():
+    """Build a fresh sim-exchange TradingConfig; call it once per client or bot."""
+    def make():
+        return TradingConfig(ticker='ETH', contract_id='', tick_size=Decimal(0), quantity=Decimal('0.1'),
+                             take_profit=Decimal('0.02'), direction='buy', max_orders=40, wait_time=0,
+                             exchange='sim', grid_step=Decimal('-100'), stop_price=Decimal('-1'),
+                             pause_price=Decimal('-1'), boost_mode=False)
+    return make
+
+
+@pytest.fixture
+def sim_client(make_config):
+    """Connect a sim client with its synthetic market paused, as the bot does at startup.
+
+    Await it with no argument for a plain SimExchangeClient, or pass a sim client (a subclass, or
+    a TradingBot's exchange_client) to bootstrap that one instead.
+    """
+    async def start(client=None):
+        if client is None:
+            client = SimExchangeClient(make_config())
+        client.market_interval = 0
+        client.config.contract_id, client.config.tick_size = await client.get_contract_attributes()
+        await client.connect()
+        return client
+    return start
+
+
+@pytest.fixture
+def move_market():
+    """Move a sim client's mid price by a number of ticks and requote the book."""
+    def move(client, ticks):
+        client.mid_price += client.tick_size * ticks
+        client._requote()
+    return move
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from exchanges.base import BaseExchangeClient, BBOCache
+
+
+def test_stale_quote_falls_back_to_rest():
+    client = SimpleNamespace(bbo_cache=BBOCache(max_age=5))
+    rest_calls = []
+
+    async def fetch_rest(contract_id):
+        rest_calls.append(contract_id)
+        return Decimal('99'), Decimal('101')
+
+    def fetch():
+        return asyncio.run(BaseExchangeClient.get_cached_bbo_prices(client, 'ETH', fetch_rest))
+
+    # Nothing streamed yet
+    assert fetch() == (Decimal('99'), Decimal('101'))
+
+    # Crossed quotes are ignored, valid ones served from memory
+    client.bbo_cache.update('3001', '3000')
+    assert client.bbo_cache.get() is None
+    client.bbo_cache.update('3000', '3000.5')
+    assert fetch() == (Decimal('3000'), Decimal('3000.5'))
+    assert client.bbo_cache.hits == 1 and len(rest_calls) == 1
+
+    # Quote older than max_age
+    bid, ask, _ = client.bbo_cache._quote
+    client.bbo_cache._quote = (bid, ask, time.time() - 10)
+    assert fetch() == (Decimal('99'), Decimal('101'))
+    assert client.bbo_cache.rest_fallbacks == 2
+
+
+if __name__ == "__main__":
+    test_stale_quote_falls_back_to_rest()
+    print("OK")
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+from decimal import Decimal
+import pytest
+from trading_bot import TradingBot
+
+
+def test_close_orders_are_placed_in_background_with_bounded_concurrency(make_config, sim_client):
+    async def run():
+        config = make_config()
+        config.pipeline = 1
+        bot = TradingBot(config)
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        client.ack_latency = 0.05
+        prices = [client.engine.best_ask() + i for i in (1, 2, 3)]
+        batches = []
+        place_orders_batch = client.place_orders_batch
+
+        async def recording_place_orders_batch(orders):
+            batches.append([order.price for order in orders])
+            return await place_orders_batch(orders)
+        client.place_orders_batch = recording_place_orders_batch
+
+        start = time.perf_counter()
+        for price in prices:
+            assert await bot._place_close_order(Decimal('0.1'), price) is None
+            await asyncio.sleep(0)
+        assert time.perf_counter() - start < 0.04 and len(bot.pending_close_orders) == 3
+
+        # Closes on their way count as active close orders
+        await bot._update_active_close_orders()
+        assert set(prices) <= {order['price'] for order in bot.active_close_orders}
+
+        # The first goes out alone, the two queued behind it together in one batch request
+        await asyncio.wait(list(bot.close_order_tasks))
+        assert not bot.pending_close_orders and not bot.close_order_tasks
+        assert batches == [prices[1:]]
+        assert sorted(order.price for order in await client.get_active_orders(client.config.contract_id)) == prices
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_acked_close_orders_are_counted_once(make_config, sim_client):
+    async def run():
+        config = make_config()
+        config.pipeline = 2
+        bot = TradingBot(config)
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        client.ack_latency = 0.05
+        bot.config.wait_time = 60
+        prices = [client.engine.best_ask() + i for i in (1, 2)]
+        for price in prices:
+            await bot._place_close_order(Decimal('0.1'), price)
+        bot.last_open_order_time = time.time()
+
+        # The websocket update arrives before the placement returns
+        await asyncio.sleep(0.01)
+        await bot._update_active_close_orders()
+        assert len(bot.pending_close_orders) == 2 and len(bot.active_close_orders) == 2
+        assert bot._calculate_wait_time() == 1
+
+        # Placement returning is not a close order being filled, the cooldown still applies
+        await asyncio.wait(list(bot.close_order_tasks))
+        await bot._update_active_close_orders()
+        assert len(bot.active_close_orders) == 2
+        assert bot._calculate_wait_time() == 1
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_sequential_mode_returns_the_close_result(make_config, sim_client):
+    async def run():
+        config = make_config()
+        config.pipeline = 0
+        bot = TradingBot(config)
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        result = await bot._place_close_order(Decimal('0.1'), client.engine.best_ask() + 1)
+        assert result.success and not bot.pending_close_orders
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import os
+from decimal import Decimal
+from exchanges.base import BaseExchangeClient, BBOCache, RequestCoalescer
+from fleet import FleetHost, bot_environment, parse_fleet
+
+
+class FakeClient:
+    use_shared_market_data = BaseExchangeClient.use_shared_market_data
+    use_shared_requests = BaseExchangeClient.use_shared_requests
+    request_coalescer = BaseExchangeClient.request_coalescer
+
+    def __init__(self):
+        self.bbo_cache = BBOCache()
+        self.market_data_owner = True
+
+
+def test_parse_fleet_applies_defaults_and_env(tmp_path):
+    (tmp_path / "account2.env").write_text("ASTER_API_KEY=key2\nACCOUNT_NAME=first\n")
+    fleet = {
+        "defaults": {"quantity": "0.5"},
+        "bots": [
+            {"exchange": "aster", "ticker": "eth"},
+            {"name": "short", "exchange": "aster", "ticker": "ETH", "direction": "sell",
+             "env_file": "account2.env", "env": {"ACCOUNT_NAME": "account2"}},
+        ]
+    }
+    first, second = parse_fleet(fleet, tmp_path)
+
+    assert first.name == "aster_ETH_0" and first.config.quantity == Decimal("0.5")
+    assert first.config.max_orders == 40 and first.env == {}
+    assert second.config.direction == "sell"
+    assert second.env == {"ASTER_API_KEY": "key2", "ACCOUNT_NAME": "account2"}
+
+
+def test_bot_environment_is_restored():
+    os.environ.pop("FLEET_TEST_VAR", None)
+    os.environ["FLEET_TEST_KEEP"] = "old"
+    with bot_environment({"FLEET_TEST_VAR": "1", "FLEET_TEST_KEEP": "new"}):
+        assert os.environ["FLEET_TEST_VAR"] == "1" and os.environ["FLEET_TEST_KEEP"] == "new"
+    assert "FLEET_TEST_VAR" not in os.environ and os.environ["FLEET_TEST_KEEP"] == "old"
+
+
+def test_market_data_shared_per_market():
+    specs = parse_fleet({"bots": [{"name": "a", "exchange": "aster", "ticker": "ETH"},
+                                  {"name": "b", "exchange": "aster", "ticker": "ETH"},
+                                  {"name": "c", "exchange": "aster", "ticker": "BTC"}]}, Path("."))
+    host = FleetHost(specs)
+    clients = {spec.name: FakeClient() for spec in specs}
+    for spec in specs:
+        host._share_market_data(spec, clients[spec.name])
+
+    assert clients["a"].market_data_owner and clients["c"].market_data_owner
+    assert not clients["b"].market_data_owner
+    assert clients["b"].bbo_cache is clients["a"].bbo_cache
+
+    # Restarted owner keeps streaming into the cache the others read
+    restarted = FakeClient()
+    host._share_market_data(specs[0], restarted)
+    assert restarted.market_data_owner and restarted.bbo_cache is clients["a"].bbo_cache
+
+
+def test_requests_shared_per_account():
+    specs = parse_fleet({"bots": [{"name": "a", "exchange": "aster", "ticker": "ETH"},
+                                  {"name": "b", "exchange": "aster", "ticker": "BTC"},
+                                  {"name": "c", "exchange": "aster", "ticker": "ETH",
+                                   "env": {"ASTER_API_KEY": "key2"}}]}, Path("."))
+    host = FleetHost(specs)
+    clients = {spec.name: FakeClient() for spec in specs}
+    for spec in specs:
+        host._share_requests(spec, clients[spec.name])
+
+    assert isinstance(clients["a"].request_coalescer, RequestCoalescer)
+    assert clients["b"].request_coalescer is clients["a"].request_coalescer
+    assert clients["c"].request_coalescer is not clients["a"].request_coalescer
+
+
+def test_bots_on_one_market_log_separately():
+    specs = parse_fleet({"bots": [{"name": "sim-eth", "exchange": "sim", "ticker": "ETH"},
+                                  {"name": "sim-eth-2", "exchange": "sim", "ticker": "ETH"}]}, Path("."))
+    host = FleetHost(specs)
+    first, second = (host.create_bot(spec) for spec in specs)
+    assert first.logger.log_file != second.logger.log_file
+    assert first.logger.logger is not second.logger.logger
+
+    try:
+        parse_fleet({"bots": [{"name": "a", "exchange": "sim", "ticker": "ETH", "env": {"ACCOUNT_NAME": "main"}},
+                              {"name": "b", "exchange": "sim", "ticker": "ETH", "env": {"ACCOUNT_NAME": "main"}}]},
+                    Path("."))
+    except ValueError as e:
+        assert "sim/ETH/main" in str(e)
+    else:
+        raise AssertionError("same ACCOUNT_NAME on one market accepted")
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_parse_fleet_applies_defaults_and_env(Path(tmp))
+    test_bot_environment_is_restored()
+    test_market_data_shared_per_market()
+    test_requests_shared_per_account()
+    test_bots_on_one_market_log_separately()
+    print("OK")
@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+from helpers.http_session import HttpSessionHolder
+
+
+def test_session_reused_until_closed():
+    async def run():
+        holder = HttpSessionHolder(limit_per_host=4)
+        session = holder.get()
+        assert holder.get() is session
+        assert session.connector.limit_per_host == 4
+
+        await holder.close()
+        assert session.closed
+        reopened = holder.get()
+        assert reopened is not session and not reopened.closed
+        await holder.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_session_reused_until_closed()
+    print("OK")
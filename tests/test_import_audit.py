@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.import_audit import audit, import_times
+
+
+def test_entry_points_import_no_venue_sdk_or_notifier():
+    startup = {name for _, _, _, name in import_times('pass')[0]}
+    for module in ('runbot', 'hedge_mode'):
+        result = audit(module, startup)
+        assert 'error' not in result, result
+        assert result['unexpected_sdks'] == []
+        imported = {name for _, name in result['slowest']}
+        # Notifier clients are imported when a notification is sent
+        assert 'aiohttp' not in imported and 'requests' not in imported
+
+
+if __name__ == "__main__":
+    test_entry_points_import_no_venue_sdk_or_notifier()
+    print("OK")
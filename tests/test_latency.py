@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from helpers.latency import LatencyHistogram
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram("test", buckets_ms=(1, 10, 100))
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == "test: no samples"
+
+    for seconds in (0.0005, 0.0008, 0.005, 0.05, 0.2):
+        histogram.record(seconds)
+
+    assert histogram.count == 5
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.percentile(40) == 1
+    assert histogram.percentile(60) == 10
+    assert histogram.percentile(100) == 200.0
+    assert histogram.min_ms == 0.5 and histogram.max_ms == 200.0
+
+    histogram.reset()
+    assert histogram.count == 0 and histogram.counts == [0, 0, 0, 0]
+
+
+if __name__ == "__main__":
+    test_histogram_percentiles()
+    print("OK")
@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import threading
+from decimal import Decimal
+from unittest.mock import MagicMock
+from exchanges.lighter_presign import LighterHedgeDispatch, LighterPresignCache
+
+
+def make_client():
+    client = MagicMock()
+    client.nonce_manager.next_nonce.side_effect = [(0, 10), (0, 11), (0, 12)]
+    client.sign_create_order.side_effect = lambda **kwargs: (dict(kwargs), None)
+    return client
+
+
+def test_presigned_order_reused_until_bbo_moves():
+    client = make_client()
+    cache = LighterPresignCache(client, market_index=1, base_amount_multiplier=10000, price_multiplier=100)
+
+    assert cache.refresh('sell', Decimal('0.1'), Decimal('3000'), Decimal('3000.1'))
+    assert cache.refresh('buy', Decimal('0.1'), Decimal('3000'), Decimal('3000.1'))
+    # Both sides share the reserved nonce, and an unchanged BBO does not re-sign
+    assert not cache.refresh('sell', Decimal('0.1'), Decimal('3000.5'), Decimal('3000.6'))
+    assert client.sign_create_order.call_count == 2
+
+    order = cache.take('sell', Decimal('0.1'), Decimal('3000.5'), Decimal('3000.6'))
+    assert cache.hits == 1 and client.sign_create_order.call_count == 2
+    assert order.is_ask and order.nonce == 10
+    assert order.tx_info['price'] == int(Decimal('3000') * Decimal('0.998') * 100)
+    assert order.tx_info['base_amount'] == 1000
+
+    # Once sent, the next order uses the next nonce
+    cache.mark_sent(True)
+    assert cache.refresh('buy', Decimal('0.1'), Decimal('3000'), Decimal('3000.1'))
+    assert client.sign_create_order.call_args.kwargs['nonce'] == 11
+
+
+def test_stale_or_resized_order_is_signed_live():
+    client = make_client()
+    cache = LighterPresignCache(client, market_index=1, base_amount_multiplier=10000, price_multiplier=100)
+    cache.refresh('sell', Decimal('0.1'), Decimal('3000'), Decimal('3000.1'))
+
+    # Bid moved by more than the refresh band
+    order = cache.take('sell', Decimal('0.1'), Decimal('2990'), Decimal('2990.1'))
+    assert cache.misses == 1 and order.reference_price == Decimal('2990')
+    # Unsent reservation is reused for the live signature
+    assert order.nonce == 10
+
+    cache.mark_sent(False)
+    client.nonce_manager.hard_refresh_nonce.assert_called_once_with(0)
+
+    order = cache.take('buy', Decimal('0.25'), Decimal('3000'), Decimal('3000.1'))
+    assert not order.is_ask and order.tx_info['base_amount'] == 2500 and order.nonce == 11
+
+
+class DispatchBot(LighterHedgeDispatch):
+    HEDGE_BOT = 'hedge_test'
+
+    def __init__(self):
+        self.ticker = 'ETH'
+        self.stop_flag = False
+        self.loop = None
+        self.lighter_hedge_task = None
+        self.lighter_hedge_started = asyncio.Event()
+        self.maker_fill_time = None
+        self.hedge_trace = None
+        self.current_lighter_side = 'sell'
+        self.current_lighter_quantity = Decimal('0.1')
+        self.current_lighter_price = Decimal('3000')
+        self.hedges = []
+
+    async def place_lighter_market_order(self, side, quantity, price):
+        self.hedges.append((side, quantity, price))
+
+
+def test_hedge_dispatch_starts_once_per_step_from_any_thread():
+    async def run():
+        bot = DispatchBot()
+        bot.loop = asyncio.get_running_loop()
+
+        # A fill seen on a websocket thread hands the hedge to the loop
+        thread = threading.Thread(target=bot.trigger_lighter_hedge)
+        thread.start()
+        thread.join()
+        bot.trigger_lighter_hedge()
+        assert await bot.wait_for_lighter_hedge(timeout=5)
+        assert bot.hedges == [('sell', Decimal('0.1'), Decimal('3000'))]
+
+        bot.reset_lighter_hedge()
+        bot.current_lighter_side = 'buy'
+        bot.trigger_lighter_hedge()
+        assert await bot.wait_for_lighter_hedge(timeout=5)
+        assert [side for side, _, _ in bot.hedges] == ['sell', 'buy']
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_presigned_order_reused_until_bbo_moves()
+    test_stale_or_resized_order_is_signed_live()
+    test_hedge_dispatch_starts_once_per_step_from_any_thread()
+    print("OK")
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+
+
+def make_manager(**kwargs):
+    config = SimpleNamespace(contract_id=1, account_index=7, lighter_client=None,
+                             price_multiplier=100, base_amount_multiplier=10000)
+    return LighterCustomWebSocketManager(config, **kwargs)
+
+
+def test_fill_waiter_and_callback():
+    async def run():
+        fills = []
+        manager = make_manager(fill_callback=fills.append)
+
+        # Registered before the fill arrives, so a fast fill is not missed
+        manager.expect_fill(42)
+        manager.handle_order_update([
+            {"client_order_id": 41, "status": "open"},
+            {"client_order_id": 42, "status": "filled", "filled_base_amount": "0.1"},
+        ])
+        order = await manager.wait_for_fill(42, timeout=1)
+        assert order["filled_base_amount"] == "0.1"
+        assert [fill["client_order_id"] for fill in fills] == [42]
+
+        # Unknown orders time out without leaving a waiter behind
+        assert await manager.wait_for_fill(43, timeout=0.01) is None
+        assert 43 not in manager._fill_waiters
+
+    asyncio.run(run())
+
+
+def test_bbo_event_fires_on_top_of_book_change():
+    async def run():
+        manager = make_manager()
+        manager.update_order_book("bids", [{"price": "100.00", "size": "1"}])
+        manager.update_order_book("asks", [{"price": "100.10", "size": "1"}])
+
+        waiter = asyncio.ensure_future(manager.wait_for_bbo(timeout=1))
+        await asyncio.sleep(0)
+        manager._notify_bbo()
+        assert await waiter
+
+        # A level away from the touch does not wake BBO waiters
+        manager.update_order_book("bids", [{"price": "99.00", "size": "1"}])
+        waiter = asyncio.ensure_future(manager.wait_for_bbo(timeout=0.05))
+        await asyncio.sleep(0)
+        manager._notify_bbo()
+        assert not await waiter
+
+        assert manager.get_top_levels() == ((Decimal("100.00"), Decimal("1")), (Decimal("100.10"), Decimal("1")))
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_fill_waiter_and_callback()
+    test_bbo_event_fires_on_top_of_book_change()
+    print("OK")
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import gzip
+import logging
+import time
+import pytz
+from helpers.log_writer import BackgroundLogHandler, BackgroundWriter, csv_line
+from helpers.logger import TimeZoneFormatter
+
+
+def wait_for(predicate, timeout=2):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_csv_header_and_size_rotation(tmp_path):
+    writer = BackgroundWriter()
+    path = tmp_path / 'trades.csv'
+    writer.register(str(path), header=['side', 'price'], max_bytes=40)
+    for i in range(6):
+        writer.write(str(path), csv_line(['buy', f'300{i}.5']))
+    assert writer.flush()
+
+    rotated = sorted(tmp_path.glob('trades.csv.*'))
+    assert rotated
+    # Every file, current and rotated, starts with the header
+    assert path.read_bytes().startswith(b'side,price\r\n')
+    assert wait_for(lambda: all(p.suffix == '.gz' for p in tmp_path.glob('trades.csv.*')))
+    rows = []
+    for rotated_path in sorted(tmp_path.glob('trades.csv.*.gz')):
+        with gzip.open(rotated_path, 'rt', newline='') as f:
+            rows += f.read().splitlines()[1:]
+    rows += path.read_text().splitlines()[1:]
+    assert rows == [f'buy,300{i}.5' for i in range(6)]
+    writer.close()
+
+
+def test_log_handler_formats_in_background(tmp_path):
+    writer = BackgroundWriter()
+    logger = logging.getLogger('test_log_writer')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = BackgroundLogHandler(str(tmp_path / 'activity.log'), writer=writer)
+    formatter = TimeZoneFormatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S",
+                                  tz=pytz.UTC)
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+    values = [1]
+    logger.info("fill %s", values)
+    values.append(2)  # mutated after the call: the record keeps the message it was logged with
+    logger.removeHandler(handler)
+    handler.close()
+
+    line = (tmp_path / 'activity.log').read_text()
+    assert line.endswith(" - INFO - fill [1]\n")
+    assert formatter.format_timestamp(0) == '1970-01-01 00:00:00'
+    writer.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        test_csv_header_and_size_rotation(Path(directory))
+    with tempfile.TemporaryDirectory() as directory:
+        test_log_handler_formats_in_background(Path(directory))
+    print("OK")
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+from helpers.market_data import MarketDataRecorder, MarketDataReplayer, read_frames
+
+
+def book_frame(kind, offset, bids, asks):
+    return json.dumps({"type": kind, "order_book": {
+        "code": 0, "offset": offset,
+        "bids": [{"price": price, "size": size} for price, size in bids],
+        "asks": [{"price": price, "size": size} for price, size in asks]}})
+
+
+def test_recorder_rotates_and_survives_truncated_chunk(tmp_path):
+    recorder = MarketDataRecorder(tmp_path, 'lighter-1', chunk_frames=2)
+    for i in range(5):
+        recorder.record(f'{{"n": {i}}}', received_at=1000.0 + i)
+    recorder.record({"n": 5}, received_at=1005.0)
+    recorder.close()
+    assert len(recorder.chunks) == 3
+
+    # Crash mid-write: the last chunk loses its tail
+    last = recorder.chunks[-1]
+    last.write_bytes(last.read_bytes()[:-12])
+
+    frames = list(read_frames([tmp_path], source='lighter-1'))
+    assert [json.loads(frame)["n"] for _, frame in frames[:4]] == [0, 1, 2, 3]
+    assert frames[0][0] == 1000.0
+    assert list(read_frames([tmp_path], source='backpack-ETH')) == []
+
+
+def test_replay_reproduces_sequence_gap(tmp_path):
+    recorder = MarketDataRecorder(tmp_path, 'lighter-1')
+    recorder.record(book_frame("subscribed/order_book", 10, [("100.00", "1")], [("100.10", "1")]), 1000.0)
+    recorder.record(book_frame("update/order_book", 11, [("100.05", "2")], []), 1000.5)
+    recorder.record(book_frame("update/order_book", 13, [], [("100.20", "1")]), 1001.0)
+    recorder.close()
+
+    async def run():
+        config = SimpleNamespace(contract_id=1, account_index=7, lighter_client=None,
+                                 price_multiplier=100, base_amount_multiplier=10000)
+        manager = LighterCustomWebSocketManager(config, recorder=None)
+        results = []
+
+        async def handler(frame):
+            results.append(await manager.handle_message(frame))
+
+        # 10x speed: 1s of recorded traffic in ~0.1s
+        replayer = MarketDataReplayer([tmp_path], speed=10)
+        started = asyncio.get_running_loop().time()
+        assert await replayer.replay(handler) == 3
+        assert asyncio.get_running_loop().time() - started >= 0.09
+
+        assert results == [True, True, False]
+        assert manager.order_book_sequence_gap
+        assert manager.order_book.price_to_decimal(manager.order_book.bids.best_price()) == Decimal('100.05')
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        test_recorder_rotates_and_survives_truncated_chunk(Path(directory))
+    with tempfile.TemporaryDirectory() as directory:
+        test_replay_reproduces_sequence_gap(Path(directory))
+    print("OK")
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import json
+from exchanges.messages import BookDelta, OrderUpdate
+from helpers.json_codec import JSONDecodeError, loads
+
+
+def test_loads_accepts_str_and_bytes():
+    frame = '{"type": "update/order_book", "order_book": {"offset": 7, "bids": [], "asks": []}}'
+    assert loads(frame) == loads(frame.encode()) == json.loads(frame)
+    try:
+        loads('{"type": ')
+    except JSONDecodeError:
+        pass
+    else:
+        raise AssertionError("truncated frame decoded")
+
+
+def test_book_delta_from_lighter_and_backpack():
+    delta = BookDelta.from_lighter(loads(json.dumps({
+        "type": "subscribed/order_book",
+        "order_book": {"offset": 3, "bids": [{"price": "3000.00", "size": "1.5"}], "asks": []}})))
+    assert delta.snapshot and delta.offset == 3
+    assert delta.bids == [("3000.00", "1.5")] and delta.asks == []
+
+    delta = BookDelta.from_backpack({"stream": "depth.ETH_USDC_PERP",
+                                     "data": {"b": [["2999.9", "0"]], "a": [["3000.1", "2"]], "u": 11}})
+    assert not delta.snapshot and delta.offset == 11
+    assert delta.bids == [["2999.9", "0"]] and delta.asks == [["3000.1", "2"]]
+
+
+def test_order_update_fields():
+    update = OrderUpdate.from_backpack({'e': 'orderFill', 'i': '42', 's': 'ETH_USDC_PERP', 'S': 'Bid',
+                                        'X': 'Filled', 'q': '0.1', 'p': '3000', 'z': '0.1'})
+    assert (update.order_id, update.side, update.filled_size, update.event) == ('42', 'Bid', '0.1', 'orderFill')
+
+    update = OrderUpdate.from_aster({'e': 'ORDER_TRADE_UPDATE', 'o': {'i': 7, 's': 'ETHUSDT', 'S': 'SELL',
+                                                                      'X': 'NEW', 'q': '0.2', 'p': '3001'}})
+    assert (update.order_id, update.status, update.size, update.filled_size) == (7, 'NEW', '0.2', '0')
+
+
+if __name__ == "__main__":
+    test_loads_accepts_str_and_bytes()
+    test_book_delta_from_lighter_and_backpack()
+    test_order_update_fields()
+    print("OK")
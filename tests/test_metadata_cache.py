@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import tempfile
+import time
+from decimal import Decimal
+import pytest
+from exchanges.sim import SimExchangeClient
+from helpers.metadata_cache import MarketMetadataCache
+
+
+class MetadataSimClient(SimExchangeClient):
+    METADATA_ATTRIBUTES = ('min_quantity',)
+    fetches = 0
+
+    async def get_contract_attributes(self):
+        MetadataSimClient.fetches += 1
+        await asyncio.sleep(0.01)
+        self.min_quantity = Decimal('0.01')
+        return await super().get_contract_attributes()
+
+
+def test_entries_persist_with_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'metadata.json'
+        cache = MarketMetadataCache(path, ttl=60, refresh_after=30)
+        key = cache.key('lighter', 'eth')
+        cache.store(key, {'contract_id': 1, 'tick_size': Decimal('0.01'), 'price_multiplier': 100})
+
+        reloaded = MarketMetadataCache(path, ttl=60, refresh_after=30)
+        assert reloaded.lookup('lighter:ETH') == ({'contract_id': 1, 'tick_size': Decimal('0.01'),
+                                                   'price_multiplier': 100}, False)
+        reloaded._entries[key]['fetched_at'] = time.time() - 45
+        assert reloaded.lookup(key)[1] is True
+        reloaded._entries[key]['fetched_at'] = time.time() - 90
+        assert reloaded.lookup(key) is None
+
+
+def test_restart_configures_clients_from_cache(make_config):
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'metadata.json'
+            MetadataSimClient.fetches = 0
+
+            # A fleet of clients on one market downloads the metadata once
+            cache = MarketMetadataCache(path)
+            clients = [MetadataSimClient(make_config()) for _ in range(3)]
+            for client in clients:
+                client.use_metadata_cache(cache)
+            results = await asyncio.gather(*(client.get_contract_attributes() for client in clients))
+            assert MetadataSimClient.fetches == 1
+            assert results == [('ETH-SIM', Decimal('0.01'))] * 3
+            assert all(client.min_quantity == Decimal('0.01') for client in clients)
+
+            # After a restart the client is configured without a request, and still validated
+            restarted = MetadataSimClient(make_config())
+            restarted.use_metadata_cache(MarketMetadataCache(path))
+            assert await restarted.get_contract_attributes() == ('ETH-SIM', Decimal('0.01'))
+            assert restarted.config.tick_size == Decimal('0.01') and MetadataSimClient.fetches == 1
+
+            small = MetadataSimClient(make_config())
+            small.config.quantity = Decimal('0.001')
+            small.use_metadata_cache(MarketMetadataCache(path))
+            try:
+                await small.get_contract_attributes()
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("min quantity not checked")
+
+    asyncio.run(run())
+
+
+def test_stale_entry_refreshes_in_background(make_config):
+    async def run():
+        cache = MarketMetadataCache(None, refresh_after=0)
+        client = MetadataSimClient(make_config())
+        client.use_metadata_cache(cache)
+        MetadataSimClient.fetches = 0
+        await client.get_contract_attributes()
+        # Served from the cache at once; the refresh runs behind it
+        await client.get_contract_attributes()
+        assert (cache.misses, cache.hits) == (1, 1)
+        await asyncio.sleep(0.05)
+        assert MetadataSimClient.fetches == 2 and cache.refreshes == 1
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import socket
+from decimal import Decimal
+import aiohttp
+import pytest
+from helpers.latency import log_buckets_ms
+from helpers.metrics import MetricsRegistry, get_metrics, start_metrics_server, stop_metrics_server
+
+
+def test_log_buckets_and_prometheus_text():
+    assert log_buckets_ms(1, 100, 2) == (1.0, 3.16, 10.0, 31.6, 100.0)
+
+    registry = MetricsRegistry(buckets_ms=(1, 10))
+    registry.observe('exchange_request', 0.0005, exchange='sim', operation='place_open_order')
+    registry.observe('exchange_request', 0.02, exchange='sim', operation='place_open_order')
+    text = registry.render()
+    assert '# TYPE exchange_request_seconds histogram' in text
+    labels = 'exchange="sim",operation="place_open_order"'
+    assert f'exchange_request_seconds_bucket{{{labels},le="0.001"}} 1' in text
+    assert f'exchange_request_seconds_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'exchange_request_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'exchange_request_seconds_count{{{labels}}} 2' in text
+
+
+def test_trace_marks_each_stage_once():
+    registry = MetricsRegistry()
+    trace = registry.trace('tick_to_trade', exchange='sim')
+    assert trace.mark('filled') is not None
+    assert trace.mark('filled') is None
+    assert registry.histogram('tick_to_trade', exchange='sim', stage='filled').count == 1
+
+
+def test_adapter_requests_are_timed_and_served(sim_client):
+    async def run():
+        client = await sim_client()
+        result = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        await client.cancel_order(result.order_id)
+        await client.disconnect()
+
+        timed = get_metrics().histogram('exchange_request', exchange='sim', operation='cancel_order')
+        assert timed.count >= 1
+
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        await start_metrics_server(port)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f'http://127.0.0.1:{port}/metrics') as response:
+                    assert response.status == 200
+                    text = await response.text()
+        finally:
+            await stop_metrics_server()
+        assert 'exchange_request_seconds_count{exchange="sim",operation="place_open_order"}' in text
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
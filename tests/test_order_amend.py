@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+from decimal import Decimal
+import pytest
+from exchanges.base import BaseExchangeClient
+from exchanges.sim import SimExchangeClient
+from helpers.rate_limit import TokenBucket
+from trading_bot import TradingBot
+
+
+class CancelReplaceSimClient(SimExchangeClient):
+    NATIVE_AMEND = False
+    amend_order = BaseExchangeClient.amend_order
+
+
+def test_native_amend_keeps_order_in_one_request(sim_client, move_market):
+    async def run():
+        client = await sim_client()
+        client.rate_limiter.buckets['order'] = TokenBucket(rate=0, burst=10)
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        move_market(client, 10)
+
+        price = await client.get_order_price('buy')
+        amended = await client.amend_order(placed.order_id, client.config.contract_id, Decimal('0.1'), price, 'buy')
+        assert amended.success and amended.order_id == placed.order_id and amended.price == price
+        assert client.engine.orders[placed.order_id].price == price
+        assert client.rate_limiter.buckets['order'].tokens == 10 - 2
+        assert (client.orders_placed, client.orders_canceled, client.orders_amended) == (1, 0, 1)
+
+        # A post-only amend through the book is rejected and leaves the order alone
+        crossing = await client.amend_order(placed.order_id, client.config.contract_id, Decimal('0.1'),
+                                            client.engine.best_ask(), 'buy')
+        assert not crossing.success and client.engine.orders[placed.order_id].price == price
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_default_amend_cancels_and_places(make_config, sim_client, move_market):
+    async def run():
+        client = await sim_client(CancelReplaceSimClient(make_config()))
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        move_market(client, 10)
+
+        price = await client.get_order_price('buy')
+        amended = await client.amend_order(placed.order_id, client.config.contract_id, Decimal('0.1'), price, 'buy')
+        assert amended.success and amended.order_id != placed.order_id and amended.price == price
+        assert placed.order_id not in client.engine.orders
+        assert (client.orders_placed, client.orders_canceled) == (2, 1)
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_bot_requotes_with_amend_only_when_native(make_config, sim_client, move_market):
+    async def run():
+        bot = TradingBot(make_config())
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        move_market(client, 10)
+        price = await client.get_order_price('buy')
+
+        # A partly filled order is cancelled so its fill gets a close order first
+        assert await bot._requote_open_order(placed, price, Decimal('0.05')) is None
+        amended = await bot._requote_open_order(placed, price, Decimal(0))
+        assert amended.order_id == placed.order_id and client.engine.orders[placed.order_id].price == price
+
+        client.NATIVE_AMEND = False
+        assert await bot._requote_open_order(amended, price, Decimal(0)) is None
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_partial_fill_after_amend_is_closed_from_the_amended_price(make_config, sim_client, move_market):
+    async def run():
+        bot = TradingBot(make_config())
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        monitor = asyncio.create_task(bot._handle_order_result(placed))
+        await asyncio.sleep(0.01)
+
+        move_market(client, 10)
+        while client.orders_amended == 0:
+            await asyncio.sleep(0.001)
+        amended_price = client.engine.orders[placed.order_id].price
+        assert amended_price != placed.price
+
+        # Partly filled, then the market moves away again: cancelled and the fill closed
+        client.engine.submit_market('sell', Decimal('0.05'))
+        await asyncio.sleep(0.01)
+        move_market(client, 10)
+        assert await asyncio.wait_for(monitor, timeout=2) is True
+
+        closes = [order for order in await client.get_active_orders(client.config.contract_id) if order.side == 'sell']
+        assert len(closes) == 1 and closes[0].size == Decimal('0.05')
+        assert closes[0].price == client.round_to_tick(amended_price * (1 + Decimal('0.02') / 100))
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
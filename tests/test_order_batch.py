@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+from decimal import Decimal
+import pytest
+from exchanges.base import BaseExchangeClient, CloseOrderRequest
+from exchanges.sim import SimExchangeClient
+from helpers.rate_limit import TokenBucket
+
+
+class FallbackBatchSimClient(SimExchangeClient):
+    async def place_orders_batch(self, orders):
+        # Like LighterClient without a nonce manager: falls back to the concurrent default
+        return await BaseExchangeClient.place_orders_batch(self, orders)
+
+
+def close_orders(client, count):
+    best_ask = client.engine.best_ask()
+    return [CloseOrderRequest(client.config.contract_id, Decimal('0.1'), best_ask + i * client.tick_size, 'sell')
+            for i in range(1, count + 1)]
+
+
+def test_native_batch_is_one_request(sim_client):
+    async def run():
+        client = await sim_client()
+        limiter = client.rate_limiter
+        limiter.buckets['order'] = TokenBucket(rate=0, burst=10)
+        limiter.buckets['cancel'] = TokenBucket(rate=0, burst=10)
+
+        results = await client.place_orders_batch(close_orders(client, 3))
+        assert [result.success for result in results] == [True] * 3
+        assert limiter.buckets['order'].tokens == 10 - 1
+
+        order_ids = [result.order_id for result in results] + ['missing']
+        cancels = await client.cancel_orders_batch(order_ids)
+        assert [result.success for result in cancels] == [True, True, True, False]
+        assert limiter.buckets['cancel'].tokens == 10 - 1 and client.orders_canceled == 3
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_default_batch_places_concurrently(sim_client):
+    async def run():
+        client = await sim_client()
+        client.ack_latency = 0.05
+        orders = close_orders(client, 4)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        # The BaseExchangeClient fallback used by adapters without a batch endpoint
+        results = await BaseExchangeClient.place_orders_batch(client, orders)
+        assert loop.time() - start < 0.15
+        assert [result.price for result in results] == [order.price for order in orders]
+
+        cancels = await BaseExchangeClient.cancel_orders_batch(client, [result.order_id for result in results])
+        assert all(result.success for result in cancels)
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_batch_fallback_pays_for_each_order(make_config, sim_client):
+    async def run():
+        client = await sim_client(FallbackBatchSimClient(make_config()))
+        client.rate_limiter.buckets['order'] = TokenBucket(rate=0, burst=10)
+        results = await client.place_orders_batch(close_orders(client, 3))
+        assert all(result.success for result in results)
+        # The batch call's own slot plus one per order actually sent
+        assert client.rate_limiter.buckets['order'].tokens == 10 - 4
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
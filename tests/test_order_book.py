@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from decimal import Decimal
+from helpers.order_book import OrderBook, scale_to_int
+
+
+def test_best_levels_follow_updates():
+    book = OrderBook()
+    for price in ('100.1', '100.3', '100.2'):
+        book.update('bids', Decimal(price), Decimal('1'))
+    for price in ('100.6', '100.4', '100.5'):
+        book.update('asks', Decimal(price), Decimal('2'))
+
+    assert book.best_levels() == ((Decimal('100.3'), Decimal('1')), (Decimal('100.4'), Decimal('2')))
+
+    # Zero size removes the level and exposes the next one
+    book.update('bids', Decimal('100.3'), Decimal('0'))
+    book.update('asks', Decimal('100.4'), Decimal('0'))
+    assert book.bids.best_price() == Decimal('100.2')
+    assert book.asks.best_price() == Decimal('100.5')
+
+    # Removing an unknown level is a no-op
+    book.asks.remove(Decimal('999'))
+    assert len(book.asks) == 2
+
+
+def test_trim_and_validity():
+    book = OrderBook()
+    for i in range(1, 11):
+        book.bids.update(i, 1)
+        book.asks.update(10 + i, 1)
+
+    assert book.bids.trim(3) == 7
+    assert book.bids.prices() == [10, 9, 8]
+    assert book.asks.top(2) == [(11, 1), (12, 1)]
+    assert book.is_valid() and not book.is_crossed()
+
+    book.bids.update(11, 1)
+    assert book.is_crossed()
+    book.bids.update(-1, 1)
+    assert not book.is_valid()
+
+    book.clear()
+    assert book.best_levels() == (None, None)
+
+
+def test_fixed_point_book():
+    assert scale_to_int("3012.45", 2) == 301245
+    assert scale_to_int("3012.4", 2) == 301240
+    assert scale_to_int("0.123456", 4) == 1234
+    assert scale_to_int("1e-4", 4) == 1
+
+    book = OrderBook(price_multiplier=100, size_multiplier=10000)
+    assert book.is_fixed_point
+    book.bids.update(book.parse_price("3012.45"), book.parse_size("1.5"))
+    book.asks.update(book.parse_price("3012.50"), book.parse_size("0.25"))
+
+    assert book.best_levels() == ((301245, 15000), (301250, 2500))
+    assert book.level_to_decimal(book.best_bid()) == (Decimal("3012.45"), Decimal("1.5"))
+    assert book.level_to_decimal(None) is None
+
+    # Without multipliers the book falls back to Decimal values
+    plain = OrderBook()
+    assert plain.parse_price("3012.45") == Decimal("3012.45")
+    assert plain.price_to_decimal(Decimal("3012.45")) == Decimal("3012.45")
+
+
+if __name__ == "__main__":
+    test_best_levels_follow_updates()
+    test_trim_and_validity()
+    test_fixed_point_book()
+    print("OK")
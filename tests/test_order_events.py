@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+from decimal import Decimal
+import pytest
+from exchanges.base import BBOCache
+from exchanges.sim import SimExchangeClient
+import trading_bot
+from trading_bot import TradingBot
+
+
+def test_bbo_listeners_fire_on_changes_only(make_config):
+    cache = BBOCache()
+    calls = []
+    cache.add_listener(lambda: calls.append(1))
+    cache.update('100', '101')
+    cache.update('100', '101')
+    cache.update('100', '100.5')
+    cache.update('101', '100')  # crossed, ignored
+    assert len(calls) == 2
+
+    # Listeners move with the client to a shared cache
+    client = SimExchangeClient(make_config())
+    client.bbo_cache.add_listener(calls.clear)
+    shared = BBOCache()
+    client.use_shared_market_data(shared)
+    shared.update('99', '100')
+    assert calls == []
+
+
+def test_open_order_is_requoted_on_the_next_bbo_change(make_config, sim_client, move_market):
+    async def run():
+        bot = TradingBot(make_config())
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        monitor = asyncio.create_task(bot._handle_order_result(placed))
+        await asyncio.sleep(0.05)
+        assert client.orders_amended == 0
+
+        # Reacts to the market moving away without waiting for the REST poll
+        start_time = time.perf_counter()
+        move_market(client, 10)
+        while client.orders_amended == 0 and time.perf_counter() - start_time < 1:
+            await asyncio.sleep(0.001)
+        assert client.orders_amended == 1 and time.perf_counter() - start_time < 0.5
+        assert client.engine.orders[placed.order_id].price == client.engine.best_bid()
+
+        # The fill is closed as soon as its update arrives
+        client.engine.submit_market('sell', Decimal('0.1'))
+        assert await asyncio.wait_for(monitor, timeout=1) is True
+        assert [order.side for order in await client.get_active_orders(client.config.contract_id)] == ['sell']
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_order_is_polled_while_bbo_keeps_changing(make_config, sim_client):
+    async def run():
+        bot = TradingBot(make_config())
+        client = await sim_client(bot.exchange_client)
+        bot.loop = asyncio.get_running_loop()
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        polls = []
+        get_order_info = client.get_order_info
+
+        async def counting_get_order_info(order_id):
+            polls.append(order_id)
+            return await get_order_info(order_id)
+        client.get_order_info = counting_get_order_info
+
+        monitor = asyncio.create_task(bot._handle_order_result(placed))
+        # Top-of-book updates faster than the poll interval do not starve the REST poll
+        for _ in range(30):
+            bot._wake_order_monitor()
+            await asyncio.sleep(0.01)
+        assert len(polls) >= 4
+
+        client.engine.submit_market('sell', Decimal('0.1'))
+        assert await asyncio.wait_for(monitor, timeout=1) is True
+        await client.disconnect()
+
+    poll_interval = trading_bot.ORDER_POLL_INTERVAL
+    trading_bot.ORDER_POLL_INTERVAL = 0.05
+    try:
+        asyncio.run(run())
+    finally:
+        trading_bot.ORDER_POLL_INTERVAL = poll_interval
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
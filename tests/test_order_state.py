@@ -0,0 +1,146 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import threading
+import time
+from decimal import Decimal
+import pytest
+from exchanges.base import ORDER_ACK_TIMEOUT, OrderInfo, OrderStateStore
+
+
+def make_order(order_id, side='sell', size='1', price='3000'):
+    return OrderInfo(order_id=order_id, side=side, size=Decimal(size), price=Decimal(price), status='OPEN')
+
+
+def test_websocket_updates_track_remaining_size():
+    store = OrderStateStore()
+    store.apply_message({'order_id': 1, 'side': 'SELL', 'size': '1', 'price': '3000',
+                         'status': 'OPEN', 'filled_size': '0'})
+    store.apply_update(2, 'buy', '1', '2990', 'PARTIALLY_FILLED', '0.4')
+
+    assert [order.order_id for order in store.active_orders(side='sell')] == ['1']
+    assert store.get(2).size == Decimal('0.6')
+
+    store.apply_update(2, 'buy', '1', '2990', 'canceled-post-only', '0.4')
+    store.apply_update(1, 'sell', '1', '3000', 'FILLED', '1')
+    assert store.active_orders() == []
+
+    # A placed order is not resurrected once its fill has been seen
+    store.add_placed(1, 'sell', Decimal('1'), Decimal('3000'))
+    store.add_placed(3, 'sell', Decimal('1'), Decimal('3010'))
+    assert [order.order_id for order in store.active_orders()] == ['3']
+
+
+def test_reconcile_keeps_events_newer_than_snapshot():
+    store = OrderStateStore(reconcile_interval=30)
+    assert store.needs_reconcile()
+
+    store.apply_update('a', 'sell', '1', '3000', 'OPEN')
+    requested_at = time.time()
+    time.sleep(0.001)
+    # Arrive while the REST request is in flight
+    store.apply_update('a', 'sell', '1', '3000', 'FILLED', '1')
+    store.apply_update('c', 'sell', '1', '3020', 'OPEN')
+
+    # Snapshot still shows 'a', and has 'b' that the websocket missed
+    store.reconcile([make_order('a'), make_order('b', price='3010')], requested_at)
+
+    assert sorted(order.order_id for order in store.active_orders()) == ['b', 'c']
+    assert not store.needs_reconcile()
+    assert store.reconciles == 1
+
+
+def test_placements_wait_for_the_stream_acknowledgement():
+    async def run():
+        store = OrderStateStore()
+        # Acknowledged before the REST response came back
+        store.apply_update(1, 'buy', '1', '3000', 'OPEN', client_order_id=77)
+        assert (await store.wait_for_update(client_order_id=77, timeout=0)).order_id == '1'
+
+        # Resolved from an SDK thread as soon as the update arrives
+        store.add_placed(2, 'buy', Decimal('1'), Decimal('3000'))
+        waiter = asyncio.ensure_future(store.wait_for_update(2, statuses=('CANCELED',), timeout=1))
+        await asyncio.sleep(0)
+        threading.Thread(target=store.apply_update, args=(2, 'buy', '1', '3000', 'OPEN')).start()
+        threading.Thread(target=store.apply_update, args=(2, 'buy', '1', '3000', 'canceled-post-only')).start()
+        start = time.perf_counter()
+        assert (await waiter).status == 'CANCELED-POST-ONLY'
+        assert time.perf_counter() - start < 0.5
+
+        assert await store.wait_for_update(3, timeout=0.01) is None
+        assert not store._waiters
+
+    asyncio.run(run())
+
+
+def test_adapter_order_updates_feed_order_state(sim_client):
+    async def run():
+        client = await sim_client()
+        client.setup_order_update_handler(lambda message: None)
+        placed = await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        assert (await client.wait_for_order_ack(placed.order_id)).status == 'OPEN'
+        await client.cancel_order(placed.order_id)
+        assert client.order_state.get(placed.order_id) is None
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+async def assert_rejection_acknowledged(client, deliver):
+    """`deliver()` streams a rejection of order 42: the ack wait returns at once, the bot never sees it."""
+    forwarded = []
+    client.setup_order_update_handler(forwarded.append)
+    ack = asyncio.create_task(client.wait_for_order_ack('42'))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await deliver()
+    order_info = await asyncio.wait_for(ack, timeout=ORDER_ACK_TIMEOUT)
+    assert time.perf_counter() - start < ORDER_ACK_TIMEOUT / 10
+    assert order_info.status in ('CANCELED', 'REJECTED') and forwarded == []
+
+
+def test_edgex_rejected_close_resolves_the_ack_wait(make_config, monkeypatch):
+    pytest.importorskip('edgex_sdk')
+    from exchanges.edgex import EdgeXClient
+    monkeypatch.setenv('EDGEX_ACCOUNT_ID', '1')
+    monkeypatch.setenv('EDGEX_STARK_PRIVATE_KEY', '0x' + '1' * 63)
+
+    async def run():
+        config = make_config()
+        config.contract_id = '10000002'
+        client = EdgeXClient(config)
+        order = {'id': '42', 'contractId': config.contract_id, 'status': 'CANCELED', 'side': 'SELL',
+                 'size': '0.1', 'price': '3000', 'cumMatchSize': '0'}
+
+        async def deliver():
+            client.handle_order_update({'content': {'event': 'ORDER_UPDATE', 'data': {'order': [order]}}})
+        await assert_rejection_acknowledged(client, deliver)
+
+    asyncio.run(run())
+
+
+def test_extended_rejected_order_resolves_the_ack_wait(make_config, monkeypatch):
+    pytest.importorskip('x10')
+    from exchanges.extended import ExtendedClient
+    for name, value in (('EXTENDED_VAULT', '1'), ('EXTENDED_STARK_KEY_PRIVATE', '0x1'),
+                        ('EXTENDED_STARK_KEY_PUBLIC', '0x2'), ('EXTENDED_API_KEY', 'key')):
+        monkeypatch.setenv(name, value)
+
+    async def run():
+        config = make_config()
+        config.contract_id = 'ETH-USD'
+        client = ExtendedClient(config)
+        order = {'id': '42', 'market': config.contract_id, 'status': 'REJECTED', 'side': 'BUY',
+                 'qty': '0.1', 'price': '3000', 'filledQty': '0'}
+
+        async def deliver():
+            await client.handle_account({'type': 'ORDER', 'data': {'orders': [order]}})
+        await assert_rejection_acknowledged(client, deliver)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import os
+import time
+from decimal import Decimal
+import pytest
+from exchanges.sim import SimExchangeClient
+from helpers.rate_limit import (PRIORITY_CANCEL, PRIORITY_PLACE, PRIORITY_QUERY, RateLimiter, TokenBucket,
+                                parse_rate_limits, rate_limits_for)
+
+
+def test_parse_and_env_override():
+    assert parse_rate_limits('total=20/40, order=5') == {'total': (20.0, 40.0), 'order': (5.0, 5.0)}
+    os.environ['RATE_LIMIT_SIM'] = 'query=1/2'
+    try:
+        limits = rate_limits_for('sim', {'total': (10, 10), 'query': (5, 5)})
+    finally:
+        del os.environ['RATE_LIMIT_SIM']
+    assert limits == {'total': (10, 10), 'query': (1.0, 2.0)}
+
+
+def test_waiters_released_by_priority():
+    async def run():
+        limiter = RateLimiter({'total': (50, 1)})
+        await limiter.acquire('query')  # empties the venue bucket
+        order = []
+
+        async def request(name, endpoint_class, priority):
+            await limiter.acquire(endpoint_class, priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(request('query', 'query', PRIORITY_QUERY)),
+                 asyncio.create_task(request('place', 'order', PRIORITY_PLACE)),
+                 asyncio.create_task(request('cancel', 'cancel', PRIORITY_CANCEL))]
+        await asyncio.gather(*tasks)
+        assert order == ['cancel', 'place', 'query']
+
+    asyncio.run(run())
+
+
+def test_rate_limited_response_pauses_requests():
+    async def run():
+        limiter = RateLimiter({'total': (1000, 10)})
+        limiter.observe_response(429, {'Retry-After': '0.05'})
+        start = time.monotonic()
+        await limiter.acquire('order')
+        assert time.monotonic() - start >= 0.04
+        assert limiter.rate_limited == 1
+
+    asyncio.run(run())
+
+
+class RetryingSimClient(SimExchangeClient):
+    async def place_open_order(self, contract_id, quantity, direction):
+        for _ in range(3):  # three attempts, like the post-only retry loops
+            await self.throttle('order')
+        return await super().place_open_order(contract_id, quantity, direction)
+
+
+def test_order_entry_takes_one_slot_per_attempt(make_config, sim_client):
+    async def run():
+        client = await sim_client(RetryingSimClient(make_config()))
+        limiter = client.rate_limiter
+        limiter.buckets['order'] = TokenBucket(rate=0, burst=10)
+        await client.place_open_order(client.config.contract_id, Decimal('0.1'), 'buy')
+        # One slot per attempt: the wrapper's covers the first, the inner super() call reuses it
+        assert limiter.buckets['order'].tokens == 10 - 3
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+from decimal import Decimal
+import pytest
+from exchanges.base import RequestCoalescer
+
+
+def test_concurrent_identical_calls_share_one_request():
+    async def run():
+        coalescer = RequestCoalescer()
+        requests = []
+
+        async def fetch():
+            requests.append(1)
+            await asyncio.sleep(0.01)
+            return ['order']
+
+        results = await asyncio.gather(*(coalescer.call('orders', fetch) for _ in range(5)))
+        assert results == [['order']] * 5 and len(requests) == 1
+        assert (coalescer.requests, coalescer.coalesced, coalescer.saved) == (1, 4, 4)
+
+        # Without a freshness window the next call is a new request
+        await coalescer.call('orders', fetch)
+        assert len(requests) == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_and_errors():
+    async def run():
+        coalescer = RequestCoalescer(window=10)
+        attempts = []
+
+        async def fetch():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise ValueError("rate limited")
+            return Decimal('0.5')
+
+        first = asyncio.create_task(coalescer.call('position', fetch))
+        second = asyncio.create_task(coalescer.call('position', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        # The second caller still gets the shared outcome, and errors are not cached
+        try:
+            await second
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("error not shared")
+        assert await coalescer.call('position', fetch) == Decimal('0.5')
+        assert await coalescer.call('position', fetch) == Decimal('0.5')
+        assert len(attempts) == 2 and coalescer.fresh_hits == 1
+
+    asyncio.run(run())
+
+
+def test_adapter_queries_are_coalesced(sim_client):
+    async def run():
+        client = await sim_client()
+        positions = await asyncio.gather(*(client.get_account_positions() for _ in range(3)))
+        assert positions == [Decimal(0)] * 3
+        assert client.request_coalescer.coalesced == 2
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
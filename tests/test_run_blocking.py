@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import threading
+import time
+from exchanges.base import BaseExchangeClient
+
+
+class DummyClient(BaseExchangeClient):
+    """Minimal concrete client; only run_blocking is exercised."""
+
+    def _validate_config(self):
+        pass
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def place_open_order(self, contract_id, quantity, direction):
+        pass
+
+    async def place_close_order(self, contract_id, quantity, price, side):
+        pass
+
+    async def cancel_order(self, order_id):
+        pass
+
+    async def get_order_info(self, order_id):
+        pass
+
+    async def get_active_orders(self, contract_id):
+        return []
+
+    async def get_account_positions(self):
+        pass
+
+    def setup_order_update_handler(self, handler):
+        pass
+
+    def get_exchange_name(self):
+        return 'dummy'
+
+
+def test_run_blocking_keeps_loop_responsive():
+    client = DummyClient({})
+
+    def slow_call(value, delay=0.2):
+        time.sleep(delay)
+        return value, threading.current_thread().name
+
+    async def ticker(ticks):
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        ticks = []
+        task = asyncio.create_task(ticker(ticks))
+        result = await client.run_blocking(slow_call, 'ok', delay=0.2)
+        task.cancel()
+        return result, ticks
+
+    (value, thread_name), ticks = asyncio.run(run())
+    assert value == 'ok'
+    assert thread_name.startswith('exchange-io')
+    # The loop kept ticking while the call slept
+    assert len(ticks) >= 10
+
+
+if __name__ == "__main__":
+    test_run_blocking_keeps_loop_responsive()
+    print("OK")
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+from decimal import Decimal
+import pytest
+from exchanges import ExchangeFactory
+from exchanges.sim import SimMatchingEngine
+
+
+def test_price_time_priority_and_post_only():
+    updates = []
+    engine = SimMatchingEngine(on_order_update=lambda order, quantity: updates.append((order.order_id, quantity)))
+    first = engine.submit_limit('buy', Decimal('100'), Decimal('1'))
+    second = engine.submit_limit('buy', Decimal('100'), Decimal('1'))
+    better = engine.submit_limit('buy', Decimal('100.5'), Decimal('1'))
+    engine.submit_limit('sell', Decimal('101'), Decimal('1'))
+
+    # Post-only order that would take liquidity is rejected and never rests
+    assert engine.submit_limit('sell', Decimal('100.5'), Decimal('1')).status == 'REJECTED'
+    assert engine.best_bid() == Decimal('100.5')
+
+    assert engine.submit_market('sell', Decimal('2.5')) == Decimal('2.5')
+    assert updates == [(better.order_id, Decimal('1')), (first.order_id, Decimal('1')),
+                       (second.order_id, Decimal('0.5'))]
+    assert first.status == 'FILLED' and second.status == 'PARTIALLY_FILLED'
+    assert engine.level_size('buy', Decimal('100')) == Decimal('0.5')
+
+
+def test_client_fill_reaches_order_update_handler(make_config, sim_client):
+    async def run():
+        client = await sim_client(ExchangeFactory.create_exchange('sim', make_config()))
+        contract_id, tick_size = client.config.contract_id, client.tick_size
+        messages = []
+        client.setup_order_update_handler(messages.append)
+
+        result = await client.place_open_order(contract_id, Decimal('0.1'), 'buy')
+        assert result.success and result.status == 'OPEN'
+        # One tick inside the ask, ahead of the synthetic maker bid
+        assert result.price == client.engine.best_ask() - tick_size
+
+        client.engine.submit_market('sell', client.maker_size + Decimal('0.1'))
+        assert [message['status'] for message in messages] == ['OPEN', 'FILLED']
+        assert messages[-1]['order_type'] == 'OPEN' and messages[-1]['contract_id'] == contract_id
+        assert await client.get_account_positions() == Decimal('0.1')
+        assert (await client.get_order_info(result.order_id)).status == 'FILLED'
+        assert await client.get_active_orders(contract_id) == []
+        await client.disconnect()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -8,12 +8,20 @@ import asyncio
 import traceback
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Any, List, Optional, Set, Tuple
 
 from exchanges import ExchangeFactory
+from exchanges.base import CloseOrderRequest, OrderResult
 from helpers import TradingLogger
-from helpers.lark_bot import LarkBot
-from helpers.telegram_bot import TelegramBot
+from helpers.metrics import get_metrics, start_metrics_server_from_env
+
+# Seconds between REST checks of an open order, however often stream events wake it up
+ORDER_POLL_INTERVAL = 5
+# Seconds graceful_shutdown waits for close orders still being placed (pipeline mode)
+CLOSE_ORDER_DRAIN_TIMEOUT = 30
+
+# Pipeline mode close order: quantity, price, close order ids live when it was queued, order trace
+PendingCloseOrder = Tuple[Decimal, Decimal, Set[str], Any]
 
 
 @dataclass
@@ -32,6 +40,8 @@ class TradingConfig:
     stop_price: Decimal
     pause_price: Decimal
     boost_mode: bool
+    # Close orders placed in the background at once, 0 places them before the next open order
+    pipeline: int = 0
 
     @property
     def close_order_side(self) -> str:
@@ -79,11 +89,20 @@ class TradingBot:
         self.current_order_status = None
         self.order_filled_event = asyncio.Event()
         self.order_canceled_event = asyncio.Event()
+        # Set on top-of-book changes and open order updates, wakes up _handle_order_result
+        self.order_event = asyncio.Event()
         self.shutdown_requested = False
         self.loop = None
+        # Stage timestamps of the current open order (decision -> acked -> filled -> close acked)
+        self.order_trace = None
+        # Pipeline mode: close orders not acknowledged yet, those not sent yet, and the tasks placing them
+        self.pending_close_orders: List[PendingCloseOrder] = []
+        self.queued_close_orders: List[PendingCloseOrder] = []
+        self.close_order_tasks: Set[asyncio.Task] = set()
 
         # Register order callback
         self._setup_websocket_handlers()
+        self.exchange_client.bbo_cache.add_listener(self._wake_order_monitor)
 
     async def graceful_shutdown(self, reason: str = "Unknown"):
         """Perform graceful shutdown of the trading bot."""
@@ -91,8 +110,14 @@ class TradingBot:
         self.shutdown_requested = True
 
         try:
+            # Let close orders already on their way reach the exchange
+            if self.close_order_tasks:
+                self.logger.log(f"Waiting for {len(self.pending_close_orders)} close orders being placed", "INFO")
+                await asyncio.wait(list(self.close_order_tasks), timeout=CLOSE_ORDER_DRAIN_TIMEOUT)
+
             # Disconnect from exchange
             await self.exchange_client.disconnect()
+            self.logger.log(f"Queries: {self.exchange_client.request_coalescer.stats()}", "INFO")
             self.logger.log("Graceful shutdown completed", "INFO")
 
         except Exception as e:
@@ -114,9 +139,11 @@ class TradingBot:
                 filled_size = Decimal(message.get('filled_size'))
                 if order_type == "OPEN":
                     self.current_order_status = status
+                    self._wake_order_monitor()
 
                 if status == 'FILLED':
                     if order_type == "OPEN":
+                        self._mark_order_stage('filled')
                         self.order_filled_amount = filled_size
                         # Ensure thread-safe interaction with asyncio event loop
                         if self.loop is not None:
@@ -195,8 +222,11 @@ class TradingBot:
         try:
             # Reset state before placing order
             self.order_filled_event.clear()
+            self.order_event.clear()
             self.current_order_status = 'OPEN'
             self.order_filled_amount = 0.0
+            self.order_trace = get_metrics().trace('tick_to_trade', exchange=self.config.exchange,
+                                                   ticker=self.config.ticker)
 
             # Place the order
             order_result = await self.exchange_client.place_open_order(
@@ -204,11 +234,13 @@ class TradingBot:
                 self.config.quantity,
                 self.config.direction
             )
+            self.order_trace.mark('acked')
 
             if not order_result.success:
                 return False
 
             if order_result.status == 'FILLED':
+                self.order_trace.mark('filled')
                 return await self._handle_order_result(order_result)
             elif not self.order_filled_event.is_set():
                 try:
@@ -236,6 +268,7 @@ class TradingBot:
                     self.config.quantity,
                     self.config.close_order_side
                 )
+                self._mark_order_stage('close_acked')
             else:
                 self.last_open_order_time = time.time()
                 # Place close order
@@ -245,16 +278,8 @@ class TradingBot:
                 else:
                     close_price = filled_price * (1 - self.config.take_profit/100)
 
-                close_order_result = await self.exchange_client.place_close_order(
-                    self.config.contract_id,
-                    self.config.quantity,
-                    close_price,
-                    close_side
-                )
-                if self.config.exchange == "lighter":
-                    await asyncio.sleep(1)
-
-                if not close_order_result.success:
+                close_order_result = await self._place_close_order(self.config.quantity, close_price)
+                if close_order_result is not None and not close_order_result.success:
                     self.logger.log(f"[CLOSE] Failed to place close order: {close_order_result.error_message}", "ERROR")
                     raise Exception(f"[CLOSE] Failed to place close order: {close_order_result.error_message}")
 
@@ -272,24 +297,50 @@ class TradingBot:
 
             if self.config.exchange == "lighter":
                 current_order_status = self.exchange_client.current_order.status
+                current_filled_size = self.exchange_client.current_order.filled_size
             else:
                 order_info = await self.exchange_client.get_order_info(order_id)
                 current_order_status = order_info.status
+                current_filled_size = order_info.filled_size
+            last_poll_time = time.time()
+
+            # Re-checked on every top-of-book change and open order update, and over REST when the
+            # streamed status changes or ORDER_POLL_INTERVAL seconds passed since the last poll
+            woken = False
+            streamed_status = self.current_order_status
+            while current_order_status == "OPEN":
+                if should_wait(self.config.direction, new_order_price, order_result.price):
+                    if not woken:
+                        self.logger.log(f"[OPEN] [{order_id}] Waiting for order to be filled @ {order_result.price}", "INFO")
+                    woken = await self._wait_for_order_event(ORDER_POLL_INTERVAL)
+                else:
+                    # The touch moved away: re-price the order in one request where the venue can
+                    amended = await self._requote_open_order(order_result, new_order_price, current_filled_size)
+                    if amended is None:
+                        break
+                    order_result = amended
+                    order_id = amended.order_id
+                    # A partial fill of the amended order is closed from its new price
+                    filled_price = amended.price
+                    woken = False
 
-            while (
-                should_wait(self.config.direction, new_order_price, order_result.price)
-                and current_order_status == "OPEN"
-            ):
-                self.logger.log(f"[OPEN] [{order_id}] Waiting for order to be filled @ {order_result.price}", "INFO")
-                await asyncio.sleep(5)
                 if self.config.exchange == "lighter":
                     current_order_status = self.exchange_client.current_order.status
-                else:
+                    current_filled_size = self.exchange_client.current_order.filled_size
+                elif (not woken or self.current_order_status != streamed_status or
+                        time.time() - last_poll_time >= ORDER_POLL_INTERVAL):
+                    streamed_status = self.current_order_status
+                    last_poll_time = time.time()
                     order_info = await self.exchange_client.get_order_info(order_id)
                     if order_info is not None:
                         current_order_status = order_info.status
+                        current_filled_size = order_info.filled_size
                 new_order_price = await self.exchange_client.get_order_price(self.config.direction)
 
+            if self.order_filled_event.is_set():
+                # Filled while waiting: close it like an immediate fill
+                return await self._handle_order_result(order_result)
+
             self.order_canceled_event.clear()
             # Cancel the order if it's still open
             self.logger.log(f"[OPEN] [{order_id}] Cancelling order and placing a new order", "INFO")
@@ -337,46 +388,182 @@ class TradingBot:
                         filled_price,
                         close_side
                     )
+                    self._record_close_order(close_order_result, self.order_filled_amount, filled_price)
                 else:
                     if close_side == 'sell':
                         close_price = filled_price * (1 + self.config.take_profit/100)
                     else:
                         close_price = filled_price * (1 - self.config.take_profit/100)
 
-                    close_order_result = await self.exchange_client.place_close_order(
-                        self.config.contract_id,
-                        self.order_filled_amount,
-                        close_price,
-                        close_side
-                    )
-                    if self.config.exchange == "lighter":
-                        await asyncio.sleep(1)
+                    close_order_result = await self._place_close_order(self.order_filled_amount, close_price)
 
                 self.last_open_order_time = time.time()
-                if not close_order_result.success:
+                if close_order_result is not None and not close_order_result.success:
                     self.logger.log(f"[CLOSE] Failed to place close order: {close_order_result.error_message}", "ERROR")
 
             return True
 
         return False
 
+    async def _place_close_order(self, quantity: Decimal, price: Decimal) -> Optional[OrderResult]:
+        """Place the close order for a fill.
+
+        In pipeline mode it is placed by a background task (at most `pipeline` requests in flight)
+        and None is returned, so the next open order does not wait for it. Closes queued while all
+        requests are in flight go out together in one place_orders_batch request.
+        """
+        if self.config.pipeline <= 0:
+            return await self._submit_close_order(quantity, price, self.order_trace)
+
+        live_ids = {order['id'] for order in self.active_close_orders if order['id'] is not None}
+        entry = (quantity, price, live_ids, self.order_trace)
+        self.pending_close_orders.append(entry)
+        self.queued_close_orders.append(entry)
+        if len(self.close_order_tasks) < self.config.pipeline:
+            self._start_close_order_task()
+        return None
+
+    async def _submit_close_order(self, quantity: Decimal, price: Decimal, order_trace) -> OrderResult:
+        close_order_result = await self.exchange_client.place_close_order(
+            self.config.contract_id,
+            quantity,
+            price,
+            self.config.close_order_side
+        )
+        if order_trace is not None:
+            order_trace.mark('close_acked')
+        self._record_close_order(close_order_result, quantity, price)
+        return close_order_result
+
+    async def _submit_close_orders_batch(self, entries: List[PendingCloseOrder]) -> List[OrderResult]:
+        results = await self.exchange_client.place_orders_batch([
+            CloseOrderRequest(self.config.contract_id, quantity, price, self.config.close_order_side)
+            for quantity, price, _, _ in entries
+        ])
+        for (quantity, price, _, order_trace), close_order_result in zip(entries, results):
+            if order_trace is not None:
+                order_trace.mark('close_acked')
+            self._record_close_order(close_order_result, quantity, price)
+        return results
+
+    def _start_close_order_task(self) -> None:
+        task = asyncio.create_task(self._submit_queued_close_orders())
+        self.close_order_tasks.add(task)
+        task.add_done_callback(self._close_order_task_done)
+
+    async def _submit_queued_close_orders(self) -> None:
+        while self.queued_close_orders:
+            entries, self.queued_close_orders = self.queued_close_orders, []
+            try:
+                if len(entries) == 1:
+                    quantity, price, _, order_trace = entries[0]
+                    results = [await self._submit_close_order(quantity, price, order_trace)]
+                else:
+                    results = await self._submit_close_orders_batch(entries)
+                for close_order_result in results:
+                    if not close_order_result.success:
+                        self.logger.log(f"[CLOSE] Failed to place close order: {close_order_result.error_message}",
+                                        "ERROR")
+            except Exception as e:
+                self.logger.log(f"[CLOSE] Error placing {len(entries)} close orders: {e}", "ERROR")
+            # Counted from the order state from here on, not as pending
+            for entry in entries:
+                self.pending_close_orders.remove(entry)
+
+    def _close_order_task_done(self, task: asyncio.Task) -> None:
+        self.close_order_tasks.discard(task)
+        # Closes queued after the task found the queue empty
+        if self.queued_close_orders and len(self.close_order_tasks) < self.config.pipeline:
+            self._start_close_order_task()
+
+    def _wake_order_monitor(self) -> None:
+        """Top-of-book change or open order update (may be called from SDK threads)."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.order_event.set)
+        else:
+            self.order_event.set()
+
+    async def _wait_for_order_event(self, timeout: float) -> bool:
+        """Wait for the next top-of-book change or open order update. False on timeout."""
+        try:
+            await asyncio.wait_for(self.order_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.order_event.clear()
+        return True
+
+    async def _requote_open_order(self, order_result, price: Decimal, filled_size) -> Optional[OrderResult]:
+        """Amend the open order to `price` on venues with a native amend.
+
+        Returns the amended order, or None when it has to be cancelled instead: no native amend,
+        a partial fill that needs its close order first, or the stop/pause price or grid step
+        no longer allowing an open order at the new price.
+        """
+        if not self.exchange_client.NATIVE_AMEND or filled_size:
+            return None
+        stop_trading, pause_trading = await self._check_price_condition()
+        if stop_trading or pause_trading or not await self._meet_grid_step_condition():
+            return None
+
+        amend_result = await self.exchange_client.amend_order(
+            order_result.order_id,
+            self.config.contract_id,
+            self.config.quantity,
+            price,
+            self.config.direction
+        )
+        if not amend_result.success:
+            self.logger.log(f"[OPEN] [{order_result.order_id}] Failed to amend order: "
+                            f"{amend_result.error_message}", "WARNING")
+            return None
+        self.logger.log(f"[OPEN] [{amend_result.order_id}] Requoted @ {amend_result.price}", "INFO")
+        return amend_result
+
+    async def _update_active_close_orders(self):
+        """Refresh active_close_orders from the websocket-fed order state (REST only when reconciling)."""
+        active_orders = await self.exchange_client.get_cached_active_orders(self.config.contract_id)
+
+        # Filter close orders
+        self.active_close_orders = []
+        for order in active_orders:
+            if order.side == self.config.close_order_side:
+                self.active_close_orders.append({
+                    'id': order.order_id,
+                    'price': order.price,
+                    'size': order.size
+                })
+        # Close orders still being placed count against max_orders and the grid step, unless
+        # their websocket update already arrived: a matching close order that is new since then
+        landed = set()
+        for quantity, price, live_ids, _ in self.pending_close_orders:
+            match = next((order['id'] for order in self.active_close_orders
+                          if order['id'] is not None and order['id'] not in live_ids and order['id'] not in landed
+                          and order['price'] == price and order['size'] == quantity), None)
+            if match is not None:
+                landed.add(match)
+                continue
+            self.active_close_orders.append({'id': None, 'price': price, 'size': quantity})
+
+    def _mark_order_stage(self, stage: str):
+        if self.order_trace is not None:
+            self.order_trace.mark(stage)
+
+    def _record_close_order(self, close_order_result, quantity: Decimal, price: Decimal):
+        """Add a placed close order to the order state before its websocket update arrives."""
+        # Lighter returns the client order index here, not the exchange order id
+        if not close_order_result.success or self.config.exchange == "lighter":
+            return
+        self.exchange_client.order_state.add_placed(
+            close_order_result.order_id, self.config.close_order_side, quantity, price)
+
     async def _log_status_periodically(self):
         """Log status information periodically, including positions."""
         if time.time() - self.last_log_time > 60 or self.last_log_time == 0:
             print("--------------------------------")
             try:
-                # Get active orders
-                active_orders = await self.exchange_client.get_active_orders(self.config.contract_id)
-
-                # Filter close orders
-                self.active_close_orders = []
-                for order in active_orders:
-                    if order.side == self.config.close_order_side:
-                        self.active_close_orders.append({
-                            'id': order.order_id,
-                            'price': order.price,
-                            'size': order.size
-                        })
+                # Refresh close orders from the order state
+                await self._update_active_close_orders()
 
                 # Get positions
                 position_amt = await self.exchange_client.get_account_positions()
@@ -476,14 +663,17 @@ class TradingBot:
         return stop_trading, pause_trading
 
     async def send_notification(self, message: str):
+        # The notifier clients (aiohttp, requests) are imported only when a notifier is configured
         lark_token = os.getenv("LARK_TOKEN")
         if lark_token:
+            from helpers.lark_bot import LarkBot
             async with LarkBot(lark_token) as lark_bot:
                 await lark_bot.send_text(message)
 
         telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
         telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
         if telegram_token and telegram_chat_id:
+            from helpers.telegram_bot import TelegramBot
             with TelegramBot(telegram_token, telegram_chat_id) as tg_bot:
                 tg_bot.send_text(message)
 
@@ -506,10 +696,13 @@ class TradingBot:
             self.logger.log(f"Stop Price: {self.config.stop_price}", "INFO")
             self.logger.log(f"Pause Price: {self.config.pause_price}", "INFO")
             self.logger.log(f"Boost Mode: {self.config.boost_mode}", "INFO")
+            self.logger.log(f"Pipeline: {self.config.pipeline}", "INFO")
             self.logger.log("=============================", "INFO")
 
             # Capture the running event loop for thread-safe callbacks
             self.loop = asyncio.get_running_loop()
+            # Latency histograms on http://127.0.0.1:<METRICS_PORT>/metrics, once per process
+            await start_metrics_server_from_env()
             # Connect to exchange
             await self.exchange_client.connect()
 
@@ -519,17 +712,7 @@ class TradingBot:
             # Main trading loop
             while not self.shutdown_requested:
                 # Update active orders
-                active_orders = await self.exchange_client.get_active_orders(self.config.contract_id)
-
-                # Filter close orders
-                self.active_close_orders = []
-                for order in active_orders:
-                    if order.side == self.config.close_order_side:
-                        self.active_close_orders.append({
-                            'id': order.order_id,
-                            'price': order.price,
-                            'size': order.size
-                        })
+                await self._update_active_close_orders()
 
                 # Periodic logging
                 mismatch_detected = await self._log_status_periodically()